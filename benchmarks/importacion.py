@@ -0,0 +1,79 @@
+"""
+Mide cuánto tarda `import lunita` y comprueba que no arrastre dependencias pesadas.
+
+Cada medición corre en un intérprete nuevo, así no influye lo que ya esté importado. Imprime
+un JSON con los tiempos y sale con código 1 si el promedio supera `--max-ms` o si alguna de
+las dependencias pesadas (pysentimiento, transformers, torch, openai) quedó importada.
+
+Uso:
+    python benchmarks/importacion.py --repeticiones 10 --max-ms 1500
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# El `import lunita` de cada medición se resuelve desde la raíz del checkout.
+RAIZ = Path(__file__).resolve().parent.parent
+
+PESADOS = ("pysentimiento", "transformers", "torch", "openai")
+
+_SCRIPT = f"""
+import json, sys, time
+inicio = time.perf_counter()
+import lunita
+duracion = time.perf_counter() - inicio
+pesados = [m for m in {PESADOS!r} if m in sys.modules]
+print(json.dumps({{"ms": duracion * 1000, "pesados": pesados}}))
+"""
+
+
+def medir(repeticiones: int) -> dict:
+    """Importa `lunita` en `repeticiones` procesos nuevos y resume los tiempos."""
+    tiempos = []
+    pesados: set[str] = set()
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", _SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=RAIZ,
+        )
+        resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+        tiempos.append(resultado["ms"])
+        pesados.update(resultado["pesados"])
+
+    return {
+        "repeticiones": repeticiones,
+        "ms_promedio": statistics.mean(tiempos),
+        "ms_mediana": statistics.median(tiempos),
+        "ms_minimo": min(tiempos),
+        "ms_maximo": max(tiempos),
+        "pesados_importados": sorted(pesados),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument(
+        "--max-ms", type=float, default=None, help="Falla si el promedio supera este tiempo."
+    )
+    args = parser.parse_args()
+
+    reporte = medir(args.repeticiones)
+    print(json.dumps(reporte, indent=2))
+
+    if reporte["pesados_importados"]:
+        return 1
+    if args.max_ms is not None and reporte["ms_promedio"] > args.max_ms:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Compara el backend ONNX con los pipelines de PyTorch de pysentimiento.
+
+Para cada tarea (sentimiento y emoción) corre los mismos mensajes con ambos backends y reporta
+en JSON la coincidencia de etiquetas, la diferencia máxima de probabilidades y la latencia en
+CPU (un mensaje a la vez y en lotes). Sale con código 1 si la coincidencia de alguna tarea queda
+por debajo de `--min-coincidencia`.
+
+Uso:
+    python benchmarks/onnx.py --mensajes mensajes.txt --lote 32 --min-coincidencia 0.97
+    python benchmarks/onnx.py --sin-cuantizar
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Para correr el script desde un checkout sin instalar el paquete.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lunita.emocional.backend_onnx import BackendONNX
+from lunita.emocional.registro import BackendPysentimiento
+
+MENSAJES = [
+    "Hola Lunita, ¿cómo estás?",
+    "Estoy muy feliz, me dieron el trabajo!!!",
+    "Me siento solo y nadie me escucha",
+    "Qué rabia, otra vez me cancelaron la cita",
+    "Tengo miedo de lo que va a pasar mañana",
+    "No puede ser, ¡me gané la rifa!",
+    "Qué asco la comida de hoy",
+    "¿Qué dicen las cartas sobre mi semana?",
+    "Extraño mucho a mi abuela",
+    "jajaja eres lo máximo",
+    "Estoy nerviosa por el examen de mañana",
+    "Mi gato se murió ayer",
+    "Ya no aguanto a mi jefe, en serio",
+    "Gracias por escucharme, me ayudaste mucho",
+    "No sé qué hacer con mi vida",
+    "Hoy es mi cumpleaños 🎉🎉",
+]
+
+
+def _latencias(analizador, mensajes: list[str], tamano_lote: int) -> dict:
+    analizador.predict(mensajes[:2])  # Calentamiento.
+
+    individuales = []
+    for mensaje in mensajes:
+        inicio = time.perf_counter()
+        analizador.predict(mensaje)
+        individuales.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    for i in range(0, len(mensajes), tamano_lote):
+        analizador.predict(mensajes[i : i + tamano_lote])
+    duracion = time.perf_counter() - inicio
+
+    return {
+        "ms_mediana": statistics.median(individuales),
+        "ms_p95": sorted(individuales)[int(len(individuales) * 0.95) - 1],
+        "mensajes_por_segundo_en_lote": len(mensajes) / duracion,
+    }
+
+
+def comparar(mensajes: list[str], tamano_lote: int, cuantizar: bool, lang: str) -> dict:
+    """Corre ambos backends sobre `mensajes` y arma el reporte por tarea."""
+    referencia = BackendPysentimiento()
+    onnx = BackendONNX(cuantizar=cuantizar)
+    reporte = {"mensajes": len(mensajes), "cuantizado": cuantizar, "tareas": {}}
+
+    for task in ("sentiment", "emotion"):
+        analizador_pt = referencia.crear(task, lang)
+        analizador_onnx = onnx.crear(task, lang)
+
+        salidas_pt = analizador_pt.predict(mensajes)
+        salidas_onnx = analizador_onnx.predict(mensajes)
+        coincidencias = sum(
+            a.output == b.output for a, b in zip(salidas_pt, salidas_onnx, strict=True)
+        )
+        diferencia = max(
+            abs(a.probas[etiqueta] - b.probas.get(etiqueta, 0.0))
+            for a, b in zip(salidas_pt, salidas_onnx, strict=True)
+            for etiqueta in a.probas
+        )
+
+        reporte["tareas"][task] = {
+            "coincidencia": coincidencias / len(mensajes),
+            "diferencia_maxima_probas": diferencia,
+            "pytorch": _latencias(analizador_pt, mensajes, tamano_lote),
+            "onnx": _latencias(analizador_onnx, mensajes, tamano_lote),
+        }
+
+    return reporte
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mensajes", help="Archivo con un mensaje por línea.")
+    parser.add_argument("--lote", type=int, default=32)
+    parser.add_argument("--lang", default="es")
+    parser.add_argument("--sin-cuantizar", action="store_true")
+    parser.add_argument("--min-coincidencia", type=float, default=None)
+    args = parser.parse_args()
+
+    mensajes = MENSAJES
+    if args.mensajes:
+        with open(args.mensajes, encoding="utf-8") as f:
+            mensajes = [linea.strip() for linea in f if linea.strip()]
+
+    reporte = comparar(mensajes, args.lote, not args.sin_cuantizar, args.lang)
+    print(json.dumps(reporte, indent=2, ensure_ascii=False))
+
+    if args.min_coincidencia is not None and any(
+        tarea["coincidencia"] < args.min_coincidencia
+        for tarea in reporte["tareas"].values()
+    ):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Mide el costo propio de Lunita, sin red ni proveedor, con un modelo falso de pydantic-ai.
+
+Conecta `TestModel` a `ConfigurarEstrellas(modelo_personalizado=...)` y un backend de
+analizadores falso (o los reales con `--analizadores-reales`), y mide latencia (µs) y
+memoria asignada (bytes, con tracemalloc) de cada etapa:
+
+    sesion_construccion, motor_procesar_mensaje, cliente_crear_agente, herramienta_tarot,
+    herramienta_signo, predecir_sin_herramientas, predecir_con_herramientas
+
+Guarda un JSON con el commit, la versión de Python y los resultados, para comparar corridas:
+
+    python benchmarks/pipeline.py --salida base.json
+    python benchmarks/pipeline.py --comparar base.json
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+# Para correr el script desde un checkout sin instalar el paquete.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic_ai.models.test import TestModel
+
+import lunita
+from lunita import ConfigurarEstrellas, ConfigurarVidente, Sesion
+from lunita.cliente import Cliente
+from lunita.emocional.motor import MotorEmocional
+from lunita.herramientas import obtener_signo_zodiacal, tarot
+
+MENSAJES = [
+    "Hola Lunita, ¿cómo estás?",
+    "Estoy muy feliz, me dieron el trabajo",
+    "Me siento solo y nadie me escucha",
+    "¿Qué dicen las cartas sobre mi semana?",
+    "Tengo miedo de lo que va a pasar mañana",
+    "Qué rabia, otra vez me cancelaron la cita",
+]
+
+
+class BackendFalso(lunita.BackendAnalizadores):
+    """Analizadores deterministas por palabras clave, sin modelos ni torch."""
+
+    nombre = "falso"
+
+    def crear(self, task: str, lang: str) -> Any:
+        def clasificar(texto: str) -> SimpleNamespace:
+            texto = texto.lower()
+            if task == "sentiment":
+                salida = "POS" if "feliz" in texto else "NEG" if "solo" in texto else "NEU"
+            else:
+                salida = "joy" if "feliz" in texto else "sadness" if "solo" in texto else "others"
+            return SimpleNamespace(output=salida, probas={salida: 1.0})
+
+        class Analizador:
+            def predict(self, textos):
+                if isinstance(textos, str):
+                    return clasificar(textos)
+                return [clasificar(texto) for texto in textos]
+
+        return Analizador()
+
+
+def _resumir(tiempos_ns: list[int], bytes_por_llamada: list[int]) -> dict:
+    tiempos = sorted(t / 1000 for t in tiempos_ns)
+    return {
+        "repeticiones": len(tiempos),
+        "us_promedio": statistics.mean(tiempos),
+        "us_mediana": statistics.median(tiempos),
+        "us_p95": tiempos[max(0, int(len(tiempos) * 0.95) - 1)],
+        "bytes_asignados_pico": max(bytes_por_llamada),
+        "bytes_asignados_mediana": statistics.median(bytes_por_llamada),
+    }
+
+
+async def medir(
+    funcion: Callable[[int], Any], repeticiones: int, muestras_memoria: int
+) -> dict:
+    """Mide `funcion(i)` (síncrona o asíncrona): primero tiempos, luego memoria por separado."""
+
+    async def llamar(i: int) -> None:
+        resultado = funcion(i)
+        if inspect.isawaitable(resultado):
+            await resultado
+
+    await llamar(0)  # Calentamiento: cargas perezosas, agentes, datos.
+
+    tiempos = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        await llamar(i)
+        tiempos.append(time.perf_counter_ns() - inicio)
+
+    memoria = []
+    tracemalloc.start()
+    for i in range(muestras_memoria):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        await llamar(i)
+        memoria.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    return _resumir(tiempos, memoria)
+
+
+def _metadatos() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False,  # fuera de un checkout de git se guarda sin commit
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "fecha": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+    }
+
+
+async def correr(repeticiones: int, muestras_memoria: int, sin_cache: bool) -> dict:
+    if sin_cache:
+        lunita.configurar_cache(None)
+        lunita.configurar_ruta_rapida(None)
+
+    def configuracion(modelo: TestModel) -> ConfigurarEstrellas:
+        return ConfigurarEstrellas.crear(
+            ConfigurarVidente("lunita"), "falso", "falso", modelo_personalizado=modelo
+        )
+
+    sin_herramientas = configuracion(TestModel(call_tools=[]))
+    con_herramientas = configuracion(TestModel())
+    motor = MotorEmocional()
+    cliente = Cliente(emocion="", configuracion=sin_herramientas)
+    sesion_simple = Sesion(configuracion=sin_herramientas)
+    sesion_herramientas = Sesion(configuracion=con_herramientas)
+
+    def mensaje(i: int) -> str:
+        return MENSAJES[i % len(MENSAJES)]
+
+    etapas: dict[str, Callable[[int], Any]] = {
+        "sesion_construccion": lambda i: Sesion(configuracion=sin_herramientas),
+        "motor_procesar_mensaje": lambda i: motor.procesar_mensaje_usuario(mensaje(i)),
+        "cliente_crear_agente": lambda i: cliente._crear_agente(),
+        "herramienta_tarot": lambda i: tarot(),
+        "herramienta_signo": lambda i: obtener_signo_zodiacal(1 + i % 28, 1 + i % 12),
+        "predecir_sin_herramientas": lambda i: sesion_simple.predecir(mensaje(i)),
+        "predecir_con_herramientas": lambda i: sesion_herramientas.predecir(mensaje(i)),
+    }
+
+    resultados = {}
+    for nombre, funcion in etapas.items():
+        resultados[nombre] = await medir(funcion, repeticiones, muestras_memoria)
+    return resultados
+
+
+def comparar(actual: dict, base: dict) -> dict:
+    """Razón entre la mediana actual y la de `base` por etapa (>1 es más lento)."""
+    return {
+        nombre: resultado["us_mediana"] / base["resultados"][nombre]["us_mediana"]
+        for nombre, resultado in actual["resultados"].items()
+        if nombre in base["resultados"] and base["resultados"][nombre]["us_mediana"]
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--muestras-memoria", type=int, default=20)
+    parser.add_argument("--analizadores-reales", action="store_true")
+    parser.add_argument(
+        "--sin-cache", action="store_true", help="Desactiva el cache y la ruta rápida."
+    )
+    parser.add_argument("--salida", help="Archivo donde guardar el JSON.")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior.")
+    args = parser.parse_args()
+
+    if not args.analizadores_reales:
+        lunita.configurar_backend(BackendFalso())
+
+    reporte: dict[str, Any] = {
+        **_metadatos(),
+        "backend": lunita.obtener_backend().nombre,
+        "resultados": asyncio.run(
+            correr(args.repeticiones, args.muestras_memoria, args.sin_cache)
+        ),
+    }
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            reporte["razon_vs_base"] = comparar(reporte, json.load(f))
+
+    salida = json.dumps(reporte, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(salida)
+    print(salida)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
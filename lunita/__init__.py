@@ -10,8 +10,79 @@ DESCRIPTION
     principal del paquete, permitiendo su importación directa desde `lunita`.
 """
 
+from .almacen import AlmacenSesiones, AlmacenSQLite
+from .gestor import GestorSesiones
+from .horoscopo import CacheHoroscopos
+from .limitador import LimitadorTasa, configurar_limitador, obtener_limitador
+from .lote import predecir_lote
 from .sesion import Sesion
 from .configuracion import ConfigurarEstrellas
 from .vidente import ConfigurarVidente
+from .emocional.cache import CacheVibras
+from .emocional.inferencia import (
+    configurar_cache,
+    configurar_ejecutor,
+    configurar_lotes,
+    configurar_ruta_rapida,
+    obtener_cache,
+    obtener_ruta_rapida,
+)
+from .emocional.lotes import PlanificadorLotes
+from .emocional.rapido import ClasificadorRapido
+from .emocional.backend_onnx import BackendONNX
+from .emocional.registro import (
+    BackendAnalizadores,
+    configurar_backend,
+    liberar_analizadores,
+    obtener_backend,
+    precargar,
+)
+from .instrumentacion import (
+    agregar_observador,
+    configurar_opentelemetry,
+    configurar_tiempos,
+    quitar_observador,
+)
+from .niveles import obtener_latencias_niveles, reiniciar_latencias_niveles
+from .uso import configurar_precios, obtener_uso_total, reiniciar_uso_total
+from .utilidades import RegistroDatos, precargar_datos
 
-__all__ = ["Sesion", "ConfigurarEstrellas", "ConfigurarVidente"]
+__all__ = [
+    "Sesion",
+    "GestorSesiones",
+    "AlmacenSesiones",
+    "AlmacenSQLite",
+    "CacheHoroscopos",
+    "predecir_lote",
+    "LimitadorTasa",
+    "configurar_limitador",
+    "obtener_limitador",
+    "ConfigurarEstrellas",
+    "ConfigurarVidente",
+    "precargar",
+    "liberar_analizadores",
+    "configurar_backend",
+    "obtener_backend",
+    "BackendAnalizadores",
+    "BackendONNX",
+    "precargar_datos",
+    "RegistroDatos",
+    "agregar_observador",
+    "quitar_observador",
+    "configurar_tiempos",
+    "configurar_opentelemetry",
+    "configurar_precios",
+    "obtener_uso_total",
+    "reiniciar_uso_total",
+    "obtener_latencias_niveles",
+    "reiniciar_latencias_niveles",
+    "configurar_ejecutor",
+    "configurar_lotes",
+    "PlanificadorLotes",
+    "configurar_ruta_rapida",
+    "obtener_ruta_rapida",
+    "ClasificadorRapido",
+    "configurar_cache",
+    "obtener_cache",
+    "CacheVibras",
+]
@@ -0,0 +1,193 @@
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from threading import Lock
+from time import perf_counter_ns
+from typing import Optional, TypedDict
+
+from pydantic_ai.messages import ModelMessage
+
+from .cliente import AdaptadorMensajes
+from .emocional.motor import EstadoMotorEmocional
+from .memoria import Recuerdo
+
+
+class EstadoSesion(TypedDict):
+    motor: EstadoMotorEmocional
+    recuerdo: Recuerdo
+    emocion_prompt: str
+    resumen: str
+
+
+class MetricasAlmacen(TypedDict):
+    guardados: int
+    cargas: int
+    us_promedio_guardado: float
+    us_promedio_carga: float
+    us_ultimo_guardado: float
+    us_ultima_carga: float
+
+
+class AlmacenSesiones(ABC):
+    """Interfaz para guardar y recuperar sesiones entre reinicios o entre workers.
+
+    Los mensajes se agregan por turno (nunca se reescribe el historial completo) y el estado
+    emocional se guarda aparte. Las implementaciones miden cuánto tarda cada operación en
+    microsegundos (ver `metricas`).
+    """
+
+    def __init__(self) -> None:
+        self._guardados = 0
+        self._cargas = 0
+        self._ns_guardado = 0
+        self._ns_carga = 0
+        self._ns_ultimo_guardado = 0
+        self._ns_ultima_carga = 0
+
+    @abstractmethod
+    def agregar_mensajes(self, id_sesion: str, mensajes: list[ModelMessage]) -> None:
+        """Agrega los mensajes de un turno al final del historial guardado."""
+
+    @abstractmethod
+    def cargar_mensajes(
+        self, id_sesion: str, max_turnos: Optional[int] = None
+    ) -> list[ModelMessage]:
+        """Carga los mensajes guardados, opcionalmente solo los de los últimos turnos."""
+
+    @abstractmethod
+    def guardar_estado(self, id_sesion: str, estado: EstadoSesion) -> None:
+        """Guarda (o reemplaza) el estado emocional de la sesión."""
+
+    @abstractmethod
+    def cargar_estado(self, id_sesion: str) -> Optional[EstadoSesion]:
+        """Carga el estado emocional de la sesión, si existe."""
+
+    @abstractmethod
+    def eliminar(self, id_sesion: str) -> None:
+        """Borra los mensajes y el estado de la sesión."""
+
+    def _medir_guardado(self, inicio: int) -> None:
+        self._ns_ultimo_guardado = perf_counter_ns() - inicio
+        self._ns_guardado += self._ns_ultimo_guardado
+        self._guardados += 1
+
+    def _medir_carga(self, inicio: int) -> None:
+        self._ns_ultima_carga = perf_counter_ns() - inicio
+        self._ns_carga += self._ns_ultima_carga
+        self._cargas += 1
+
+    def metricas(self) -> MetricasAlmacen:
+        """Devuelve cuántas operaciones se hicieron y cuánto tardaron, en microsegundos.
+
+        Returns:
+            MetricasAlmacen: Conteos y tiempos promedio y último de guardado y carga.
+        """
+        return {
+            "guardados": self._guardados,
+            "cargas": self._cargas,
+            "us_promedio_guardado": (
+                self._ns_guardado / self._guardados / 1000 if self._guardados else 0.0
+            ),
+            "us_promedio_carga": (
+                self._ns_carga / self._cargas / 1000 if self._cargas else 0.0
+            ),
+            "us_ultimo_guardado": self._ns_ultimo_guardado / 1000,
+            "us_ultima_carga": self._ns_ultima_carga / 1000,
+        }
+
+
+class AlmacenSQLite(AlmacenSesiones):
+    """Almacén de sesiones en un archivo SQLite local en modo WAL.
+
+    Cada turno es una fila nueva con sus mensajes serializados con `AdaptadorMensajes`, así que
+    guardar un turno cuesta lo mismo sin importar lo largo de la conversación. Ejemplo de uso:
+
+        almacen = AlmacenSQLite("sesiones.db")
+        sesion = Sesion(id_sesion="usuario_42", almacen=almacen)
+
+    Atributes:
+        ruta (str): Ruta al archivo de la base de datos.
+    """
+
+    def __init__(self, ruta: str) -> None:
+        super().__init__()
+        self.ruta = ruta
+        self._candado = Lock()
+        self._conexion = sqlite3.connect(
+            ruta, check_same_thread=False, isolation_level=None
+        )
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS turnos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id_sesion TEXT NOT NULL,
+                mensajes BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS turnos_por_sesion ON turnos (id_sesion, id);
+            CREATE TABLE IF NOT EXISTS estados (
+                id_sesion TEXT PRIMARY KEY,
+                estado TEXT NOT NULL
+            );
+            """
+        )
+
+    def agregar_mensajes(self, id_sesion: str, mensajes: list[ModelMessage]) -> None:
+        if not mensajes:
+            return
+
+        inicio = perf_counter_ns()
+        datos = AdaptadorMensajes.dump_json(mensajes)
+        with self._candado:
+            self._conexion.execute(
+                "INSERT INTO turnos (id_sesion, mensajes) VALUES (?, ?)",
+                (id_sesion, datos),
+            )
+        self._medir_guardado(inicio)
+
+    def cargar_mensajes(
+        self, id_sesion: str, max_turnos: Optional[int] = None
+    ) -> list[ModelMessage]:
+        inicio = perf_counter_ns()
+        with self._candado:
+            filas = self._conexion.execute(
+                "SELECT mensajes FROM turnos WHERE id_sesion = ? ORDER BY id DESC LIMIT ?",
+                (id_sesion, -1 if max_turnos is None else max_turnos),
+            ).fetchall()
+
+        mensajes: list[ModelMessage] = []
+        for (datos,) in reversed(filas):
+            mensajes.extend(AdaptadorMensajes.validate_json(datos))
+        self._medir_carga(inicio)
+        return mensajes
+
+    def guardar_estado(self, id_sesion: str, estado: EstadoSesion) -> None:
+        inicio = perf_counter_ns()
+        datos = json.dumps(estado, ensure_ascii=False)
+        with self._candado:
+            self._conexion.execute(
+                "INSERT INTO estados (id_sesion, estado) VALUES (?, ?) "
+                "ON CONFLICT (id_sesion) DO UPDATE SET estado = excluded.estado",
+                (id_sesion, datos),
+            )
+        self._medir_guardado(inicio)
+
+    def cargar_estado(self, id_sesion: str) -> Optional[EstadoSesion]:
+        inicio = perf_counter_ns()
+        with self._candado:
+            fila = self._conexion.execute(
+                "SELECT estado FROM estados WHERE id_sesion = ?", (id_sesion,)
+            ).fetchone()
+        self._medir_carga(inicio)
+        return json.loads(fila[0]) if fila else None
+
+    def eliminar(self, id_sesion: str) -> None:
+        with self._candado:
+            self._conexion.execute("DELETE FROM turnos WHERE id_sesion = ?", (id_sesion,))
+            self._conexion.execute("DELETE FROM estados WHERE id_sesion = ?", (id_sesion,))
+
+    def cerrar(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        with self._candado:
+            self._conexion.close()
@@ -1,20 +1,75 @@
-from typing import Optional
+import asyncio
+from dataclasses import replace
+from functools import lru_cache
+from sys import getsizeof
+from threading import Lock
+from time import perf_counter
+from typing import AsyncIterator, Optional
 
 from pydantic import TypeAdapter
 from pydantic_ai import Agent
-from pydantic_ai.messages import ModelMessage
+from pydantic_ai.agent import AgentRunResult
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    UserPromptPart,
+)
+from pydantic_ai.models import Model
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import RunUsage
 
 from .configuracion import ConfigurarEstrellas
 from .constantes import (
-    AJUSTES_CONTEXTO,
+    AJUSTES_MODELO,
     DISPARADORES_VERBOSIDAD,
+    INSTRUCCIONES_VERBOSIDAD,
     PROMPT_ESTRELLA,
     PROMPT_LUNITA,
 )
 from .herramientas import HERRAMIENTAS
+from .historial import HistorialAcotado
+from .instrumentacion import etapa, instrumentar_herramienta, instrumentar_modelo
+from .limitador import estimar_tokens_texto, liquidar, reservar
+from .niveles import NivelVerbosidad, registrar_latencia_nivel
+from .resiliencia import RutaRespuesta, error_transitorio, espera_reintento
+from .resumen import CompactadorHistorial
+from .uso import ContadorUso, UsoTurno, calcular_uso, registrar_uso_total
 
 AdaptadorMensajes = TypeAdapter(list[ModelMessage])
 
+# Un solo agente por vidente para todo el proceso: el modelo se resuelve en cada corrida desde la
+# configuración y la emoción viaja al final del mensaje del usuario, así que nada de esto cambia
+# por turno.
+_AGENTES: dict[str, Agent[None, str]] = {}
+_CANDADO_AGENTES = Lock()
+
+# Sobrecosto aproximado de cada parte de mensaje (objeto, timestamp, metadatos).
+BYTES_POR_PARTE = 400
+
+
+@lru_cache(maxsize=1024)
+def fragmento_emocion(emocion: str, instrucciones: tuple[str, ...]) -> str:
+    """Arma (una sola vez por combinación) el texto del estado emocional de la vidente.
+
+    Ambas videntes comparten las tablas de emociones, así que el fragmento depende solo de la
+    emoción y sus instrucciones.
+
+    Args:
+        emocion (str): La emoción actual de la vidente.
+        instrucciones (tuple[str, ...]): Las instrucciones de esa emoción.
+
+    Returns:
+        str: El fragmento listo para la cola del mensaje.
+    """
+    return (
+        f"(Tu estado emocional es: {emocion})\n"
+        "EMOCIONES ACTUALES (Ajusta tus respuestas a esta emociones a tus respuestas): "
+        + "\n".join(instrucciones)
+        + "\nAdapta todas tus respuestas a este estado emocional de manera sutil pero perceptible."
+    )
+
 
 class Cliente:
     """Cliente de IA que maneja la interacción con el modelo de lenguaje.
@@ -25,65 +80,103 @@ class Cliente:
     Atributes:
         configuracion (ConfigurarEstrellas): Instancia de configuración para el cliente.
         emocion (str): La emoción actual del cliente IA.
-        historial (list[ModelMessage]):
-            Historial de mensajes para mantener el contexto de la conversación.
-        _agente (Agent): Instancia del agente de IA que maneja las interacciones.
+        historial (HistorialAcotado):
+            Historial de mensajes para mantener el contexto de la conversación, acotado por un
+            presupuesto de tokens (`AJUSTES_CONTEXTO`).
+        ultima_ruta (Optional[RutaRespuesta]): Qué camino respondió el último turno.
+        ultimo_nivel (Optional[NivelVerbosidad]): Nivel de verbosidad del último turno, que
+            decide su modelo y sus ajustes (ver `ConfigurarEstrellas.politica_nivel`).
+        ultimo_modelo (Optional[str]): Modelo que respondió el último turno, si fue uno.
+        _agente (Agent): Agente compartido por todos los clientes de la misma vidente.
     """
 
     def __init__(
         self,
         emocion: str,
         historial: Optional[list[ModelMessage]] = None,
+        configuracion: Optional[ConfigurarEstrellas] = None,
     ):
-        self.configuracion = ConfigurarEstrellas.get_instance()
+        self.configuracion = ConfigurarEstrellas.resolver(configuracion)
         self.emocion = emocion
-        self._historial: list[ModelMessage] = historial or []
-        self._agente = self._crear_agente()
+        self._compactador: Optional[CompactadorHistorial] = None
+        if self.configuracion.historial and self.configuracion.resumir_historial:
+            self._compactador = CompactadorHistorial(self.configuracion)
 
-    def _crear_agente(self) -> Agent:
+        self._historial = HistorialAcotado(
+            historial,
+            al_descartar=self._compactador.encolar if self._compactador else None,
+        )
+        self.ultimos_mensajes: list[ModelMessage] = []
+        self.ultimo_uso: Optional[UsoTurno] = None
+        self.ultima_ruta: Optional[RutaRespuesta] = None
+        self.ultimo_nivel: Optional[NivelVerbosidad] = None
+        self.ultimo_modelo: Optional[str] = None
+        self.uso = ContadorUso()
+        self._agente = self._obtener_agente()
+
+    def _obtener_agente(self) -> Agent[None, str]:
+        """Devuelve el agente compartido de la vidente configurada, creándolo la primera vez.
+
+        Returns:
+            Agent: El agente de la vidente.
+        """
+        vidente = self.configuracion.configuracion_vidente.vidente
+        agente = _AGENTES.get(vidente)
+        if agente is None:
+            with _CANDADO_AGENTES:
+                agente = _AGENTES.get(vidente)
+                if agente is None:
+                    with etapa("crear_agente"):
+                        agente = _AGENTES[vidente] = self._crear_agente()
+        return agente
+
+    def _crear_agente(self) -> Agent[None, str]:
         """Crea y devuelve una instancia del agente de IA con la configuración actual.
 
-        Configura el agente utilizando el modelo especificado en la configuración, las herramientas
-        disponibles y el prompt del sistema que incluye la emoción actual.
+        Configura el agente con las herramientas disponibles y el prompt de la vidente. El prompt
+        va como instrucción (no como system prompt guardado en el historial) para que no se
+        pierda cuando se recortan los turnos viejos. Las instrucciones y las herramientas son
+        idénticas en cada turno, así el proveedor puede reusar su cache del prefijo; todo lo que
+        cambia por turno va al final del mensaje del usuario (ver `_preparar_mensaje`). El modelo
+        no se fija aquí: se pasa en cada corrida para que el mismo agente sirva a cualquier
+        modelo.
 
         Returns:
             Agent: Una instancia configurada del agente de IA.
         """
         return Agent(
-            model=self.configuracion.configuracion_modelo(),
-            tools=HERRAMIENTAS,
-            system_prompt=self._construir_prompt_sistema(),
+            tools=[instrumentar_herramienta(herramienta) for herramienta in HERRAMIENTAS],
+            instructions=self._construir_prompt_sistema(),
         )
 
     def _construir_prompt_sistema(self) -> str:
-        """Construye el prompt del sistema con la emoción actual
+        """Construye el prompt del sistema de la vidente
 
-        Metodo privado para construir el prompt del sistema que incorpora la emoción actual
-        del cliente IA. Selecciona el prompt base según la configuración del vidente y añade la
-        instrucción para adaptar las respuestas a la emoción.
+        Metodo privado que selecciona el prompt base según la configuración del vidente. La
+        emoción no va aquí, viaja al final de cada mensaje del usuario.
 
         Returns:
-            str: El prompt del sistema adaptado a la emoción actual.
+            str: El prompt del sistema de la vidente.
         """
-        prompt = (
+        return (
             PROMPT_LUNITA
             if self.configuracion.configuracion_vidente.vidente == "lunita"
             else PROMPT_ESTRELLA
         )
-        prompt += f"\n{self.emocion} Adapta todas tus respuestas a este estado emocional de manera sutil pero perceptible."
-        return prompt
 
-    def _calcular_factor_verbosidad(self, mensaje: str) -> str:
-        """Calcula el factor de verbosidad basado en el mensaje del usuario.
+    def _clasificar_verbosidad(self, mensaje: str) -> NivelVerbosidad:
+        """Clasifica el mensaje del usuario en un nivel de verbosidad.
 
         Determina la longitud apropiada para la respuesta del agente en función de la cantidad
-        de palabras en el mensaje del usuario y la presencia de disparadores de verbosidad.
+        de palabras en el mensaje del usuario y la presencia de disparadores de verbosidad. El
+        nivel decide la instrucción de longitud y, según `ConfigurarEstrellas.niveles`, el
+        modelo y los ajustes con los que se responde.
 
         Args:
             mensaje (str): El mensaje del usuario.
 
         Returns:
-            str: Instrucción de longitud para la respuesta del agente.
+            NivelVerbosidad: "breve", "medio" o "largo".
         """
         palabras_usuario = len(mensaje.split())
         quiere_verbosidad = any(
@@ -91,18 +184,225 @@ class Cliente:
         )
 
         if palabras_usuario < 6 and not quiere_verbosidad:
-            return "LENGTH: Be extremely brief. One or two sentences max. Get straight to the point"
+            return "breve"
         elif 6 <= palabras_usuario <= 18 and not quiere_verbosidad:
-            return "LENGTH: Medium-length response. A small paragraph is enough"
+            return "medio"
         else:
-            return "LENGTH: You may elaborate and ramble a bit, but without writing a whole novel"
+            return "largo"
+
+    def _calcular_factor_verbosidad(self, mensaje: str) -> str:
+        """Devuelve la instrucción de longitud para la respuesta según la verbosidad del
+        mensaje del usuario (ver `_clasificar_verbosidad`)."""
+        return INSTRUCCIONES_VERBOSIDAD[self._clasificar_verbosidad(mensaje)]
+
+    def _preparar_mensaje(self, mensaje: str, nivel: Optional[NivelVerbosidad] = None) -> str:
+        """Agrega al final del mensaje del usuario el estado emocional y la instrucción de
+        longitud según su verbosidad, las partes del prompt que cambian en cada turno."""
+        largo_verbosidad = INSTRUCCIONES_VERBOSIDAD[nivel or self._clasificar_verbosidad(mensaje)]
+        return f"{mensaje} \n\n{self.emocion}\n({largo_verbosidad})"
+
+    @staticmethod
+    def _sin_cola(mensajes: list[ModelMessage], mensaje: str) -> list[ModelMessage]:
+        """Quita de los mensajes del turno la cola volátil que agregó `_preparar_mensaje`.
+
+        El historial guarda solo lo que escribió el usuario: la emoción y la longitud de turnos
+        pasados ya no aplican y solo gastarían tokens.
+        """
+        limpios = []
+        for m in mensajes:
+            if isinstance(m, ModelRequest) and any(
+                isinstance(parte, UserPromptPart) for parte in m.parts
+            ):
+                m = replace(
+                    m,
+                    parts=[
+                        replace(parte, content=mensaje)
+                        if isinstance(parte, UserPromptPart)
+                        else parte
+                        for parte in m.parts
+                    ],
+                )
+            limpios.append(m)
+        return limpios
+
+    def _historial_limitado(self) -> Optional[list[ModelMessage]]:
+        """Devuelve el historial acotado, precedido por el resumen si lo hay, o `None` si está
+        deshabilitado."""
+        if not self.configuracion.historial:
+            return None
+
+        mensajes = self._historial.mensajes()
+        if self._compactador is not None:
+            resumen = self._compactador.mensaje_resumen()
+            if resumen is not None:
+                mensajes.insert(0, resumen)
+        return mensajes
+
+    def _registrar_turno(self, mensajes: list[ModelMessage]) -> None:
+        """Guarda los mensajes del turno y, si hace falta, programa el resumen en segundo plano."""
+        self.ultimos_mensajes = mensajes
+        if not self.configuracion.historial:
+            return
+
+        self._historial.agregar(mensajes)
+        if self._compactador is not None:
+            self._compactador.programar()
+
+    def registrar_respuesta_local(
+        self, mensaje: str, texto: str, ruta: RutaRespuesta = "horoscopo"
+    ) -> None:
+        """Guarda en el historial un turno que se respondió sin llamar al modelo.
+
+        Args:
+            mensaje (str): El mensaje del usuario.
+            texto (str): La respuesta que se le dio.
+            ruta (RutaRespuesta): De dónde salió la respuesta.
+        """
+        self._registrar_turno(
+            [
+                ModelRequest(parts=[UserPromptPart(content=mensaje)]),
+                ModelResponse(parts=[TextPart(content=texto)]),
+            ]
+        )
+        self.ultimo_uso = None
+        self.ultimo_modelo = None
+        self.ultima_ruta = ruta
+        self.ultimo_nivel = None
+
+    async def _reservar(
+        self, mensaje: str, historial: Optional[list[ModelMessage]], ajustes: ModelSettings
+    ) -> int:
+        """Espera turno en el limitador de tasa del proceso con una estimación de los tokens de
+        la corrida: prompt, historial, mensaje y el máximo de salida."""
+        with etapa("limitador"):
+            return await reservar(
+                estimar_tokens_texto(self._construir_prompt_sistema(), mensaje)
+                + (self._historial.tokens if historial else 0)
+                + ajustes.get("max_tokens", AJUSTES_MODELO.get("max_tokens", 0))
+            )
+
+    def _nombre_modelo(self, modelo: Model) -> str:
+        """Nombre con el que se reporta y se cobra un modelo: el de la configuración si es el
+        modelo personalizado, o el suyo propio (el del nivel o el de respaldo)."""
+        if modelo is self.configuracion.modelo_personalizado:
+            return self.configuracion.modelo
+        return modelo.model_name
+
+    def _registrar_uso(self, uso: RunUsage, modelo: Model) -> None:
+        """Guarda el uso del turno, cobrado con el precio del modelo que respondió, y lo suma a
+        los totales de la sesión y del proceso."""
+        self.ultimo_modelo = self._nombre_modelo(modelo)
+        self.ultimo_uso = calcular_uso(uso, self.ultimo_modelo)
+        self.uso.registrar(self.ultimo_uso)
+        registrar_uso_total(self.ultimo_uso)
+
+    def _fallar(self, ruta: RutaRespuesta) -> str:
+        """Deja el turno sin respuesta del modelo (no se guarda en el historial) y devuelve el
+        mensaje de error de la vidente."""
+        self.ultima_ruta = ruta
+        self.ultimo_uso = None
+        self.ultimo_modelo = None
+        self.ultimos_mensajes = []
+        return self.configuracion.configuracion_vidente.obtener_mensajes_error()["error_api"]
+
+    async def _correr(
+        self,
+        modelo: Model,
+        mensaje: str,
+        historial: Optional[list[ModelMessage]],
+        ajustes: ModelSettings,
+    ) -> tuple[AgentRunResult[str], int]:
+        """Corre el agente con un modelo, reintentando los errores transitorios.
+
+        Cada intento espera su turno en el limitador de tasa y liquida su reserva al terminar
+        (si falla o se cancela, la devuelve), así los reintentos también cuentan contra los
+        límites del proceso.
+
+        Returns:
+            El resultado de la corrida y cuántos reintentos hicieron falta.
+        """
+        resiliencia = self.configuracion.resiliencia
+        intento = 0
+        while True:
+            reservados = await self._reservar(mensaje, historial, ajustes)
+            uso: Optional[RunUsage] = None
+            try:
+                r = await self._agente.run(
+                    mensaje,
+                    message_history=historial,
+                    model=instrumentar_modelo(modelo),
+                    model_settings=ajustes,
+                )
+                uso = r.usage()
+                return r, intento
+            except Exception as error:
+                if intento >= resiliencia["reintentos"] or not error_transitorio(error):
+                    raise
+            finally:
+                liquidar(reservados, uso)
+            await asyncio.sleep(
+                espera_reintento(intento, resiliencia["espera_base"], resiliencia["espera_maxima"])
+            )
+            intento += 1
+
+    async def _correr_cubierto(
+        self,
+        modelo: Model,
+        mensaje: str,
+        historial: Optional[list[ModelMessage]],
+        ajustes: ModelSettings,
+    ) -> tuple[AgentRunResult[str], RutaRespuesta, Model]:
+        """Corre el agente con el modelo del nivel y, si hay respaldo, lo cubre con él.
+
+        Si el principal no respondió en `retraso_respaldo` segundos (o ya falló), se manda la
+        misma petición al modelo de respaldo y gana la primera respuesta; la otra se cancela.
+
+        Returns:
+            El resultado de la corrida, el camino que respondió y el modelo que lo hizo.
+        """
+        principal = asyncio.ensure_future(self._correr(modelo, mensaje, historial, ajustes))
+        tareas = {principal}
+        try:
+            respaldo = self.configuracion.configuracion_respaldo()
+            retraso = self.configuracion.resiliencia["retraso_respaldo"]
+            if respaldo is not None and retraso is not None:
+                await asyncio.wait(tareas, timeout=retraso)
+                if not principal.done() or principal.exception() is not None:
+                    tareas.add(
+                        asyncio.ensure_future(
+                            self._correr(respaldo, mensaje, historial, ajustes)
+                        )
+                    )
+
+            error: Optional[BaseException] = None
+            while tareas:
+                terminadas, tareas = await asyncio.wait(
+                    tareas, return_when=asyncio.FIRST_COMPLETED
+                )
+                for tarea in terminadas:
+                    error = tarea.exception()
+                    if error is None:
+                        r, reintentos = tarea.result()
+                        if tarea is not principal:
+                            return r, "respaldo", respaldo  # type: ignore
+                        return r, "reintento" if reintentos else "principal", modelo
+            raise error  # type: ignore
+        finally:
+            for tarea in tareas:
+                tarea.cancel()
 
     async def preguntar(self, mensaje: str) -> str:
         """Realiza una pregunta al agente de IA y obtiene la respuesta.
 
         Envía el mensaje del usuario al agente de IA, incluyendo el historial de mensajes
         si está habilitado en la configuración. Calcula el factor de verbosidad para adaptar
-        la longitud de la respuesta del agente.
+        la longitud de la respuesta del agente, y con ella el modelo y los ajustes con los que
+        se responde (ver `ConfigurarEstrellas.niveles`). Los errores transitorios del proveedor se
+        reintentan y, si hay modelo de respaldo, las respuestas lentas se cubren con él (ver
+        `AJUSTES_RESILIENCIA`). Si se vence el plazo del turno o fallan todos los intentos, se
+        responde con el mensaje de error de la vidente. `ultima_ruta` indica qué camino
+        respondió. Cada intento (reintentos y respaldo incluidos) pasa por el limitador de tasa,
+        y esa espera cuenta dentro del plazo.
 
         Args:
             mensaje (str): El mensaje del usuario.
@@ -110,34 +410,155 @@ class Cliente:
         Returns:
             str: La respuesta del agente de IA.
         """
-        largo_verbosidad = self._calcular_factor_verbosidad(mensaje)
+        self.ultimo_nivel = nivel = self._clasificar_verbosidad(mensaje)
+        modelo, ajustes = self.configuracion.politica_nivel(nivel)
+        preparado = self._preparar_mensaje(mensaje, nivel)
+        historial = self._historial_limitado()
+        try:
+            with etapa("agente"):
+                inicio = perf_counter()
+                r, ruta, modelo = await asyncio.wait_for(
+                    self._correr_cubierto(modelo, preparado, historial, ajustes),
+                    self.configuracion.resiliencia["plazo"],
+                )
+        except asyncio.TimeoutError:
+            return self._fallar("plazo_vencido")
+        except Exception as error:
+            if not error_transitorio(error):
+                raise
+            return self._fallar("error")
 
-        mensaje_con_contexto = f"{mensaje} \n ({largo_verbosidad})"
+        self.ultima_ruta = ruta
+        registrar_latencia_nivel(nivel, perf_counter() - inicio, r.usage().output_tokens)
+        self._registrar_turno(self._sin_cola(r.new_messages(), mensaje))
+        self._registrar_uso(r.usage(), modelo)
+        return r.output
 
-        if self.configuracion.historial:
-            historial_limitado = (
-                self._historial[-AJUSTES_CONTEXTO["max_historial"] :]
-                if len(self._historial) > AJUSTES_CONTEXTO["max_historial"]
-                else self._historial
-            )
+    async def preguntar_stream(self, mensaje: str) -> AsyncIterator[str]:
+        """Realiza una pregunta al agente de IA y entrega la respuesta en fragmentos.
+
+        Igual que `preguntar`, pero va devolviendo el texto conforme llega del modelo. Las
+        llamadas a herramientas se resuelven antes de que empiece el texto final. El historial
+        se actualiza cuando termina la respuesta. Los errores transitorios se reintentan
+        mientras no se haya entregado ningún fragmento. Cada intento pasa por el limitador de
+        tasa; el plazo solo acota esa espera y no hay respaldo, porque el texto empieza a llegar apenas el modelo
+        lo genera.
 
-            r = await self._agente.run(
-                mensaje_con_contexto, message_history=historial_limitado
+        Args:
+            mensaje (str): El mensaje del usuario.
+
+        Yields:
+            str: Cada nuevo fragmento de la respuesta.
+        """
+        self.ultimo_nivel = nivel = self._clasificar_verbosidad(mensaje)
+        modelo, ajustes = self.configuracion.politica_nivel(nivel)
+        preparado = self._preparar_mensaje(mensaje, nivel)
+        historial = self._historial_limitado()
+        resiliencia = self.configuracion.resiliencia
+        intento = 0
+        entregado = False
+        inicio = perf_counter()
+        while True:
+            try:
+                reservados = await asyncio.wait_for(
+                    self._reservar(preparado, historial, ajustes), resiliencia["plazo"]
+                )
+            except asyncio.TimeoutError:
+                yield self._fallar("plazo_vencido")
+                return
+
+            uso: Optional[RunUsage] = None
+            try:
+                async with self._agente.run_stream(
+                    preparado,
+                    message_history=historial,
+                    model=instrumentar_modelo(modelo),
+                    model_settings=ajustes,
+                ) as r:
+                    # Sin agrupar fragmentos: lo que importa es el tiempo al primer token.
+                    async for fragmento in r.stream_text(delta=True, debounce_by=None):
+                        entregado = True
+                        yield fragmento
+                uso = r.usage()
+                break
+            except Exception as error:
+                if entregado or not error_transitorio(error):
+                    raise
+                if intento >= resiliencia["reintentos"]:
+                    yield self._fallar("error")
+                    return
+            finally:
+                liquidar(reservados, uso)
+            await asyncio.sleep(
+                espera_reintento(intento, resiliencia["espera_base"], resiliencia["espera_maxima"])
             )
-            self._historial.extend(r.new_messages())
-        else:
-            r = await self._agente.run(mensaje_con_contexto)
+            intento += 1
 
-        return r.output
+        self.ultima_ruta = "reintento" if intento else "principal"
+        registrar_latencia_nivel(nivel, perf_counter() - inicio, uso.output_tokens)
+        self._registrar_turno(self._sin_cola(r.new_messages(), mensaje))
+        self._registrar_uso(uso, modelo)
+
+    def memoria_estimada(self) -> int:
+        """Estima los bytes que ocupa el historial de mensajes.
+
+        Es una aproximación barata: el tamaño de cada contenido de texto más una cantidad fija
+        por cada parte de mensaje.
+
+        Returns:
+            int: Bytes estimados.
+        """
+        total = 0
+        for mensaje in self._historial:
+            for parte in mensaje.parts:
+                contenido = getattr(parte, "content", None)
+                if contenido is None:
+                    contenido = getattr(parte, "args", None)
+                total += BYTES_POR_PARTE + (
+                    getsizeof(contenido)
+                    if isinstance(contenido, str)
+                    else len(repr(contenido))
+                )
+        return total
+
+    @property
+    def max_turnos_historial(self) -> int:
+        """Máximo de turnos que guarda el historial (ver `HistorialAcotado`)."""
+        return self._historial.max_turnos
+
+    @property
+    def resumen(self) -> str:
+        """El resumen acumulado de los turnos viejos, o cadena vacía si no hay."""
+        return self._compactador.resumen if self._compactador is not None else ""
+
+    def restaurar_historial(self, mensajes: list[ModelMessage], resumen: str = "") -> None:
+        """Reemplaza el historial por uno guardado, sin mandar a resumir lo que se recorte.
+
+        Args:
+            mensajes (list[ModelMessage]): Los mensajes guardados, en orden.
+            resumen (str): El resumen guardado de los turnos anteriores.
+        """
+        al_descartar = self._historial.al_descartar
+        self._historial.al_descartar = None
+        self._historial.limpiar()
+        self._historial.agregar(mensajes)
+        self._historial.al_descartar = al_descartar
+
+        if self._compactador is not None:
+            self._compactador.resumen = resumen
+
+    async def aclose(self) -> None:
+        """Espera a que terminen las tareas en segundo plano del cliente (el resumen)."""
+        if self._compactador is not None:
+            await self._compactador.esperar()
 
     def actualizar_emocion(self, nueva_emocion: str) -> None:
-        """Actualiza la emoción y recrea el agente
+        """Actualiza la emoción del cliente
 
-        Metodo para actualizar la emoción del cliente IA y recrear el agente con el nuevo estado
-        emocional.
+        La emoción se manda al final del siguiente mensaje del usuario, así que ni el agente ni
+        el prefijo del prompt cambian.
 
         Args:
             nueva_emocion (str): La nueva emoción para el cliente IA.
         """
         self.emocion = nueva_emocion
-        self._agente = self._crear_agente()
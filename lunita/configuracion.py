@@ -1,23 +1,57 @@
+from typing import TYPE_CHECKING, Optional, Union
+
 import httpx
-from pydantic_ai.models.openai import OpenAIChatModel
-from pydantic_ai.providers.deepseek import DeepSeekProvider
+from pydantic_ai.settings import ModelSettings
 
-from .constantes import AJUSTES_MODELO, CONFIG_API
+from .constantes import (
+    AJUSTES_HTTP,
+    AJUSTES_MODELO,
+    AJUSTES_NIVELES,
+    AJUSTES_RESILIENCIA,
+    CONFIG_API,
+)
+from .niveles import NivelVerbosidad, PoliticaNivel
 from .vidente import ConfigurarVidente
 
+if TYPE_CHECKING:
+    from pydantic_ai.models import Model
+
 
 class ConfigurarEstrellas:
     """
     Clase para configurar la vidente (el asistente IA).
 
+    Llamar a `ConfigurarEstrellas(...)` crea (una sola vez) la configuración global del proceso.
+    Para servir a varios inquilinos, modelos o videntes desde el mismo proceso, usa
+    `ConfigurarEstrellas.crear(...)`, que devuelve configuraciones independientes y, si se le pasa
+    `inquilino`, las registra para buscarlas después con `obtener_inquilino`. Todas comparten los
+    analizadores emocionales y los agentes ya cargados.
+
     Attributes:
         modelo (str): Modelo de IA a utilizar.
         token (str): Token de autenticación para la API (OpenRouter).
         usuario (str): Identificador del usuario.
         historial (bool): Indica si se debe mantener el historial de conversaciones.
+        resumir_historial (bool): Indica si los turnos viejos se resumen en vez de perderse.
+        analizar_emociones (bool): Indica si se analiza la vibra de los mensajes del usuario.
+        emocion_diferida (Optional[float]): Si se da, segundos de gracia que un turno espera el
+            análisis de la vibra antes de salir con el estado emocional anterior.
+        modelo_personalizado (Optional[Model]): Modelo que reemplaza al del proveedor, si se dio.
+        modelo_respaldo (Optional[Union[str, Model]]): Modelo secundario para cubrir las
+            respuestas lentas o fallidas del principal, si se dio.
+        resiliencia (dict): Plazo por turno, reintentos y retraso del respaldo
+            (ver `AJUSTES_RESILIENCIA`).
+        niveles (dict[str, PoliticaNivel]): Modelo y ajustes de cada nivel de verbosidad
+            (ver `AJUSTES_NIVELES`).
+        http2 (bool): Indica si se usa HTTP/2 con el proveedor (requiere el paquete `h2`).
+        inquilino (Optional[str]): Inquilino con el que se registró la configuración, si aplica.
 
     methods:
-        configuracion_modelo() -> OpenAIChatModel: Genera la configuración del modelo.
+        configuracion_modelo(nombre) -> Model: Genera la configuración del modelo.
+        configuracion_respaldo() -> Optional[Model]: El modelo de respaldo, si hay.
+        politica_nivel(nivel) -> tuple[Model, ModelSettings]: Modelo y ajustes de un nivel.
+        cliente_http() -> httpx.AsyncClient: Cliente HTTP compartido con pool de conexiones.
+        aclose(): Cierra las conexiones abiertas con el proveedor.
     """
 
     __slots__ = [
@@ -27,8 +61,22 @@ class ConfigurarEstrellas:
         "historial",
         "_emocion",
         "configuracion_vidente",
+        "_modelos",
+        "_cliente_http",
+        "_limites",
+        "_tiempo_espera",
+        "http2",
+        "inquilino",
+        "resumir_historial",
+        "analizar_emociones",
+        "emocion_diferida",
+        "modelo_personalizado",
+        "modelo_respaldo",
+        "resiliencia",
+        "niveles",
     ]
     _instance = None
+    _inquilinos: dict[str, "ConfigurarEstrellas"] = {}
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -41,6 +89,16 @@ class ConfigurarEstrellas:
         modelo: str,
         token: str,
         historial: bool = False,
+        limites: Optional[httpx.Limits] = None,
+        tiempo_espera: Optional[httpx.Timeout] = None,
+        http2: bool = False,
+        resumir_historial: bool = False,
+        analizar_emociones: bool = True,
+        emocion_diferida: Optional[float] = None,
+        modelo_personalizado: Optional["Model"] = None,
+        modelo_respaldo: Optional[Union[str, "Model"]] = None,
+        resiliencia: Optional[dict] = None,
+        niveles: Optional[dict[str, PoliticaNivel]] = None,
     ):
         """
         Inicializa la configuración de la vidente.
@@ -49,6 +107,34 @@ class ConfigurarEstrellas:
             modelo (str): Modelo de IA a utilizar.
             token (str): Token de autenticación para la API (OpenRouter).
             historial (bool): Indica si se debe mantener el historial de conversaciones.
+            limites (Optional[httpx.Limits]): Tamaño del pool y keep-alive. Por defecto usa
+                `AJUSTES_HTTP`.
+            tiempo_espera (Optional[httpx.Timeout]): Tiempos de espera de las peticiones. Por
+                defecto usa `AJUSTES_HTTP`.
+            http2 (bool): Indica si se usa HTTP/2 con el proveedor.
+            resumir_historial (bool): Si el historial está activo, pliega los turnos que se
+                salen del presupuesto en un resumen que se genera en segundo plano.
+            analizar_emociones (bool): Si es False, las sesiones no analizan la vibra del usuario
+                y nunca cargan pysentimiento; la vidente solo cambia de humor por su cuenta.
+            emocion_diferida (Optional[float]): Activa el modo de emoción diferida: el análisis
+                de la vibra del mensaje corre en paralelo con la llamada al modelo y el turno
+                sale con el estado emocional del mensaje anterior, salvo que el análisis termine
+                dentro de estos segundos de gracia (0 no espera nada). El resultado se aplica
+                al turno siguiente. Con `None` (por defecto) el turno espera el análisis.
+            modelo_personalizado (Optional[Model]): Modelo de pydantic-ai que se usa en lugar
+                del proveedor (por ejemplo `TestModel` o `FunctionModel` para pruebas y
+                benchmarks sin red). `modelo` y `token` se siguen validando pero no se usan.
+            modelo_respaldo (Optional[Union[str, Model]]): Nombre de otro modelo del mismo
+                proveedor (o un modelo de pydantic-ai) al que se manda una copia de la petición
+                si el principal no respondió tras `retraso_respaldo` segundos o falló; gana la
+                primera respuesta.
+            resiliencia (Optional[dict]): Cambia valores de `AJUSTES_RESILIENCIA`: `plazo`
+                (segundos por turno, `None` sin plazo), `reintentos`, `espera_base`,
+                `espera_maxima` y `retraso_respaldo` (`None` desactiva el respaldo).
+            niveles (Optional[dict[str, PoliticaNivel]]): Cambia la política de
+                `AJUSTES_NIVELES` para los niveles "breve", "medio" o "largo": `modelo` (nombre
+                del proveedor o modelo de pydantic-ai; `None` usa `modelo`) y `ajustes` (por
+                ejemplo `max_tokens` y `temperature`, encima de `AJUSTES_MODELO`).
         """
 
         if getattr(self, "_initialized", False):
@@ -67,6 +153,37 @@ class ConfigurarEstrellas:
             raise ValueError("El token no puede estar vacío.")
 
         self.historial = historial
+        self.resumir_historial = resumir_historial
+        self.analizar_emociones = analizar_emociones
+        if emocion_diferida is not None and emocion_diferida < 0:
+            raise ValueError("La espera de la emoción diferida no puede ser negativa.")
+        self.emocion_diferida = emocion_diferida
+        self.modelo_personalizado = modelo_personalizado
+        self.modelo_respaldo = modelo_respaldo
+        self.resiliencia = {**AJUSTES_RESILIENCIA, **(resiliencia or {})}
+
+        desconocidos = set(niveles or {}) - set(AJUSTES_NIVELES)
+        if desconocidos:
+            raise ValueError(
+                f"Niveles de verbosidad no reconocidos: {', '.join(sorted(desconocidos))}. "
+                "Usa 'breve', 'medio' o 'largo'."
+            )
+        self.niveles: dict[str, PoliticaNivel] = {
+            nivel: {**politica, **(niveles or {}).get(nivel, {})}  # type: ignore
+            for nivel, politica in AJUSTES_NIVELES.items()
+        }
+        self.http2 = http2
+        self._limites = limites or httpx.Limits(
+            max_connections=AJUSTES_HTTP["max_conexiones"],
+            max_keepalive_connections=AJUSTES_HTTP["max_conexiones_keepalive"],
+            keepalive_expiry=AJUSTES_HTTP["expiracion_keepalive"],
+        )
+        self._tiempo_espera = tiempo_espera or httpx.Timeout(
+            AJUSTES_HTTP["tiempo_espera"], connect=AJUSTES_HTTP["tiempo_conexion"]
+        )
+        self._cliente_http: Optional[httpx.AsyncClient] = None
+        self._modelos: dict[str, "Model"] = {}
+        self.inquilino: Optional[str] = None
 
         self._initialized = True
 
@@ -78,6 +195,73 @@ class ConfigurarEstrellas:
             )
         return cls._instance
 
+    @classmethod
+    def crear(
+        cls, *args, inquilino: Optional[str] = None, **kwargs
+    ) -> "ConfigurarEstrellas":
+        """
+        Crea una configuración independiente de la global, con los mismos argumentos que el
+        constructor.
+        Args:
+            inquilino (Optional[str]): Si se indica, registra la configuración con esta clave.
+        Returns:
+            ConfigurarEstrellas: La nueva configuración.
+        """
+        configuracion = object.__new__(cls)
+        configuracion.__init__(*args, **kwargs)
+
+        if inquilino is not None:
+            configuracion.inquilino = inquilino
+            cls._inquilinos[inquilino] = configuracion
+        return configuracion
+
+    @classmethod
+    def obtener_inquilino(cls, inquilino: str) -> "ConfigurarEstrellas":
+        """
+        Busca la configuración registrada para un inquilino.
+        Args:
+            inquilino (str): Clave del inquilino.
+        Returns:
+            ConfigurarEstrellas: La configuración del inquilino.
+        """
+        try:
+            return cls._inquilinos[inquilino]
+        except KeyError:
+            raise ValueError(
+                f"No hay una configuración registrada para el inquilino '{inquilino}'."
+            ) from None
+
+    @classmethod
+    def eliminar_inquilino(cls, inquilino: str) -> Optional["ConfigurarEstrellas"]:
+        """
+        Quita un inquilino del registro. Sus conexiones se cierran con `aclose()`.
+        Returns:
+            Optional[ConfigurarEstrellas]: La configuración quitada, si existía.
+        """
+        return cls._inquilinos.pop(inquilino, None)
+
+    @classmethod
+    def inquilinos(cls) -> list[str]:
+        """Devuelve las claves de los inquilinos registrados."""
+        return list(cls._inquilinos)
+
+    @classmethod
+    def resolver(
+        cls,
+        configuracion: Optional["ConfigurarEstrellas"] = None,
+        inquilino: Optional[str] = None,
+    ) -> "ConfigurarEstrellas":
+        """
+        Elige la configuración a usar: la explícita, la del inquilino o la global, en ese orden.
+        Returns:
+            ConfigurarEstrellas: La configuración elegida.
+        """
+        if configuracion is not None:
+            return configuracion
+        if inquilino is not None:
+            return cls.obtener_inquilino(inquilino)
+        return cls.get_instance()
+
     def _http_headers(self) -> dict[str, str]:
         """
         Genera las cabeceras HTTP necesarias para la autenticación.
@@ -89,20 +273,103 @@ class ConfigurarEstrellas:
             "X-Title": CONFIG_API["titulo"],
         }
 
-    def configuracion_modelo(self) -> OpenAIChatModel:
+    def cliente_http(self) -> httpx.AsyncClient:
         """
-        Genera la configuración del modelo.
+        Obtiene el cliente HTTP compartido, creándolo si no existe o si ya se cerró.
+
+        Todas las sesiones de esta configuración usan el mismo pool de conexiones, así que el
+        handshake TCP+TLS con el proveedor se paga una vez y no en cada mensaje.
         Returns:
-            OpenAIChatModel: Configuración del modelo.
+            httpx.AsyncClient: Cliente HTTP con pool de conexiones.
         """
+        if self._cliente_http is None or self._cliente_http.is_closed:
+            try:
+                self._cliente_http = httpx.AsyncClient(
+                    headers=self._http_headers(),
+                    limits=self._limites,
+                    timeout=self._tiempo_espera,
+                    http2=self.http2,
+                )
+            except ImportError as e:
+                raise ImportError(
+                    "Para usar HTTP/2 instala el extra de httpx: pip install 'httpx[http2]'"
+                ) from e
+            self._modelos.clear()
+        return self._cliente_http
 
-        provedor = DeepSeekProvider(
-            api_key=self.token,
-            http_client=httpx.AsyncClient(headers=self._http_headers()),
-        )
+    async def aclose(self) -> None:
+        """
+        Cierra las conexiones con el proveedor. Si se vuelve a usar la configuración, el pool
+        se abre de nuevo.
+        """
+        if self._cliente_http is not None:
+            await self._cliente_http.aclose()
+        self._cliente_http = None
+        self._modelos.clear()
+
+    async def __aenter__(self) -> "ConfigurarEstrellas":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
-        return OpenAIChatModel(
-            model_name=self.modelo,
+    def configuracion_modelo(self, nombre: Optional[str] = None) -> "Model":
+        """
+        Genera la configuración del modelo. Se crea una sola vez por nombre y se reutiliza en
+        cada turno, mientras el cliente HTTP compartido siga abierto. Si hay
+        `modelo_personalizado`, se devuelve ese sin abrir conexiones.
+        Args:
+            nombre (Optional[str]): Modelo del proveedor a usar. Por defecto, `modelo`.
+        Returns:
+            Model: Configuración del modelo.
+        """
+        if self.modelo_personalizado is not None:
+            return self.modelo_personalizado
+
+        nombre = nombre or self.modelo
+        cliente_http = self.cliente_http()
+        modelo = self._modelos.get(nombre)
+        if modelo is not None:
+            return modelo
+
+        # El SDK de OpenAI es pesado; se importa al crear el primer modelo, no con `lunita`.
+        from pydantic_ai.models.openai import OpenAIChatModel
+        from pydantic_ai.providers.deepseek import DeepSeekProvider
+
+        # Sin reintentos del SDK: los hace el cliente según `resiliencia`, dentro del plazo. La
+        # URL base la pone el proveedor; solo se copia su cliente con `max_retries=0`.
+        cliente_openai = DeepSeekProvider(api_key=self.token, http_client=cliente_http).client
+        provedor = DeepSeekProvider(openai_client=cliente_openai.with_options(max_retries=0))
+
+        modelo = self._modelos[nombre] = OpenAIChatModel(
+            model_name=nombre,
             provider=provedor,
             settings=AJUSTES_MODELO,
         )
+        return modelo
+
+    def configuracion_respaldo(self) -> Optional["Model"]:
+        """
+        Devuelve el modelo de respaldo, creándolo con `configuracion_modelo` si se dio por
+        nombre.
+        Returns:
+            Optional[Model]: El modelo de respaldo, o `None` si no se configuró.
+        """
+        if self.modelo_respaldo is None or not isinstance(self.modelo_respaldo, str):
+            return self.modelo_respaldo
+        return self.configuracion_modelo(self.modelo_respaldo)
+
+    def politica_nivel(self, nivel: NivelVerbosidad) -> tuple["Model", ModelSettings]:
+        """
+        Resuelve el modelo y los ajustes con los que se responde un nivel de verbosidad.
+        Args:
+            nivel (NivelVerbosidad): "breve", "medio" o "largo".
+        Returns:
+            tuple[Model, ModelSettings]: El modelo del nivel y sus ajustes para la corrida.
+        """
+        politica = self.niveles[nivel]
+        modelo = politica.get("modelo")
+        ajustes = politica.get("ajustes") or ModelSettings()
+        if modelo is None or isinstance(modelo, str):
+            return self.configuracion_modelo(modelo), ajustes
+        return modelo, ajustes
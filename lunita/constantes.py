@@ -57,10 +57,72 @@ AJUSTES_MODELO = ModelSettings(
     presence_penalty=0.5,
 )
 
+AJUSTES_HTTP = {
+    "max_conexiones": 100,
+    "max_conexiones_keepalive": 20,
+    "expiracion_keepalive": 30.0,
+    "tiempo_espera": 60.0,
+    "tiempo_conexion": 10.0,
+}
+
+# Política por nivel de verbosidad (ver `Cliente._clasificar_verbosidad`). Con `modelo` en None
+# se usa el modelo principal; los `ajustes` se aplican encima de AJUSTES_MODELO. Por defecto todos
+# los niveles responden igual; topes más chicos para "breve" o "medio" se activan con
+# `ConfigurarEstrellas(niveles=...)`.
+AJUSTES_NIVELES = {
+    "breve": {"modelo": None, "ajustes": ModelSettings(max_tokens=800)},
+    "medio": {"modelo": None, "ajustes": ModelSettings(max_tokens=800)},
+    "largo": {"modelo": None, "ajustes": ModelSettings(max_tokens=800)},
+}
+
+AJUSTES_RESILIENCIA = {
+    "plazo": 45.0,
+    "reintentos": 2,
+    "espera_base": 0.5,
+    "espera_maxima": 4.0,
+    "retraso_respaldo": 8.0,
+}
+
 AJUSTES_CONTEXTO = {
-    "max_historial": 15,
+    "max_tokens_historial": 3000,
+    "max_turnos_historial": 50,
+}
+
+AJUSTES_RESUMEN = {
+    "max_tokens": 300,
+    "temperatura": 0.3,
+    "max_turnos_pendientes": 20,
+}
+
+PROMPT_RESUMEN = """
+You maintain the long-term memory of a chat between a user and a fortune-teller character.
+You receive the PREVIOUS SUMMARY and NEW MESSAGES that are leaving the chat window.
+Rewrite the summary so it includes the new messages: facts about the user (name, birthday, sign,
+worries, plans), readings and predictions already given, and open threads.
+Be concise (at most 8 short bullet points), drop small talk, never invent anything.
+WRITE THE SUMMARY IN SPANISH.
+""".strip()
+
+AJUSTES_HOROSCOPO = {
+    "concurrencia": 4,
+    "max_tokens": 400,
+    "temperatura": 0.9,
+    "max_palabras_pregunta": 12,
+}
+
+AJUSTES_LOTE = {
+    "concurrencia": 8,
 }
 
+PROMPT_HOROSCOPO = """
+Write today's horoscope ({fecha}) for the sign {signo}.
+Sign personality: {personalidad}
+How you see this sign: {interpretacion}
+Cover love, work and energy in one or two short paragraphs, fully in character, as if the user had
+just asked you for their horoscope. Do not call any tools.
+WRITE THE HOROSCOPE IN SPANISH.
+""".strip()
+
 MENSAJES_ERROR_LUNITA = {
     "mensaje_invalido": "¡Ups! Mis cristalitos están confundidos... ¿podrías decirlo de otra forma? ✨",
     "error_api": "¡Ay! Mi bola de cristal se empañó... ¡dale un momentito y vuelve a intentar! 🔮",
@@ -73,6 +135,12 @@ MENSAJES_ERROR_ESTRELLA = {
     "error_api": "¡Ay, mi varita mágica necesita un descanso! Inténtalo de nuevo en un ratito. 🌟",
 }
 
+INSTRUCCIONES_VERBOSIDAD = {
+    "breve": "LENGTH: Be extremely brief. One or two sentences max. Get straight to the point",
+    "medio": "LENGTH: Medium-length response. A small paragraph is enough",
+    "largo": "LENGTH: You may elaborate and ramble a bit, but without writing a whole novel",
+}
+
 DISPARADORES_VERBOSIDAD = [
     "cuéntame",
     "historia",
@@ -1,8 +1,8 @@
-from typing import Dict, List
+from typing import List, Mapping, Optional
 
-from pysentimiento import create_analyzer
-
-from ..utilidades import CargadorDatos
+from ..instrumentacion import etapa
+from ..utilidades import CargadorDatos, RegistroDatos
+from .inferencia import ResultadoVibra, inferir_vibra, inferir_vibra_async
 
 
 class AnalizardorEmocional(CargadorDatos):
@@ -10,9 +10,12 @@ class AnalizardorEmocional(CargadorDatos):
 
     En esta clase se maneja el estado emocional del asistente, permitiendo analizar el sentimiento
     de los mensajes del usuario y ajustar las emociones en consecuencia. En general controla las
-    emociones en funcion del mensaje de entrada del usuario. Ejemplo de uso:
+    emociones en funcion del mensaje de entrada del usuario. Los modelos de pysentimiento no viven
+    en cada instancia, se piden al `RegistroAnalizadores` compartido la primera vez que se usan
+    (ver `inferencia.inferir_vibra`).
+    Ejemplo de uso:
 
-        analizador = AnalizardorEmocional(lang="es", task="sentiment", ruta="ruta/a/archivo.json")
+        analizador = AnalizardorEmocional(ruta="ruta/a/archivo.json")
         analizador.analizar_vibra_usuario("Me siento feliz hoy")
 
     Raises:
@@ -23,14 +26,15 @@ class AnalizardorEmocional(CargadorDatos):
     def __init__(
         self,
         ruta: str,
+        lang: str = "es",
     ) -> None:
         try:
             super().__init__(ruta=ruta)
 
-            self._analizador_sentimental = create_analyzer(task="sentiment", lang="es")
-            self._analizador_emocional = create_analyzer(task="emotion", lang="es")
-
-            self._emociones: Dict[str, List[str]] = self.cargar_datos()
+            self.lang = lang
+            self._emociones: Mapping[str, List[str]] = RegistroDatos.emociones(  # type: ignore
+                ruta
+            ).instrucciones
             self.emocion_actual_usuario: str = "joy"
             self.instrucciones_actuales: List[str] = []
 
@@ -56,34 +60,55 @@ class AnalizardorEmocional(CargadorDatos):
         if not mensaje.strip():
             return False
 
-        resultado = self._analizador_sentimental.predict(mensaje)
+        with etapa("analisis_vibra"):
+            return self.aplicar_vibra(inferir_vibra(mensaje, lang=self.lang))
+
+    async def analizar_vibra_usuario_async(self, mensaje: str) -> bool:
+        """Versión asíncrona de `analizar_vibra_usuario`.
 
-        if resultado.output != "NEU":  # type: ignore
-            self._analizar_emociones_usuario(mensaje)
-            return True
+        La inferencia corre en el ejecutor configurado con `configurar_ejecutor`, así el event
+        loop sigue atendiendo otras conversaciones mientras tanto. El estado se actualiza de
+        vuelta en el loop.
 
-        return False
+        Args:
+            mensaje (str): El mensaje del usuario a analizar.
 
-    def _analizar_emociones_usuario(self, mensaje: str):
-        """Analiza las emociones del usuario y ajusta la emoción actual.
+        Returns:
+            bool: True si se cambió la emoción actual, False en caso contrario.
+        """
+        if not mensaje.strip():
+            return False
 
-        En esta función se analiza el mensaje del usuario para detectar emociones específicas
-        (como alegría, tristeza, miedo, etc.) y se ajusta la emoción actual del asistente en
-        consecuencia. Se le añade una cadena de instrucciones basada en las emociones detectadas.
+        with etapa("analisis_vibra"):
+            return self.aplicar_vibra(await inferir_vibra_async(mensaje, lang=self.lang))
+
+    def aplicar_vibra(self, resultado: ResultadoVibra) -> bool:
+        """Ajusta el estado emocional a partir de un resultado de inferencia ya calculado.
 
         Args:
-            mensaje (str): El mensaje del usuario a analizar.
+            resultado (ResultadoVibra): El sentimiento y la emoción detectados.
+
         Returns:
-            str: La emoción detectada en el mensaje del usuario.
+            bool: True si el mensaje no fue neutral, False en caso contrario.
         """
-        resultado = self._analizador_emocional.predict(mensaje)
-        emocion_detectada = resultado.output  # type: ignore
+        if resultado["sentimiento"] == "NEU":
+            return False
+
+        self._aplicar_emocion_usuario(resultado["emocion"])
+        return True
 
+    def _aplicar_emocion_usuario(self, emocion_detectada: Optional[str]):
+        """Ajusta la emoción actual según la emoción detectada en el usuario.
+
+        Si la emoción detectada (alegría, tristeza, miedo, etc.) tiene instrucciones asociadas,
+        se vuelve la emoción actual del usuario y se toman sus instrucciones para el asistente.
+
+        Args:
+            emocion_detectada (Optional[str]): La emoción detectada en el mensaje del usuario.
+        """
         if emocion_detectada in self._emociones:
-            self.emocion_actual_usuario: str = resultado.output  # type: ignore
+            self.emocion_actual_usuario: str = emocion_detectada  # type: ignore
             self.instrucciones_actuales = self._emociones[self.emocion_actual_usuario]
-        else:
-            pass
 
     def obtener_estado_actual_prompt(self) -> str:
         """Obtiene una representación en cadena del estado emocional actual.
@@ -94,4 +119,4 @@ class AnalizardorEmocional(CargadorDatos):
         Returns:
             str: La cadena de texto que representa el estado emocional actual.
         """
-        return f"(Sigue las siguientes instrucciones: {self.instrucciones_actuales})"
+        return f"(Sigue las siguientes instrucciones: {list(self.instrucciones_actuales)})"
@@ -0,0 +1,210 @@
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Callable, NamedTuple, Optional, Sequence, Union
+
+from .registro import BackendAnalizadores
+
+# Los mismos modelos que usa pysentimiento para cada (tarea, idioma).
+MODELOS_ONNX = {
+    ("sentiment", "es"): "pysentimiento/robertuito-sentiment-analysis",
+    ("emotion", "es"): "pysentimiento/robertuito-emotion-analysis",
+    ("sentiment", "en"): "finiteautomata/bertweet-base-sentiment-analysis",
+    ("emotion", "en"): "finiteautomata/bertweet-base-emotion-analysis",
+}
+
+LONGITUD_MAXIMA = 128
+
+
+class SalidaAnalizador(NamedTuple):
+    """Resultado de un analizador, con la misma forma que el de pysentimiento."""
+
+    output: str
+    probas: dict[str, float]
+
+
+def _preprocesador(modelo: str, lang: str) -> Callable[[str], str]:
+    """Devuelve el mismo preprocesamiento de tweets que aplica pysentimiento a este modelo.
+
+    Sin él los modelos reciben texto que no vieron al entrenar (menciones, URLs, emojis sin
+    normalizar) y sus resultados dejan de coincidir con los de pysentimiento, así que no hay
+    alternativa silenciosa: falta pysentimiento, falla.
+    """
+    try:
+        from pysentimiento.preprocessing import get_preprocessing_args, preprocess_tweet
+    except ImportError as e:
+        raise ImportError(
+            "El backend ONNX usa el preprocesamiento de pysentimiento: pip install pysentimiento"
+        ) from e
+
+    argumentos = get_preprocessing_args(model_name=modelo, lang=lang)
+    return lambda texto: preprocess_tweet(texto, lang=lang, **argumentos)
+
+
+class AnalizadorONNX:
+    """Clasificador de texto que corre un modelo exportado a ONNX con ONNX Runtime.
+
+    Atributes:
+        modelo (str): Nombre del modelo original en el Hub de Hugging Face.
+        ruta (Path): Archivo `.onnx` que se está ejecutando.
+    """
+
+    def __init__(
+        self,
+        modelo: str,
+        ruta: Path,
+        lang: str,
+        hilos: Optional[int] = None,
+        proveedores: Sequence[str] = ("CPUExecutionProvider",),
+    ) -> None:
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        self.modelo = modelo
+        self.ruta = ruta
+
+        opciones = onnxruntime.SessionOptions()
+        if hilos is not None:
+            opciones.intra_op_num_threads = hilos
+        self._sesion = onnxruntime.InferenceSession(
+            str(ruta), opciones, providers=list(proveedores)
+        )
+        self._entradas = {entrada.name for entrada in self._sesion.get_inputs()}
+        self._tokenizador = AutoTokenizer.from_pretrained(ruta.parent)
+        self._preprocesar = _preprocesador(modelo, lang)
+
+        with (ruta.parent / "config.json").open("r", encoding="utf-8") as f:
+            id2label = json.load(f)["id2label"]
+        self._etiquetas = [id2label[str(i)] for i in range(len(id2label))]
+
+    def predict(
+        self, textos: Union[str, list[str]]
+    ) -> Union[SalidaAnalizador, list[SalidaAnalizador]]:
+        """Clasifica un texto o una lista de textos (en un solo lote).
+
+        Args:
+            textos (Union[str, list[str]]): El texto o los textos a clasificar.
+
+        Returns:
+            Un `SalidaAnalizador` por texto, o uno solo si se pasó un texto.
+        """
+        import numpy as np
+
+        individual = isinstance(textos, str)
+        lote = [textos] if individual else textos
+        if not lote:
+            return []
+
+        tokens = self._tokenizador(
+            [self._preprocesar(texto) for texto in lote],  # type: ignore
+            padding=True,
+            truncation=True,
+            max_length=LONGITUD_MAXIMA,
+            return_tensors="np",
+        )
+        logits = self._sesion.run(
+            None, {nombre: tokens[nombre] for nombre in self._entradas if nombre in tokens}
+        )[0]
+
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probabilidades = exp / exp.sum(axis=-1, keepdims=True)
+        salidas = [
+            SalidaAnalizador(
+                output=self._etiquetas[int(fila.argmax())],
+                probas={
+                    etiqueta: float(p) for etiqueta, p in zip(self._etiquetas, fila, strict=True)
+                },
+            )
+            for fila in probabilidades
+        ]
+        return salidas[0] if individual else salidas
+
+
+class BackendONNX(BackendAnalizadores):
+    """Backend que exporta los modelos de pysentimiento a ONNX y los corre con ONNX Runtime.
+
+    La primera vez que se pide un modelo se exporta con `optimum` (y, si `cuantizar` es True,
+    se cuantiza a int8 de forma dinámica) y se guarda en `directorio`; las siguientes veces solo
+    se carga el archivo. En CPU suele ser bastante más rápido que los pipelines de PyTorch y
+    ocupa menos memoria. Requiere `onnxruntime` y, para exportar, `optimum[onnxruntime]`.
+    Ejemplo de uso:
+
+        configurar_backend(BackendONNX(cuantizar=True, hilos=2))
+
+    Para comparar sus resultados y su latencia con pysentimiento, ver `benchmarks/onnx.py`.
+
+    Atributes:
+        directorio (Path): Carpeta donde se guardan los modelos exportados.
+        cuantizar (bool): Si se usa la versión cuantizada a int8.
+        hilos (Optional[int]): Hilos de ONNX Runtime por sesión; `None` deja el valor por defecto.
+        proveedores (Sequence[str]): Proveedores de ejecución de ONNX Runtime.
+    """
+
+    nombre = "onnx"
+
+    def __init__(
+        self,
+        directorio: Optional[Union[str, Path]] = None,
+        cuantizar: bool = True,
+        hilos: Optional[int] = None,
+        proveedores: Sequence[str] = ("CPUExecutionProvider",),
+    ) -> None:
+        self.directorio = (
+            Path(directorio)
+            if directorio is not None
+            else Path.home() / ".cache" / "lunita" / "onnx"
+        )
+        self.cuantizar = cuantizar
+        self.hilos = hilos
+        self.proveedores = proveedores
+        self._candado = Lock()
+
+    def crear(self, task: str, lang: str) -> AnalizadorONNX:
+        modelo = MODELOS_ONNX.get((task, lang))
+        if modelo is None:
+            raise ValueError(f"No hay modelo ONNX para la tarea '{task}' en '{lang}'.")
+
+        return AnalizadorONNX(
+            modelo,
+            self.exportar(modelo),
+            lang=lang,
+            hilos=self.hilos,
+            proveedores=self.proveedores,
+        )
+
+    def exportar(self, modelo: str) -> Path:
+        """Exporta (y cuantiza) un modelo si aún no está en disco.
+
+        Args:
+            modelo (str): Nombre del modelo en el Hub de Hugging Face.
+
+        Returns:
+            Path: El archivo `.onnx` listo para cargar.
+        """
+        carpeta = self.directorio / modelo.replace("/", "__")
+        original = carpeta / "model.onnx"
+        cuantizado = carpeta / "model_quantized.onnx"
+
+        with self._candado:
+            if not original.exists():
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                from transformers import AutoTokenizer
+
+                ORTModelForSequenceClassification.from_pretrained(
+                    modelo, export=True
+                ).save_pretrained(carpeta)
+                AutoTokenizer.from_pretrained(modelo).save_pretrained(carpeta)
+
+            if self.cuantizar and not cuantizado.exists():
+                from optimum.onnxruntime import ORTQuantizer
+                from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+                ORTQuantizer.from_pretrained(carpeta, file_name=original.name).quantize(
+                    save_dir=carpeta,
+                    quantization_config=AutoQuantizationConfig.avx2(
+                        is_static=False, per_channel=False
+                    ),
+                )
+
+        return cuantizado if self.cuantizar else original
+
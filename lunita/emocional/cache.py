@@ -0,0 +1,142 @@
+import re
+import unicodedata
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Optional, TypedDict
+
+if TYPE_CHECKING:
+    from .inferencia import ResultadoVibra
+
+_REPETIDAS = re.compile(r"(.)\1{2,}")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar_mensaje(mensaje: str) -> str:
+    """Normaliza un mensaje para compararlo con otros casi idénticos.
+
+    Pasa a minúsculas, quita acentos, colapsa los espacios y las letras repetidas tres o más
+    veces ("Holaaa   Lunita" -> "hola lunita").
+
+    Args:
+        mensaje (str): El mensaje original.
+
+    Returns:
+        str: El mensaje normalizado.
+    """
+    texto = unicodedata.normalize("NFKD", mensaje.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = _REPETIDAS.sub(r"\1", texto)
+    return _ESPACIOS.sub(" ", texto).strip()
+
+
+class MetricasCache(TypedDict):
+    capacidad: int
+    ttl: Optional[float]
+    tamano: int
+    aciertos: int
+    fallos: int
+    desalojos: int
+    expirados: int
+    tasa_aciertos: float
+
+
+class CacheVibras:
+    """Cache LRU con expiración para los resultados de los analizadores.
+
+    Guarda el sentimiento y la emoción de cada mensaje bajo su forma normalizada, así los
+    mensajes que se repiten entre sesiones ("hola lunita", "que dicen las cartas?") no vuelven a
+    pasar por los modelos. Al llenarse desaloja el menos usado recientemente. Ejemplo de uso:
+
+        configurar_cache(CacheVibras(capacidad=50_000, ttl=3600))
+
+    Atributes:
+        capacidad (int): Máximo de entradas.
+        ttl (Optional[float]): Segundos de vida de cada entrada, o `None` para no expirar.
+    """
+
+    def __init__(self, capacidad: int = 10_000, ttl: Optional[float] = 3600) -> None:
+        if capacidad < 1:
+            raise ValueError("La capacidad del cache debe ser al menos 1.")
+
+        self.capacidad = capacidad
+        self.ttl = ttl
+
+        self._entradas: OrderedDict[tuple[str, str], tuple[float, "ResultadoVibra"]] = (
+            OrderedDict()
+        )
+        self._candado = Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._desalojos = 0
+        self._expirados = 0
+
+    def obtener(self, mensaje: str, lang: str = "es") -> Optional["ResultadoVibra"]:
+        """Busca el resultado de un mensaje.
+
+        Args:
+            mensaje (str): El mensaje del usuario.
+            lang (str): Idioma de los analizadores.
+
+        Returns:
+            Optional[ResultadoVibra]: Una copia del resultado guardado, o `None`.
+        """
+        clave = (lang, normalizar_mensaje(mensaje))
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self._fallos += 1
+                return None
+
+            guardado, resultado = entrada
+            if self.ttl is not None and monotonic() - guardado > self.ttl:
+                del self._entradas[clave]
+                self._expirados += 1
+                self._fallos += 1
+                return None
+
+            self._entradas.move_to_end(clave)
+            self._aciertos += 1
+            return {**resultado}  # type: ignore
+
+    def guardar(
+        self, mensaje: str, resultado: "ResultadoVibra", lang: str = "es"
+    ) -> None:
+        """Guarda el resultado de un mensaje, desalojando el más viejo si no cabe.
+
+        Args:
+            mensaje (str): El mensaje del usuario.
+            resultado (ResultadoVibra): El resultado de los modelos.
+            lang (str): Idioma de los analizadores.
+        """
+        clave = (lang, normalizar_mensaje(mensaje))
+        with self._candado:
+            self._entradas[clave] = (monotonic(), {**resultado})  # type: ignore
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self._desalojos += 1
+
+    def limpiar(self) -> None:
+        """Vacía el cache sin reiniciar los contadores."""
+        with self._candado:
+            self._entradas.clear()
+
+    def metricas(self) -> MetricasCache:
+        """Devuelve el tamaño del cache y sus contadores de aciertos, fallos y desalojos.
+
+        Returns:
+            MetricasCache: Los contadores para dimensionar el cache.
+        """
+        with self._candado:
+            consultas = self._aciertos + self._fallos
+            return {
+                "capacidad": self.capacidad,
+                "ttl": self.ttl,
+                "tamano": len(self._entradas),
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "desalojos": self._desalojos,
+                "expirados": self._expirados,
+                "tasa_aciertos": self._aciertos / consultas if consultas else 0.0,
+            }
@@ -1,7 +1,7 @@
 from random import choice
-from typing import Dict, List
+from typing import List, Mapping
 
-from ..utilidades import CargadorDatos
+from ..utilidades import CargadorDatos, RegistroDatos
 
 
 class AdministradorEmocional(CargadorDatos):
@@ -18,8 +18,10 @@ class AdministradorEmocional(CargadorDatos):
     ) -> None:
         super().__init__(ruta=ruta)
 
-        self._emociones: Dict[str, List[str]] = self.cargar_datos()
-        self.emocion_actual: str = choice(list(self._emociones.keys()))
+        tabla = RegistroDatos.emociones(ruta)
+        self._claves = tabla.claves
+        self._emociones: Mapping[str, List[str]] = tabla.instrucciones  # type: ignore
+        self.emocion_actual: str = choice(self._claves)
         self.instrucciones_actuales: List[str] = self._emociones[self.emocion_actual]
 
     def obtener_emocion_actual_prompt(self) -> str:
@@ -31,7 +33,7 @@ class AdministradorEmocional(CargadorDatos):
         Returns:
             str: La cadena de texto que representa el estado emocional actual.
         """
-        return f"(Emocion actual: {self.emocion_actual}, instrucciones: {self._emociones[self.emocion_actual]})"
+        return f"(Emocion actual: {self.emocion_actual}, instrucciones: {list(self._emociones[self.emocion_actual])})"
 
     def obtener_nueva_emocion_al_azar(self) -> str:
         """Selecciona y devuelve una nueva emoción aleatoria.
@@ -43,11 +45,11 @@ class AdministradorEmocional(CargadorDatos):
             str: La cadena de texto de la nueva emoción seleccionada.
         """
 
-        nueva_emocion = choice(list(self._emociones.keys()))
+        nueva_emocion = choice(self._claves)
         intentos = 0
 
         while nueva_emocion == self.emocion_actual and intentos < 10:
-            nueva_emocion = choice(list(self._emociones.keys()))
+            nueva_emocion = choice(self._claves)
             intentos += 1
 
         self.emocion_actual = nueva_emocion
@@ -0,0 +1,244 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextvars import copy_context
+from typing import TYPE_CHECKING, Optional, TypedDict
+
+from ..instrumentacion import etapa, instrumentacion_activa
+from .cache import CacheVibras
+from .rapido import ClasificadorRapido
+from .registro import RegistroAnalizadores
+
+if TYPE_CHECKING:
+    from .lotes import PlanificadorLotes
+
+
+class ResultadoVibra(TypedDict):
+    sentimiento: str
+    emocion: Optional[str]
+
+
+_ejecutor: Optional[Executor] = None
+_planificador: Optional["PlanificadorLotes"] = None
+_clasificador: Optional[ClasificadorRapido] = ClasificadorRapido()
+_cache: Optional[CacheVibras] = CacheVibras()
+
+
+def inferir_vibra(mensaje: str, lang: str = "es") -> ResultadoVibra:
+    """Obtiene la vibra de un mensaje: del cache, por la ruta rápida o con los modelos.
+
+    Args:
+        mensaje (str): El mensaje del usuario.
+        lang (str): Idioma de los analizadores.
+
+    Returns:
+        ResultadoVibra: El sentimiento detectado y, si no es neutral, la emoción.
+    """
+    resultado, rapido = _resolver_sin_modelos(mensaje, lang)
+    if resultado is not None:
+        return resultado
+
+    resultado = _inferir_con_modelos(mensaje, lang)
+    _registrar_resultado_modelos(mensaje, lang, resultado, rapido)
+    return resultado
+
+
+def _resolver_sin_modelos(
+    mensaje: str, lang: str
+) -> tuple[Optional[ResultadoVibra], Optional[ResultadoVibra]]:
+    """Intenta resolver el mensaje con el cache y luego con la ruta rápida.
+
+    Returns:
+        tuple: El resultado final si no hace falta el modelo, y el resultado de la ruta rápida
+        pendiente de verificar contra el modelo (si se muestreó).
+    """
+    if _cache is not None:
+        guardado = _cache.obtener(mensaje, lang=lang)
+        if guardado is not None:
+            return guardado, None
+
+    rapido = _clasificador.clasificar(mensaje) if _clasificador is not None else None
+    if rapido is not None and not _clasificador.debe_verificar():  # type: ignore
+        return rapido, None
+    return None, rapido
+
+
+def _registrar_resultado_modelos(
+    mensaje: str,
+    lang: str,
+    resultado: ResultadoVibra,
+    rapido: Optional[ResultadoVibra],
+) -> None:
+    """Guarda en cache lo que dijeron los modelos y lo compara con la ruta rápida."""
+    if _cache is not None:
+        _cache.guardar(mensaje, resultado, lang=lang)
+    if rapido is not None and _clasificador is not None:
+        _clasificador.registrar_comparacion(rapido, resultado)
+
+
+def _inferir_con_modelos(mensaje: str, lang: str = "es") -> ResultadoVibra:
+    """Corre los modelos de sentimiento y emoción sobre un mensaje.
+
+    Es una función pura (no toca el estado de ninguna sesión), así que se puede mandar tal cual a
+    un `ThreadPoolExecutor` o a un `ProcessPoolExecutor`. En un proceso hijo los analizadores se
+    cargan en su propio `RegistroAnalizadores` la primera vez.
+
+    Args:
+        mensaje (str): El mensaje del usuario.
+        lang (str): Idioma de los analizadores.
+
+    Returns:
+        ResultadoVibra: El sentimiento detectado y, si no es neutral, la emoción.
+    """
+    with etapa("sentimiento"):
+        sentimiento = RegistroAnalizadores.obtener(task="sentiment", lang=lang).predict(
+            mensaje
+        )
+    emocion = None
+
+    if sentimiento.output != "NEU":  # type: ignore
+        with etapa("emocion"):
+            emocion = RegistroAnalizadores.obtener(task="emotion", lang=lang).predict(
+                mensaje
+            )
+
+    return {
+        "sentimiento": sentimiento.output,  # type: ignore
+        "emocion": emocion.output if emocion is not None else None,  # type: ignore
+    }
+
+
+def inferir_vibra_lote(mensajes: list[str], lang: str = "es") -> list[ResultadoVibra]:
+    """Corre los modelos sobre varios mensajes con una sola llamada a `predict` por modelo.
+
+    El modelo de emoción solo recibe los mensajes que no salieron neutrales.
+
+    Args:
+        mensajes (list[str]): Los mensajes a analizar.
+        lang (str): Idioma de los analizadores.
+
+    Returns:
+        list[ResultadoVibra]: Un resultado por mensaje, en el mismo orden.
+    """
+    if not mensajes:
+        return []
+
+    sentimientos = RegistroAnalizadores.obtener(task="sentiment", lang=lang).predict(
+        mensajes
+    )
+    resultados: list[ResultadoVibra] = [
+        {"sentimiento": s.output, "emocion": None}  # type: ignore
+        for s in sentimientos
+    ]
+
+    indices = [i for i, r in enumerate(resultados) if r["sentimiento"] != "NEU"]
+    if indices:
+        emociones = RegistroAnalizadores.obtener(task="emotion", lang=lang).predict(
+            [mensajes[i] for i in indices]
+        )
+        for i, emocion in zip(indices, emociones):
+            resultados[i]["emocion"] = emocion.output  # type: ignore
+
+    return resultados
+
+
+def configurar_ejecutor(ejecutor: Optional[Executor]) -> None:
+    """Define el ejecutor donde corre la inferencia asíncrona.
+
+    Con `None` se usa el ejecutor por defecto del event loop (un pool de hilos). Un
+    `ProcessPoolExecutor` aísla la inferencia del GIL a costa de cargar los modelos en cada
+    proceso hijo.
+
+    Args:
+        ejecutor (Optional[Executor]): El ejecutor a usar, o `None` para el predeterminado.
+    """
+    global _ejecutor
+    _ejecutor = ejecutor
+
+
+def obtener_ejecutor() -> Optional[Executor]:
+    """Devuelve el ejecutor configurado para la inferencia asíncrona."""
+    return _ejecutor
+
+
+def configurar_ruta_rapida(clasificador: Optional[ClasificadorRapido]) -> None:
+    """Reemplaza (o con `None` desactiva) el pre-clasificador léxico de mensajes triviales.
+
+    Args:
+        clasificador (Optional[ClasificadorRapido]): El clasificador a usar.
+    """
+    global _clasificador
+    _clasificador = clasificador
+
+
+def obtener_ruta_rapida() -> Optional[ClasificadorRapido]:
+    """Devuelve el pre-clasificador léxico activo, si lo hay."""
+    return _clasificador
+
+
+def configurar_cache(cache: Optional[CacheVibras]) -> None:
+    """Reemplaza (o con `None` desactiva) el cache de resultados de los analizadores.
+
+    Args:
+        cache (Optional[CacheVibras]): El cache a usar.
+    """
+    global _cache
+    _cache = cache
+
+
+def obtener_cache() -> Optional[CacheVibras]:
+    """Devuelve el cache de resultados activo, si lo hay."""
+    return _cache
+
+
+def configurar_lotes(planificador: Optional["PlanificadorLotes"]) -> None:
+    """Activa (o con `None` desactiva) el micro-batching para la inferencia asíncrona.
+
+    Mientras haya un planificador configurado, `inferir_vibra_async` encola los mensajes en él
+    en lugar de mandarlos uno por uno al ejecutor.
+
+    Args:
+        planificador (Optional[PlanificadorLotes]): El planificador compartido.
+    """
+    global _planificador
+    _planificador = planificador
+
+
+def obtener_planificador() -> Optional["PlanificadorLotes"]:
+    """Devuelve el planificador de lotes activo, si lo hay."""
+    return _planificador
+
+
+async def inferir_vibra_async(mensaje: str, lang: str = "es") -> ResultadoVibra:
+    """Versión asíncrona de `inferir_vibra` que no bloquea el event loop.
+
+    Los mensajes ya vistos o triviales se resuelven en el mismo loop con el cache o la ruta
+    rápida. El resto corre en el
+    ejecutor o, si hay un `PlanificadorLotes` activo para el idioma, se agrupa con los de otras
+    sesiones en un solo `predict`.
+
+    Args:
+        mensaje (str): El mensaje del usuario.
+        lang (str): Idioma de los analizadores.
+
+    Returns:
+        ResultadoVibra: El sentimiento detectado y, si no es neutral, la emoción.
+    """
+    resultado, rapido = _resolver_sin_modelos(mensaje, lang)
+    if resultado is not None:
+        return resultado
+
+    with etapa("inferencia_modelos"):
+        if _planificador is not None and _planificador.lang == lang:
+            resultado = await _planificador.inferir(mensaje)
+        elif instrumentacion_activa() and not isinstance(_ejecutor, ProcessPoolExecutor):
+            # Se copia el contexto para que las etapas del hilo cuenten en el turno actual.
+            resultado = await asyncio.get_running_loop().run_in_executor(
+                _ejecutor, copy_context().run, _inferir_con_modelos, mensaje, lang
+            )
+        else:
+            resultado = await asyncio.get_running_loop().run_in_executor(
+                _ejecutor, _inferir_con_modelos, mensaje, lang
+            )
+
+    _registrar_resultado_modelos(mensaje, lang, resultado, rapido)
+    return resultado
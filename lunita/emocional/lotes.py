@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from typing import Optional, TypedDict
+
+from .inferencia import ResultadoVibra, inferir_vibra_lote, obtener_ejecutor
+
+logger = logging.getLogger(__name__)
+
+
+class MetricasLotes(TypedDict):
+    tamano_lote: int
+    espera_maxima_ms: float
+    profundidad_maxima: int
+    profundidad_cola: int
+    lotes: int
+    mensajes: int
+    tamano_promedio: float
+    tamano_maximo_observado: int
+    espera_promedio_ms: float
+
+
+class PlanificadorLotes:
+    """Agrupa los mensajes de varias sesiones en un solo `predict` por modelo.
+
+    Cada sesión encola su mensaje y espera un futuro. Un trabajador junta lo que llegue durante
+    `espera_maxima` segundos (o hasta `tamano_lote` mensajes), corre un solo `predict` para el
+    modelo de sentimiento y otro para el de emoción en el ejecutor configurado, y reparte los
+    resultados. Ejemplo de uso:
+
+        configurar_lotes(PlanificadorLotes(tamano_lote=32, espera_maxima=0.005))
+
+    Atributes:
+        tamano_lote (int): Máximo de mensajes por lote.
+        espera_maxima (float): Segundos máximos que espera un lote a llenarse.
+        profundidad_maxima (int): Máximo de mensajes en cola; al llenarse, `inferir` espera.
+        lang (str): Idioma de los analizadores.
+    """
+
+    def __init__(
+        self,
+        tamano_lote: int = 16,
+        espera_maxima: float = 0.005,
+        profundidad_maxima: int = 1024,
+        lang: str = "es",
+    ) -> None:
+        if tamano_lote < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1.")
+        if espera_maxima < 0:
+            raise ValueError("La espera máxima no puede ser negativa.")
+
+        self.tamano_lote = tamano_lote
+        self.espera_maxima = espera_maxima
+        self.profundidad_maxima = profundidad_maxima
+        self.lang = lang
+
+        self._cola: Optional[asyncio.Queue] = None
+        self._trabajador: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._lotes = 0
+        self._mensajes = 0
+        self._tamano_maximo_observado = 0
+        self._espera_total = 0.0
+
+    def _asegurar_trabajador(self) -> asyncio.Queue:
+        """Arranca el trabajador en el loop actual si aún no corre ahí."""
+        loop = asyncio.get_running_loop()
+        vivo = self._trabajador is not None and not self._trabajador.done()
+        if self._cola is None or self._loop is not loop or not vivo:
+            self._loop = loop
+            self._cola = asyncio.Queue(maxsize=self.profundidad_maxima)
+            self._trabajador = loop.create_task(self._procesar())
+        return self._cola
+
+    async def inferir(self, mensaje: str) -> ResultadoVibra:
+        """Encola un mensaje y espera su resultado.
+
+        Args:
+            mensaje (str): El mensaje del usuario.
+
+        Returns:
+            ResultadoVibra: El sentimiento detectado y, si no es neutral, la emoción.
+        """
+        cola = self._asegurar_trabajador()
+        futuro: asyncio.Future = asyncio.get_running_loop().create_future()
+        await cola.put((mensaje, futuro, time.perf_counter()))
+        return await futuro
+
+    async def _juntar_lote(self, cola: asyncio.Queue) -> list:
+        """Espera el primer mensaje y junta los que lleguen dentro de la ventana."""
+        lote = [await cola.get()]
+        limite = time.perf_counter() + self.espera_maxima
+
+        while len(lote) < self.tamano_lote:
+            restante = limite - time.perf_counter()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(cola.get(), restante))
+            except asyncio.TimeoutError:
+                break
+
+        # Lo que ya esté en cola entra aunque la ventana haya cerrado.
+        while len(lote) < self.tamano_lote and not cola.empty():
+            lote.append(cola.get_nowait())
+        return lote
+
+    async def _procesar(self) -> None:
+        """Bucle del trabajador: junta lotes, corre la inferencia y resuelve los futuros."""
+        cola = self._cola
+        loop = asyncio.get_running_loop()
+
+        while True:
+            lote = await self._juntar_lote(cola)  # type: ignore
+            mensajes = [mensaje for mensaje, _, _ in lote]
+            inicio = time.perf_counter()
+
+            try:
+                resultados = await loop.run_in_executor(
+                    obtener_ejecutor(), inferir_vibra_lote, mensajes, self.lang
+                )
+            except asyncio.CancelledError:
+                for _, futuro, _ in lote:
+                    futuro.cancel()
+                raise
+            except Exception as e:
+                # El error le llega a cada sesión del lote; el trabajador sigue con el próximo.
+                logger.warning(
+                    "Falló la inferencia de un lote de %d mensajes.", len(lote), exc_info=True
+                )
+                for _, futuro, _ in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+
+            self._lotes += 1
+            self._mensajes += len(lote)
+            self._tamano_maximo_observado = max(self._tamano_maximo_observado, len(lote))
+            self._espera_total += sum(inicio - encolado for _, _, encolado in lote)
+
+            for (_, futuro, _), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    def metricas(self) -> MetricasLotes:
+        """Devuelve la configuración y los contadores del planificador.
+
+        Returns:
+            MetricasLotes: Tamaño medio de lote, profundidad actual de la cola y espera media
+            de cada mensaje antes de entrar a un lote.
+        """
+        return {
+            "tamano_lote": self.tamano_lote,
+            "espera_maxima_ms": self.espera_maxima * 1000,
+            "profundidad_maxima": self.profundidad_maxima,
+            "profundidad_cola": self._cola.qsize() if self._cola is not None else 0,
+            "lotes": self._lotes,
+            "mensajes": self._mensajes,
+            "tamano_promedio": self._mensajes / self._lotes if self._lotes else 0.0,
+            "tamano_maximo_observado": self._tamano_maximo_observado,
+            "espera_promedio_ms": (
+                self._espera_total / self._mensajes * 1000 if self._mensajes else 0.0
+            ),
+        }
+
+    async def detener(self) -> None:
+        """Detiene el trabajador. Los mensajes pendientes se cancelan."""
+        if self._trabajador is not None:
+            self._trabajador.cancel()
+            try:
+                await self._trabajador
+            except asyncio.CancelledError:
+                pass
+            self._trabajador = None
+
+        if self._cola is not None:
+            while not self._cola.empty():
+                _, futuro, _ = self._cola.get_nowait()
+                futuro.cancel()
+            self._cola = None
@@ -11,6 +11,12 @@ class RespuestaMotorEmocional(TypedDict):
     instrucciones_asistente: List[str]
 
 
+class EstadoMotorEmocional(TypedDict):
+    emocion_asistente: str
+    emocion_usuario: str
+    instrucciones_asistente: List[str]
+
+
 class MotorEmocional:
     """Motor emocional que gestiona las emociones del asistente IA y del usuario.
 
@@ -20,13 +26,18 @@ class MotorEmocional:
         motor = MotorEmocional()
         respuesta = motor.procesar_mensaje_usuario("Estoy muy feliz hoy")
 
+    Con `analizar=False` el motor funciona "sin analizador": no mira la vibra del usuario (y
+    por lo tanto nunca carga pysentimiento) y el asistente solo cambia de emoción al azar.
+
     Atributes:
         emocion_actual_asistente (str): La emoción actual del asistente IA.
         instrucciones_actuales (List[str]): Las instrucciones actuales para el asistente IA.
+        analizar (bool): Si se analiza la vibra de los mensajes del usuario.
 
     """
 
-    def __init__(self) -> None:
+    def __init__(self, analizar: bool = True) -> None:
+        self.analizar = analizar
         self._analizador_emocional = AnalizardorEmocional(
             ruta="data/emociones_entrada_lunita.json"
         )
@@ -53,8 +64,39 @@ class MotorEmocional:
             RespuestaMotorEmocional: Un diccionario que contiene las emociones actuales del
             asistente y del usuario, así como las instrucciones para el asistente.
         """
-        emocion_cambiada = self._analizador_emocional.analizar_vibra_usuario(mensaje)
+        emocion_cambiada = self.analizar and self._analizador_emocional.analizar_vibra_usuario(
+            mensaje
+        )
+        return self._actualizar_estado(emocion_cambiada)
+
+    async def procesar_mensaje_usuario_async(
+        self, mensaje: str
+    ) -> RespuestaMotorEmocional:
+        """Versión asíncrona de `procesar_mensaje_usuario`.
+
+        La inferencia de los modelos corre fuera del event loop (ver
+        `inferencia.configurar_ejecutor`), así una inferencia lenta no frena al resto de
+        conversaciones del proceso.
+
+        Args:
+            mensaje (str): El mensaje del usuario a procesar.
+        Returns:
+            RespuestaMotorEmocional: Un diccionario que contiene las emociones actuales del
+            asistente y del usuario, así como las instrucciones para el asistente.
+        """
+        emocion_cambiada = self.analizar and (
+            await self._analizador_emocional.analizar_vibra_usuario_async(mensaje)
+        )
+        return self._actualizar_estado(emocion_cambiada)
 
+    def _actualizar_estado(self, emocion_cambiada: bool) -> RespuestaMotorEmocional:
+        """Ajusta la emoción del asistente tras analizar la vibra del usuario.
+
+        Args:
+            emocion_cambiada (bool): Si el análisis cambió la emoción del usuario.
+        Returns:
+            RespuestaMotorEmocional: El estado resultante para el asistente y el usuario.
+        """
         if not emocion_cambiada and random() < 0.3:
             self.emocion_actual_asistente = (
                 self._administrador_emocional.obtener_nueva_emocion_al_azar()
@@ -78,6 +120,30 @@ class MotorEmocional:
             "instrucciones_asistente": self.instrucciones_actuales,
         }
 
+    def exportar_estado(self) -> EstadoMotorEmocional:
+        """Devuelve el estado emocional actual, listo para serializar.
+
+        Returns:
+            EstadoMotorEmocional: Las emociones del asistente y del usuario y las instrucciones
+            vigentes.
+        """
+        return {
+            "emocion_asistente": self.emocion_actual_asistente,
+            "emocion_usuario": self._analizador_emocional.emocion_actual_usuario,
+            "instrucciones_asistente": list(self.instrucciones_actuales),
+        }
+
+    def restaurar_estado(self, estado: EstadoMotorEmocional) -> None:
+        """Restaura un estado emocional exportado con `exportar_estado`.
+
+        Args:
+            estado (EstadoMotorEmocional): El estado a restaurar.
+        """
+        self.emocion_actual_asistente = estado["emocion_asistente"]
+        self._administrador_emocional.emocion_actual = estado["emocion_asistente"]
+        self._analizador_emocional.emocion_actual_usuario = estado["emocion_usuario"]
+        self.instrucciones_actuales = list(estado["instrucciones_asistente"])
+
     def cambiar_emocion_manual(self) -> str:
         """Fuerza un cambio de emoción al azar para el asistente.
 
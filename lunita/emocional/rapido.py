@@ -0,0 +1,195 @@
+import re
+from random import random
+from threading import Lock
+from typing import TYPE_CHECKING, Optional, TypedDict
+
+from .cache import normalizar_mensaje
+
+if TYPE_CHECKING:
+    from .inferencia import ResultadoVibra
+
+NEUTRAL = ("NEU", None)
+ALEGRIA = ("POS", "joy")
+TRISTEZA = ("NEG", "sadness")
+ENOJO = ("NEG", "anger")
+MIEDO = ("NEG", "fear")
+ASCO = ("NEG", "disgust")
+
+# Palabras ya normalizadas (sin acentos, minúsculas, sin letras repetidas).
+LEXICO: dict[str, tuple[str, Optional[str]]] = {
+    **dict.fromkeys(
+        [
+            "hola", "holi", "holis", "buenas", "buenos", "buen", "dia", "dias",
+            "tardes", "noches", "hey", "ey", "ok", "oki", "okay", "vale", "va",
+            "si", "bueno", "pues", "lunita", "estrella", "m", "mm", "ah",
+            "oh", "aja", "ya", "y", "tu", "te", "que", "onda", "tal", "como", "estas",
+        ],
+        NEUTRAL,
+    ),
+    **dict.fromkeys(
+        [
+            "gracias", "genial", "bien", "excelente", "increible", "lindo",
+            "linda", "hermoso", "hermosa", "quiero", "amo", "jaja", "jeje", "jiji",
+            "xd", "lol", "yay", "super", "wi",
+        ],
+        ALEGRIA,
+    ),
+    **dict.fromkeys(
+        ["triste", "snif", "sniff", "llorando", "deprimida", "deprimido"], TRISTEZA
+    ),
+    **dict.fromkeys(["odio", "enojada", "enojado", "harta", "harto"], ENOJO),
+    **dict.fromkeys(["miedo", "asustada", "asustado"], MIEDO),
+    **dict.fromkeys(["asco", "guacala", "iugh"], ASCO),
+}
+
+# Una negación puede invertir la polaridad ("no gracias", "no quiero"); esos mensajes van al modelo.
+NEGADORES = frozenset(["no", "nunca", "ni", "tampoco", "nada", "jamas"])
+
+EMOJIS: dict[str, tuple[str, Optional[str]]] = {
+    **dict.fromkeys("😂🤣😄😊😁😀😃😆😍🥰😘❤♥💖💕✨👍🙂😌🥳🎉🌙🔮⭐🌟", ALEGRIA),
+    **dict.fromkeys("😢😭😞😔💔🥺😿", TRISTEZA),
+    **dict.fromkeys("😡🤬😠👿", ENOJO),
+    **dict.fromkeys("😱😨😰😖", MIEDO),
+    **dict.fromkeys("🤢🤮", ASCO),
+    **dict.fromkeys("👋🙏👀🤔", NEUTRAL),
+}
+
+# Risas: la misma consonante (j o h) con vocal, al menos dos veces ("jaja", "jejeje", "haha").
+_RISA = re.compile(r"^([jh])[aeiou](?:\1[aeiou])+\1?$")
+_PALABRAS = re.compile(r"[a-zñ0-9]+")
+_IGNORAR = re.compile(r"[\s.,;:!¡?¿()\-_*~\"'\ufe0f\u200d]+")
+
+
+class ReporteRutaRapida(TypedDict):
+    consultas: int
+    disparos: int
+    tasa_disparo: float
+    comparaciones: int
+    coincidencias: int
+    tasa_coincidencia: float
+
+
+class ClasificadorRapido:
+    """Pre-clasificador léxico que resuelve los mensajes triviales sin pasar por el transformer.
+
+    Saludos, risas, "ok gracias" o mensajes de puros emojis se clasifican con una tabla de
+    palabras y emojis precompilada. Si el mensaje es corto y todas sus piezas están en la tabla
+    sin contradecirse, se devuelve el resultado con una confianza; si no, se deja pasar al
+    modelo. Los mensajes con negaciones ("no", "nunca", "ni", ...) siempre van al modelo. Una
+    fracción `muestreo` de los disparos también se manda al modelo para medir qué tanto
+    coinciden (ver `reporte`); con 0 el reporte de coincidencias queda vacío. Ejemplo de uso:
+
+        configurar_ruta_rapida(ClasificadorRapido(umbral=0.85, muestreo=0.05))
+
+    Atributes:
+        umbral (float): Confianza mínima para no consultar al modelo.
+        max_palabras (int): Mensajes más largos siempre van al modelo.
+        muestreo (float): Fracción de disparos que también se verifican con el modelo.
+    """
+
+    def __init__(
+        self, umbral: float = 0.85, max_palabras: int = 4, muestreo: float = 0.02
+    ) -> None:
+        self.umbral = umbral
+        self.max_palabras = max_palabras
+        self.muestreo = muestreo
+
+        self._candado = Lock()
+        self._consultas = 0
+        self._disparos = 0
+        self._comparaciones = 0
+        self._coincidencias = 0
+
+    def evaluar(self, mensaje: str) -> tuple[Optional["ResultadoVibra"], float]:
+        """Clasifica el mensaje con la tabla léxica.
+
+        Args:
+            mensaje (str): El mensaje del usuario.
+
+        Returns:
+            tuple[Optional["ResultadoVibra"], float]: El resultado y su confianza, o `(None, 0.0)`
+            si el mensaje tiene piezas desconocidas o señales contradictorias.
+        """
+        texto = normalizar_mensaje(mensaje)
+        palabras = _PALABRAS.findall(texto)
+        if len(palabras) > self.max_palabras or not NEGADORES.isdisjoint(palabras):
+            return None, 0.0
+
+        resto = _IGNORAR.sub("", _PALABRAS.sub("", texto))
+        etiquetas = []
+        for palabra in palabras:
+            etiqueta = LEXICO.get(palabra)
+            if etiqueta is None and _RISA.match(palabra):
+                etiqueta = ALEGRIA
+            if etiqueta is None:
+                return None, 0.0
+            etiquetas.append(etiqueta)
+        for caracter in resto:
+            etiqueta = EMOJIS.get(caracter)
+            if etiqueta is None:
+                return None, 0.0
+            etiquetas.append(etiqueta)
+
+        if not etiquetas:
+            return None, 0.0
+
+        polares = {etiqueta for etiqueta in etiquetas if etiqueta != NEUTRAL}
+        if len(polares) > 1:
+            return None, 0.0
+
+        sentimiento, emocion = polares.pop() if polares else NEUTRAL
+        # Cada pieza extra es una oportunidad más de que el modelo vea un matiz distinto.
+        confianza = 0.97 - 0.03 * (len(etiquetas) - 1)
+        return {"sentimiento": sentimiento, "emocion": emocion}, confianza
+
+    def clasificar(self, mensaje: str) -> Optional["ResultadoVibra"]:
+        """Devuelve el resultado léxico si supera el umbral de confianza, y cuenta el intento.
+
+        Args:
+            mensaje (str): El mensaje del usuario.
+
+        Returns:
+            Optional[ResultadoVibra]: El resultado, o `None` si hay que consultar al modelo.
+        """
+        resultado, confianza = self.evaluar(mensaje)
+        disparo = resultado is not None and confianza >= self.umbral
+        with self._candado:
+            self._consultas += 1
+            if disparo:
+                self._disparos += 1
+        return resultado if disparo else None
+
+    def debe_verificar(self) -> bool:
+        """Indica si este disparo debe compararse también contra el modelo."""
+        return self.muestreo > 0 and random() < self.muestreo
+
+    def registrar_comparacion(
+        self, rapido: "ResultadoVibra", modelo: "ResultadoVibra"
+    ) -> None:
+        """Registra si el resultado léxico coincidió con el del modelo."""
+        with self._candado:
+            self._comparaciones += 1
+            if rapido == modelo:
+                self._coincidencias += 1
+
+    def reporte(self) -> ReporteRutaRapida:
+        """Devuelve qué tan seguido dispara la ruta rápida y qué tanto coincide con el modelo.
+
+        Returns:
+            ReporteRutaRapida: Contadores y tasas de disparo y coincidencia.
+        """
+        with self._candado:
+            return {
+                "consultas": self._consultas,
+                "disparos": self._disparos,
+                "tasa_disparo": (
+                    self._disparos / self._consultas if self._consultas else 0.0
+                ),
+                "comparaciones": self._comparaciones,
+                "coincidencias": self._coincidencias,
+                "tasa_coincidencia": (
+                    self._coincidencias / self._comparaciones
+                    if self._comparaciones
+                    else 0.0
+                ),
+            }
@@ -0,0 +1,209 @@
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, Iterable, Optional
+
+from ..utilidades import precargar_datos
+
+TAREAS_PREDETERMINADAS = ("sentiment", "emotion")
+
+
+class BackendAnalizadores(ABC):
+    """Interfaz para crear los analizadores que usa `RegistroAnalizadores`.
+
+    Un analizador es cualquier objeto con `predict(texto)` y `predict(lista_de_textos)` que
+    devuelva, por cada texto, un resultado con `.output` (la etiqueta) y `.probas` (las
+    probabilidades por etiqueta), igual que los de pysentimiento.
+
+    Atributes:
+        nombre (str): Nombre corto del backend, para reportes.
+    """
+
+    nombre: str = ""
+
+    @abstractmethod
+    def crear(self, task: str, lang: str) -> Any:
+        """Crea el analizador para (tarea, idioma). Solo se llama una vez por clave."""
+
+
+class BackendPysentimiento(BackendAnalizadores):
+    """Backend por defecto: los pipelines de PyTorch de pysentimiento."""
+
+    nombre = "pysentimiento"
+
+    def crear(self, task: str, lang: str) -> Any:
+        from pysentimiento import create_analyzer
+
+        return create_analyzer(task=task, lang=lang)
+
+
+class RegistroAnalizadores:
+    """Registro compartido de analizadores de pysentimiento para todo el proceso.
+
+    Cargar un modelo de pysentimiento cuesta segundos y cientos de MB de memoria, así que los
+    analizadores se crean una sola vez por combinación (tarea, idioma) y se comparten entre todas
+    las sesiones. La carga es perezosa y segura entre hilos: si dos sesiones piden el mismo
+    analizador a la vez, solo una lo carga. Hasta entonces ni siquiera se importa pysentimiento
+    (ni transformers ni torch), así `import lunita` se mantiene liviano. Ejemplo de uso:
+
+        RegistroAnalizadores.precargar()
+        analizador = RegistroAnalizadores.obtener(task="sentiment", lang="es")
+
+    Los analizadores los crea el backend configurado con `configurar_backend` (por defecto
+    `BackendPysentimiento`).
+
+    Raises:
+        RuntimeError: Si el analizador no se puede crear.
+    """
+
+    _backend: BackendAnalizadores = BackendPysentimiento()
+    _analizadores: dict[tuple[str, str], Any] = {}
+    _candado_global = Lock()
+    _candados: dict[tuple[str, str], Lock] = {}
+    # Sube con cada `liberar` y `configurar_backend`, para no guardar un analizador que se
+    # terminó de cargar después de que lo liberaran (o con el backend anterior).
+    _generacion = 0
+
+    @classmethod
+    def _candado(cls, clave: tuple[str, str]) -> Lock:
+        with cls._candado_global:
+            return cls._candados.setdefault(clave, Lock())
+
+    @classmethod
+    def obtener(cls, task: str, lang: str = "es") -> Any:
+        """Obtiene el analizador para (tarea, idioma), cargándolo si aún no existe.
+
+        Args:
+            task (str): Tarea de pysentimiento ("sentiment", "emotion", ...).
+            lang (str): Idioma del analizador.
+
+        Returns:
+            El analizador compartido de pysentimiento.
+        """
+        clave = (task, lang)
+        analizador = cls._analizadores.get(clave)
+        if analizador is not None:
+            return analizador
+
+        # Un candado por clave para no bloquear la carga de otros modelos mientras tanto.
+        with cls._candado(clave):
+            while True:
+                analizador = cls._analizadores.get(clave)
+                if analizador is not None:
+                    return analizador
+
+                with cls._candado_global:
+                    backend, generacion = cls._backend, cls._generacion
+                try:
+                    analizador = backend.crear(task=task, lang=lang)
+                except Exception as e:
+                    raise RuntimeError(
+                        f"No se pudo cargar el analizador '{task}' ({lang}) "
+                        f"con el backend '{backend.nombre}'."
+                    ) from e
+
+                with cls._candado_global:
+                    if cls._generacion == generacion:
+                        cls._analizadores[clave] = analizador
+                        return analizador
+                    if cls._backend is backend:
+                        # Lo liberaron mientras cargaba: sirve para esta llamada, sin guardarlo.
+                        return analizador
+                # Cambió el backend mientras cargaba: se vuelve a crear con el nuevo.
+
+    @classmethod
+    def precargar(
+        cls,
+        tareas: Iterable[str] = TAREAS_PREDETERMINADAS,
+        lang: str = "es",
+    ) -> None:
+        """Carga por adelantado los analizadores para que la primera sesión no pague la espera.
+
+        Args:
+            tareas (Iterable[str]): Tareas a cargar.
+            lang (str): Idioma de los analizadores.
+        """
+        for task in tareas:
+            cls.obtener(task=task, lang=lang)
+
+    @classmethod
+    def liberar(cls, task: Optional[str] = None, lang: Optional[str] = None) -> int:
+        """Libera analizadores cargados para recuperar memoria.
+
+        Sin argumentos libera todos. Las sesiones que sigan vivas volverán a cargarlos en su
+        siguiente análisis.
+
+        Args:
+            task (Optional[str]): Solo libera esta tarea.
+            lang (Optional[str]): Solo libera este idioma.
+
+        Returns:
+            int: Cantidad de analizadores liberados.
+        """
+        with cls._candado_global:
+            claves = [
+                clave
+                for clave in cls._analizadores
+                if (task is None or clave[0] == task)
+                and (lang is None or clave[1] == lang)
+            ]
+            for clave in claves:
+                del cls._analizadores[clave]
+            cls._generacion += 1
+        return len(claves)
+
+    @classmethod
+    def configurar_backend(cls, backend: BackendAnalizadores) -> None:
+        """Cambia el backend y libera los analizadores cargados con el anterior.
+
+        Args:
+            backend (BackendAnalizadores): El backend que creará los analizadores.
+        """
+        with cls._candado_global:
+            cls._backend = backend
+            cls._analizadores.clear()
+            cls._generacion += 1
+
+    @classmethod
+    def backend(cls) -> BackendAnalizadores:
+        """Devuelve el backend configurado."""
+        return cls._backend
+
+    @classmethod
+    def cargados(cls) -> list[tuple[str, str]]:
+        """Devuelve las claves (tarea, idioma) de los analizadores ya cargados."""
+        return list(cls._analizadores)
+
+
+def precargar(
+    tareas: Iterable[str] = TAREAS_PREDETERMINADAS, lang: str = "es"
+) -> None:
+    """Atajo para `RegistroAnalizadores.precargar`, pensado para llamarse al arrancar.
+
+    También lee de una vez los archivos de datos del paquete (ver `RegistroDatos`).
+    """
+    precargar_datos()
+    RegistroAnalizadores.precargar(tareas=tareas, lang=lang)
+
+
+def liberar_analizadores(
+    task: Optional[str] = None, lang: Optional[str] = None
+) -> int:
+    """Atajo para `RegistroAnalizadores.liberar`."""
+    return RegistroAnalizadores.liberar(task=task, lang=lang)
+
+
+def configurar_backend(backend: Optional[BackendAnalizadores]) -> None:
+    """Elige cómo se crean los analizadores (con `None`, vuelve a pysentimiento).
+
+    Con un `ProcessPoolExecutor` (ver `configurar_ejecutor`) cada proceso hijo tiene su propio
+    registro: llama a esta función también en el `initializer` del pool.
+
+    Args:
+        backend (Optional[BackendAnalizadores]): El backend a usar.
+    """
+    RegistroAnalizadores.configurar_backend(backend or BackendPysentimiento())
+
+
+def obtener_backend() -> BackendAnalizadores:
+    """Devuelve el backend con el que se crean los analizadores."""
+    return RegistroAnalizadores.backend()
@@ -0,0 +1,245 @@
+import asyncio
+import inspect
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Optional, TypedDict
+
+from .almacen import AlmacenSesiones
+from .configuracion import ConfigurarEstrellas
+from .horoscopo import CacheHoroscopos
+from .sesion import Sesion
+
+
+class MetricasGestor(TypedDict):
+    sesiones: int
+    memoria_estimada: int
+    creadas: int
+    desalojadas: int
+    desalojadas_por_inactividad: int
+
+
+class GestorSesiones:
+    """Administra las sesiones de muchos usuarios con límites de cantidad, memoria e inactividad.
+
+    Crea o recupera la `Sesion` de cada usuario por su id y desaloja las menos usadas
+    recientemente cuando se pasa de `max_sesiones` o de `max_bytes`, además de las que lleven
+    más de `inactividad` segundos sin usarse. Al soltar una sesión se espera su `aclose()` (que
+    termina el resumen y el análisis emocional pendientes y guarda su estado en el almacén) y
+    luego se llama a `al_desalojar(usuario_id, sesion)` (puede ser una corrutina). Ejemplo de uso:
+
+        gestor = GestorSesiones(max_sesiones=5000, inactividad=1800, al_desalojar=guardar)
+        sesion = await gestor.obtener("usuario_42")
+        respuesta = await sesion.predecir("Hola Lunita")
+
+    Con un `almacen`, cada sesión se guarda bajo el id del usuario y se retoma de ahí si se
+    vuelve a pedir después de ser desalojada. Con `horoscopos`, todas las sesiones comparten el
+    mismo cache de horóscopos del día.
+
+    La memoria de cada sesión es una estimación (ver `Sesion.memoria_estimada`) que se actualiza
+    cada vez que se obtiene la sesión y en cada `purgar()`.
+
+    Atributes:
+        max_sesiones (int): Máximo de sesiones vivas.
+        max_bytes (Optional[int]): Presupuesto de memoria estimada para todas las sesiones.
+        inactividad (Optional[float]): Segundos sin uso tras los cuales se desaloja una sesión.
+    """
+
+    def __init__(
+        self,
+        max_sesiones: int = 10_000,
+        max_bytes: Optional[int] = None,
+        inactividad: Optional[float] = 1800,
+        al_desalojar: Optional[Callable[[str, Sesion], Any]] = None,
+        configuracion: Optional[ConfigurarEstrellas] = None,
+        inquilino: Optional[str] = None,
+        fabrica: Optional[Callable[[str], Sesion]] = None,
+        almacen: Optional[AlmacenSesiones] = None,
+        horoscopos: Optional[CacheHoroscopos] = None,
+    ) -> None:
+        if max_sesiones < 1:
+            raise ValueError("El gestor debe admitir al menos una sesión.")
+
+        self.max_sesiones = max_sesiones
+        self.max_bytes = max_bytes
+        self.inactividad = inactividad
+        self._al_desalojar = al_desalojar
+        self._fabrica = fabrica or (
+            lambda usuario_id: Sesion(
+                configuracion=configuracion,
+                inquilino=inquilino,
+                id_sesion=usuario_id if almacen is not None else None,
+                almacen=almacen,
+                horoscopos=horoscopos,
+            )
+        )
+
+        # usuario_id -> (sesion, último uso, memoria estimada); el orden es el de uso.
+        self._sesiones: OrderedDict[str, tuple[Sesion, float, int]] = OrderedDict()
+        self._memoria = 0
+        self._candado = asyncio.Lock()
+
+        self._creadas = 0
+        self._desalojadas = 0
+        self._por_inactividad = 0
+
+    def __len__(self) -> int:
+        return len(self._sesiones)
+
+    def __contains__(self, usuario_id: str) -> bool:
+        return usuario_id in self._sesiones
+
+    @property
+    def sesiones_activas(self) -> int:
+        """Cantidad de sesiones vivas."""
+        return len(self._sesiones)
+
+    @property
+    def memoria_estimada(self) -> int:
+        """Memoria estimada en bytes de todas las sesiones vivas."""
+        return self._memoria
+
+    async def obtener(self, usuario_id: str) -> Sesion:
+        """Devuelve la sesión del usuario, creándola si no existe.
+
+        Args:
+            usuario_id (str): Identificador del usuario.
+
+        Returns:
+            Sesion: La sesión del usuario.
+        """
+        async with self._candado:
+            entrada = self._sesiones.pop(usuario_id, None)
+            if entrada is None:
+                sesion = self._fabrica(usuario_id)
+                self._creadas += 1
+            else:
+                sesion, _, memoria_anterior = entrada
+                self._memoria -= memoria_anterior
+
+            memoria = sesion.memoria_estimada()
+            self._sesiones[usuario_id] = (sesion, monotonic(), memoria)
+            self._memoria += memoria
+
+            desalojadas = self._seleccionar_excedentes(conservar=usuario_id)
+
+        await self._notificar(desalojadas)
+        return sesion
+
+    async def desalojar(self, usuario_id: str) -> bool:
+        """Desaloja la sesión de un usuario, cerrándola y llamando al hook de desalojo.
+
+        Args:
+            usuario_id (str): Identificador del usuario.
+
+        Returns:
+            bool: True si la sesión existía.
+        """
+        async with self._candado:
+            entrada = self._quitar(usuario_id)
+        if entrada is None:
+            return False
+
+        self._desalojadas += 1
+        await self._notificar([(usuario_id, entrada)])
+        return True
+
+    async def purgar(self) -> int:
+        """Recalcula la memoria de todas las sesiones y desaloja las inactivas o excedentes.
+
+        Conviene llamarlo periódicamente (por ejemplo cada minuto) desde el servidor.
+
+        Returns:
+            int: Cantidad de sesiones desalojadas.
+        """
+        async with self._candado:
+            ahora = monotonic()
+            desalojadas = []
+
+            for usuario_id, (_, ultimo_uso, _) in list(self._sesiones.items()):
+                if self.inactividad is not None and ahora - ultimo_uso > self.inactividad:
+                    desalojadas.append((usuario_id, self._quitar(usuario_id)))
+                    self._por_inactividad += 1
+
+            self._memoria = 0
+            for usuario_id, (sesion, ultimo_uso, _) in self._sesiones.items():
+                memoria = sesion.memoria_estimada()
+                self._sesiones[usuario_id] = (sesion, ultimo_uso, memoria)
+                self._memoria += memoria
+
+            self._desalojadas += len(desalojadas)
+            desalojadas += self._seleccionar_excedentes()
+
+        await self._notificar(desalojadas)
+        return len(desalojadas)
+
+    async def aclose(self) -> None:
+        """Desaloja todas las sesiones, cerrándolas y llamando al hook de desalojo para cada una.
+
+        No cierra el pool HTTP: las configuraciones no son del gestor, así que lo cierra su dueño
+        con `ConfigurarEstrellas.aclose()`.
+        """
+        async with self._candado:
+            desalojadas = [
+                (usuario_id, self._quitar(usuario_id)) for usuario_id in list(self._sesiones)
+            ]
+            self._desalojadas += len(desalojadas)
+        await self._notificar(desalojadas)
+
+    def metricas(self) -> MetricasGestor:
+        """Devuelve la cantidad de sesiones vivas, su memoria estimada y los contadores.
+
+        Returns:
+            MetricasGestor: Sesiones vivas, memoria estimada en bytes y desalojos.
+        """
+        return {
+            "sesiones": len(self._sesiones),
+            "memoria_estimada": self._memoria,
+            "creadas": self._creadas,
+            "desalojadas": self._desalojadas,
+            "desalojadas_por_inactividad": self._por_inactividad,
+        }
+
+    def _quitar(self, usuario_id: str) -> Optional[tuple[Sesion, float, int]]:
+        entrada = self._sesiones.pop(usuario_id, None)
+        if entrada is not None:
+            self._memoria -= entrada[2]
+        return entrada
+
+    def _seleccionar_excedentes(
+        self, conservar: Optional[str] = None
+    ) -> list[tuple[str, tuple[Sesion, float, int]]]:
+        """Quita las sesiones menos usadas mientras se exceda algún límite."""
+        desalojadas = []
+        ahora = monotonic()
+
+        for usuario_id in list(self._sesiones):
+            if usuario_id == conservar:
+                continue
+
+            ultimo_uso = self._sesiones[usuario_id][1]
+            inactiva = self.inactividad is not None and ahora - ultimo_uso > self.inactividad
+            excede = len(self._sesiones) > self.max_sesiones or (
+                self.max_bytes is not None and self._memoria > self.max_bytes
+            )
+            if not (inactiva or excede):
+                break
+
+            desalojadas.append((usuario_id, self._quitar(usuario_id)))
+            if inactiva and not excede:
+                self._por_inactividad += 1
+
+        self._desalojadas += len(desalojadas)
+        return desalojadas  # type: ignore
+
+    async def _notificar(
+        self, desalojadas: list[tuple[str, Optional[tuple[Sesion, float, int]]]]
+    ) -> None:
+        """Cierra cada sesión quitada y llama al hook de desalojo."""
+        for usuario_id, entrada in desalojadas:
+            if entrada is None:
+                continue
+            await entrada[0].aclose()
+            if self._al_desalojar is not None:
+                resultado = self._al_desalojar(usuario_id, entrada[0])
+                if inspect.isawaitable(resultado):
+                    await resultado
@@ -0,0 +1,154 @@
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, UserPromptPart
+
+from .constantes import AJUSTES_CONTEXTO
+
+# Aproximación suficiente para español sin cargar un tokenizador.
+CARACTERES_POR_TOKEN = 4
+TOKENS_POR_PARTE = 4
+
+
+def estimar_tokens(mensaje: ModelMessage) -> int:
+    """Estima los tokens de un mensaje a partir de la longitud de sus partes.
+
+    Args:
+        mensaje (ModelMessage): El mensaje a medir.
+
+    Returns:
+        int: Tokens estimados.
+    """
+    total = 0
+    for parte in mensaje.parts:
+        contenido = getattr(parte, "content", None)
+        if contenido is None:
+            contenido = getattr(parte, "args", None)
+        texto = contenido if isinstance(contenido, str) else repr(contenido)
+        total += TOKENS_POR_PARTE + len(texto) // CARACTERES_POR_TOKEN
+    return total
+
+
+def _inicia_turno(mensaje: ModelMessage) -> bool:
+    """Un turno empieza con la petición que trae el mensaje del usuario."""
+    return isinstance(mensaje, ModelRequest) and any(
+        isinstance(parte, UserPromptPart) for parte in mensaje.parts
+    )
+
+
+def agrupar_turnos(mensajes: Iterable[ModelMessage]) -> list[list[ModelMessage]]:
+    """Agrupa mensajes en turnos: petición del usuario, llamadas y retornos de herramientas, y
+    respuesta final. Un turno nunca se parte al recortar el historial.
+
+    Args:
+        mensajes (Iterable[ModelMessage]): Mensajes en orden.
+
+    Returns:
+        list[list[ModelMessage]]: Los mensajes agrupados por turno.
+    """
+    turnos: list[list[ModelMessage]] = []
+    for mensaje in mensajes:
+        if not turnos or _inicia_turno(mensaje):
+            turnos.append([])
+        turnos[-1].append(mensaje)
+    return turnos
+
+
+class HistorialAcotado:
+    """Historial de conversación acotado por un presupuesto de tokens.
+
+    Guarda los mensajes agrupados por turnos en un deque. Al pasarse de `max_tokens` (o de
+    `max_turnos`) descarta los turnos más viejos completos, así una llamada a herramienta nunca
+    queda separada de su retorno ni una petición de su respuesta. El turno más reciente siempre
+    se conserva. Ejemplo de uso:
+
+        historial = HistorialAcotado(max_tokens=3000)
+        historial.agregar(resultado.new_messages())
+        await agente.run(mensaje, message_history=historial.mensajes())
+
+    Atributes:
+        max_tokens (int): Presupuesto de tokens estimados para todo el historial.
+        max_turnos (int): Máximo de turnos guardados.
+        al_descartar (Optional[Callable]): Se llama con los mensajes de cada turno descartado.
+    """
+
+    def __init__(
+        self,
+        mensajes: Optional[Iterable[ModelMessage]] = None,
+        max_tokens: int = AJUSTES_CONTEXTO["max_tokens_historial"],
+        max_turnos: int = AJUSTES_CONTEXTO["max_turnos_historial"],
+        al_descartar: Optional[Callable[[list[ModelMessage]], None]] = None,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.max_turnos = max_turnos
+        self.al_descartar = al_descartar
+
+        self._turnos: deque[tuple[list[ModelMessage], int]] = deque()
+        self._tokens = 0
+        self._cantidad = 0
+
+        if mensajes:
+            self.agregar(mensajes)
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def __iter__(self) -> Iterator[ModelMessage]:
+        for turno, _ in self._turnos:
+            yield from turno
+
+    def __bool__(self) -> bool:
+        return self._cantidad > 0
+
+    @property
+    def tokens(self) -> int:
+        """Tokens estimados de todo el historial."""
+        return self._tokens
+
+    @property
+    def turnos(self) -> int:
+        """Cantidad de turnos guardados."""
+        return len(self._turnos)
+
+    def agregar(self, mensajes: Iterable[ModelMessage]) -> None:
+        """Agrega los mensajes de uno o más turnos y recorta lo que exceda el presupuesto.
+
+        Los mensajes que no empiezan con una petición del usuario se unen al turno anterior.
+
+        Args:
+            mensajes (Iterable[ModelMessage]): Mensajes nuevos, en orden.
+        """
+        for i, turno in enumerate(agrupar_turnos(mensajes)):
+            if i == 0 and self._turnos and not _inicia_turno(turno[0]):
+                anterior, tokens = self._turnos.pop()
+                self._tokens -= tokens
+                self._cantidad -= len(anterior)
+                turno = anterior + turno
+
+            tokens = sum(estimar_tokens(mensaje) for mensaje in turno)
+            self._turnos.append((turno, tokens))
+            self._tokens += tokens
+            self._cantidad += len(turno)
+
+        self._recortar()
+
+    def mensajes(self) -> list[ModelMessage]:
+        """Devuelve los mensajes guardados, listos para `message_history`."""
+        return list(self)
+
+    def limpiar(self) -> None:
+        """Borra todo el historial sin llamar a `al_descartar`."""
+        self._turnos.clear()
+        self._tokens = 0
+        self._cantidad = 0
+
+    def _recortar(self) -> None:
+        """Descarta turnos viejos completos mientras se exceda algún límite."""
+        while len(self._turnos) > 1 and (
+            self._tokens > self.max_tokens or len(self._turnos) > self.max_turnos
+        ):
+            turno, tokens = self._turnos.popleft()
+            self._tokens -= tokens
+            self._cantidad -= len(turno)
+            if self.al_descartar is not None:
+                self.al_descartar(turno)
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import re
+from datetime import date
+from functools import lru_cache
+from threading import Lock
+from typing import Iterable, Optional, TypedDict
+
+from pydantic_ai import Agent
+from pydantic_ai.settings import ModelSettings
+
+from .configuracion import ConfigurarEstrellas
+from .constantes import AJUSTES_HOROSCOPO, PROMPT_HOROSCOPO
+from .emocional.cache import normalizar_mensaje
+from .limitador import estimar_tokens_texto, liquidar, reservar
+from .uso import calcular_uso, registrar_uso_total
+from .utilidades import RegistroDatos
+from .vidente import ConfigurarVidente
+
+VIDENTES = ("lunita", "estrella")
+
+logger = logging.getLogger(__name__)
+
+_AGENTES_HOROSCOPO: dict[str, Agent[None, str]] = {}
+_CANDADO_AGENTES = Lock()
+
+
+def _agente_horoscopo(vidente: str) -> Agent[None, str]:
+    """Devuelve el agente (sin herramientas) que escribe los horóscopos de una vidente."""
+    agente = _AGENTES_HOROSCOPO.get(vidente)
+    if agente is None:
+        with _CANDADO_AGENTES:
+            agente = _AGENTES_HOROSCOPO.get(vidente)
+            if agente is None:
+                agente = _AGENTES_HOROSCOPO[vidente] = Agent(
+                    instructions=ConfigurarVidente(vidente).obtener_prompt()  # type: ignore
+                )
+    return agente
+
+
+@lru_cache(maxsize=1)
+def _signos_normalizados() -> dict[str, str]:
+    """Nombre normalizado de cada signo ("pulsarin") -> nombre original ("Pulsarín")."""
+    return {
+        normalizar_mensaje(nombre): nombre for nombre in RegistroDatos.signos().por_nombre
+    }
+
+
+def detectar_signo(
+    mensaje: str,
+    max_palabras: int = AJUSTES_HOROSCOPO["max_palabras_pregunta"],
+) -> Optional[str]:
+    """Detecta si el mensaje es una petición simple de horóscopo y para qué signo.
+
+    Solo cuenta como petición simple un mensaje corto que menciona "horóscopo" y un único signo
+    ("¿me dices mi horóscopo de Nova?"). Cualquier otra cosa sigue el camino normal.
+
+    Args:
+        mensaje (str): El mensaje del usuario.
+        max_palabras (int): Largo máximo del mensaje para considerarlo una petición simple.
+
+    Returns:
+        Optional[str]: El nombre del signo tal como está en `data/signos.json`, o `None`.
+    """
+    palabras = re.findall(r"\w+", normalizar_mensaje(mensaje))
+    if len(palabras) > max_palabras or not any(
+        palabra.startswith("horoscopo") for palabra in palabras
+    ):
+        return None
+
+    por_nombre = _signos_normalizados()
+    signos = {por_nombre[palabra] for palabra in palabras if palabra in por_nombre}
+    return signos.pop() if len(signos) == 1 else None
+
+
+class MetricasHoroscopos(TypedDict):
+    fecha: Optional[str]
+    generados: int
+    aciertos: int
+    fallos: int
+    errores: int
+
+
+class CacheHoroscopos:
+    """Horóscopos del día por signo y vidente, generados una vez y servidos sin ir al modelo.
+
+    `programar()` lanza en segundo plano la generación de los horóscopos del día para todos los
+    signos de cada vidente, con a lo sumo `concurrencia` peticiones al proveedor a la vez. Las
+    entradas valen solo para su día: al cambiar la fecha se descartan y se generan de nuevo. Una
+    `Sesion` con este cache responde las peticiones simples de horóscopo ("mi horóscopo de
+    Nova") directamente desde aquí. Ejemplo de uso:
+
+        horoscopos = CacheHoroscopos()
+        horoscopos.programar()
+        sesion = Sesion(horoscopos=horoscopos)
+
+    Atributes:
+        configuracion (ConfigurarEstrellas): Configuración con la que se llama al modelo.
+        videntes (tuple[str, ...]): Videntes para las que se generan horóscopos.
+        concurrencia (int): Máximo de generaciones simultáneas.
+    """
+
+    def __init__(
+        self,
+        configuracion: Optional[ConfigurarEstrellas] = None,
+        videntes: Iterable[str] = VIDENTES,
+        concurrencia: int = AJUSTES_HOROSCOPO["concurrencia"],
+    ) -> None:
+        if concurrencia < 1:
+            raise ValueError("La concurrencia debe ser al menos 1.")
+
+        self.configuracion = ConfigurarEstrellas.resolver(configuracion)
+        self.videntes = tuple(videntes)
+        self.concurrencia = concurrencia
+
+        self._fecha: Optional[date] = None
+        self._textos: dict[tuple[str, str], str] = {}
+        self._tarea: Optional[asyncio.Task] = None
+
+        self._generados = 0
+        self._aciertos = 0
+        self._fallos = 0
+        self._errores = 0
+
+    def obtener(self, vidente: str, signo: str) -> Optional[str]:
+        """Devuelve el horóscopo de hoy para el signo, si ya está generado.
+
+        Args:
+            vidente (str): "lunita" o "estrella".
+            signo (str): Nombre del signo.
+
+        Returns:
+            Optional[str]: El texto del horóscopo, o `None`.
+        """
+        self._expirar()
+        texto = self._textos.get((vidente, signo))
+        if texto is None:
+            self._fallos += 1
+        else:
+            self._aciertos += 1
+        return texto
+
+    @property
+    def completo(self) -> bool:
+        """Indica si ya están todos los horóscopos de hoy."""
+        self._expirar()
+        return len(self._textos) == len(self.videntes) * len(RegistroDatos.signos().signos)
+
+    def programar(self) -> Optional[asyncio.Task]:
+        """Lanza en segundo plano la generación de los horóscopos de hoy que falten.
+
+        No hace nada si ya están todos o si hay otra generación en curso. Una `Sesion` lo vuelve
+        a llamar cuando no encuentra un horóscopo, así el cache se renueva solo al cambiar el día
+        y reintenta los signos que fallaron.
+
+        Returns:
+            Optional[asyncio.Task]: La tarea en curso, si la hay.
+        """
+        if not self.completo and (self._tarea is None or self._tarea.done()):
+            self._tarea = asyncio.get_running_loop().create_task(self.precalcular())
+        return self._tarea
+
+    async def precalcular(self) -> int:
+        """Genera los horóscopos de hoy que falten.
+
+        Returns:
+            int: Cantidad de horóscopos generados.
+        """
+        self._expirar()
+        fecha = self._fecha
+        semaforo = asyncio.Semaphore(self.concurrencia)
+        pendientes = [
+            (vidente, signo)
+            for vidente in self.videntes
+            for signo in RegistroDatos.signos().signos
+            if (vidente, signo["Signo"]) not in self._textos
+        ]
+
+        async def generar(vidente: str, signo) -> bool:
+            async with semaforo:
+                peticion = PROMPT_HOROSCOPO.format(
+                    fecha=fecha,
+                    signo=signo["Signo"],
+                    personalidad=signo["Personalidad"],
+                    interpretacion=signo["Interpretación"],
+                )
+                reservados = 0
+                try:
+                    reservados = await reservar(
+                        estimar_tokens_texto(peticion) + AJUSTES_HOROSCOPO["max_tokens"]
+                    )
+                    r = await _agente_horoscopo(vidente).run(
+                        peticion,
+                        model=self.configuracion.configuracion_modelo(),
+                        model_settings=ModelSettings(
+                            max_tokens=AJUSTES_HOROSCOPO["max_tokens"],
+                            temperature=AJUSTES_HOROSCOPO["temperatura"],
+                        ),
+                    )
+                except Exception:
+                    liquidar(reservados, None)
+                    # Ese signo se responde por el camino normal hasta el siguiente intento.
+                    logger.warning(
+                        "Falló el horóscopo de %s para %s.", signo["Signo"], vidente, exc_info=True
+                    )
+                    self._errores += 1
+                    return False
+
+            liquidar(reservados, r.usage())
+            registrar_uso_total(calcular_uso(r.usage(), self.configuracion.modelo))
+            self._expirar()
+            if self._fecha != fecha:
+                # Cambió el día mientras se generaba: ese texto ya no vale.
+                return False
+            self._textos[(vidente, signo["Signo"])] = r.output.strip()
+            self._generados += 1
+            return True
+
+        resultados = await asyncio.gather(
+            *(generar(vidente, signo) for vidente, signo in pendientes)
+        )
+        return sum(resultados)
+
+    def metricas(self) -> MetricasHoroscopos:
+        """Devuelve la fecha vigente y los contadores de generación y de uso.
+
+        Returns:
+            MetricasHoroscopos: Generados, aciertos, fallos y errores de generación.
+        """
+        return {
+            "fecha": self._fecha.isoformat() if self._fecha else None,
+            "generados": self._generados,
+            "aciertos": self._aciertos,
+            "fallos": self._fallos,
+            "errores": self._errores,
+        }
+
+    def _expirar(self) -> None:
+        """Descarta los horóscopos de días anteriores."""
+        hoy = date.today()
+        if self._fecha != hoy:
+            self._fecha = hoy
+            self._textos.clear()
@@ -0,0 +1,186 @@
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, ContextManager, Optional
+
+from pydantic_ai.models import Model, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+
+Observador = Callable[[str, float], Any]
+
+_observadores: list[Observador] = []
+_tracer: Optional[Any] = None
+_tiempos_activos = False
+_activa = False
+
+# Desglose del turno en curso (etapa -> milisegundos), solo mientras se mide un turno.
+_tiempos_turno: ContextVar[Optional[dict[str, float]]] = ContextVar(
+    "lunita_tiempos_turno", default=None
+)
+_NULO: ContextManager[Any] = nullcontext()
+
+
+def _actualizar() -> None:
+    global _activa
+    _activa = bool(_observadores) or _tracer is not None or _tiempos_activos
+
+
+def agregar_observador(observador: Observador) -> None:
+    """Registra una función que se llama al terminar cada etapa.
+
+    El observador recibe el nombre de la etapa ("motor_emocional", "sentimiento", "emocion",
+    "llm", "herramienta.tarot", "turno", ...) y su duración en segundos. Ejemplo de uso:
+
+        agregar_observador(lambda etapa, segundos: histograma[etapa].observe(segundos))
+
+    Args:
+        observador (Observador): La función a llamar.
+    """
+    _observadores.append(observador)
+    _actualizar()
+
+
+def quitar_observador(observador: Observador) -> None:
+    """Quita un observador registrado con `agregar_observador`."""
+    if observador in _observadores:
+        _observadores.remove(observador)
+    _actualizar()
+
+
+def configurar_tiempos(activo: bool) -> None:
+    """Activa o desactiva el desglose de tiempos (`tiempos`) en cada `RespuestaSesion`."""
+    global _tiempos_activos
+    _tiempos_activos = activo
+    _actualizar()
+
+
+def configurar_opentelemetry(tracer: Optional[Any] = None, activo: bool = True) -> None:
+    """Emite un span de OpenTelemetry por cada etapa.
+
+    Args:
+        tracer (Optional[Any]): El tracer a usar. Por defecto, `trace.get_tracer("lunita")`.
+        activo (bool): Con False deja de emitir spans.
+    """
+    global _tracer
+    if not activo:
+        _tracer = None
+    elif tracer is not None:
+        _tracer = tracer
+    else:
+        from opentelemetry import trace
+
+        _tracer = trace.get_tracer("lunita")
+    _actualizar()
+
+
+def instrumentacion_activa() -> bool:
+    """Indica si hay observadores, tracer o desglose de tiempos activos."""
+    return _activa
+
+
+class _Etapa:
+    __slots__ = ("nombre", "_inicio", "_span")
+
+    def __init__(self, nombre: str) -> None:
+        self.nombre = nombre
+        self._span: Optional[Any] = None
+
+    def __enter__(self) -> "_Etapa":
+        if _tracer is not None:
+            self._span = _tracer.start_as_current_span(f"lunita.{self.nombre}")
+            self._span.__enter__()
+        self._inicio = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        duracion = perf_counter() - self._inicio
+        if self._span is not None:
+            self._span.__exit__(*exc_info)
+
+        tiempos = _tiempos_turno.get()
+        if tiempos is not None:
+            tiempos[self.nombre] = tiempos.get(self.nombre, 0.0) + duracion * 1000
+        for observador in _observadores:
+            observador(self.nombre, duracion)
+
+
+def etapa(nombre: str) -> ContextManager[Any]:
+    """Mide una etapa de un turno. Si no hay instrumentación activa no hace nada.
+
+    Args:
+        nombre (str): Nombre de la etapa.
+
+    Returns:
+        ContextManager: Un contexto que mide la etapa, o uno vacío si está desactivada.
+    """
+    if not _activa:
+        return _NULO
+    return _Etapa(nombre)
+
+
+class _Turno:
+    __slots__ = ("tiempos", "_token")
+
+    def __enter__(self) -> dict[str, float]:
+        self.tiempos: dict[str, float] = {}
+        self._token = _tiempos_turno.set(self.tiempos)
+        return self.tiempos
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            _tiempos_turno.reset(self._token)
+        except ValueError:
+            # Un `predecir_stream` abandonado a medias se cierra desde otro contexto (al
+            # recolectarlo); ahí no hay nada que restaurar.
+            pass
+
+
+def medir_turno() -> ContextManager[Optional[dict[str, float]]]:
+    """Junta las etapas de un turno en un diccionario (etapa -> milisegundos).
+
+    Returns:
+        ContextManager: Entrega el diccionario del desglose, o `None` si el desglose de tiempos
+        está desactivado.
+    """
+    if not _tiempos_activos:
+        return _NULO
+    return _Turno()
+
+
+def instrumentar_herramienta(funcion: Callable) -> Callable:
+    """Envuelve una herramienta para medirla como la etapa "herramienta.<nombre>"."""
+    nombre = f"herramienta.{funcion.__name__}"
+
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        with etapa(nombre):
+            return funcion(*args, **kwargs)
+
+    return envoltura
+
+
+class ModeloInstrumentado(WrapperModel):
+    """Modelo que mide cada petición al modelo envuelto como la etapa "llm"."""
+
+    async def request(self, *args: Any, **kwargs: Any) -> Any:
+        with etapa("llm"):
+            return await self.wrapped.request(*args, **kwargs)
+
+    @asynccontextmanager
+    async def request_stream(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[StreamedResponse]:
+        with etapa("llm"):
+            async with self.wrapped.request_stream(*args, **kwargs) as respuesta:
+                yield respuesta
+
+
+def instrumentar_modelo(modelo: Model) -> Model:
+    """Envuelve el modelo para medir cada ida y vuelta al proveedor como la etapa "llm".
+
+    Si la instrumentación está desactivada devuelve el mismo modelo.
+    """
+    if not _activa:
+        return modelo
+    return ModeloInstrumentado(modelo)
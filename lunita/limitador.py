@@ -0,0 +1,203 @@
+import asyncio
+from time import monotonic
+from typing import Optional, TypedDict
+
+from pydantic_ai.usage import RunUsage
+
+from .historial import CARACTERES_POR_TOKEN
+
+
+class MetricasLimitador(TypedDict):
+    peticiones_por_minuto: Optional[int]
+    tokens_por_minuto: Optional[int]
+    peticiones_disponibles: Optional[float]
+    tokens_disponibles: Optional[float]
+    esperas: int
+    segundos_esperados: float
+
+
+class LimitadorTasa:
+    """Limita las peticiones y los tokens por minuto que se mandan al proveedor.
+
+    Es un token bucket doble: una cubeta de peticiones y otra de tokens, cada una con capacidad
+    para un minuto y que se rellena de forma continua. Antes de cada corrida se reserva una
+    petición y una estimación de los tokens; al terminar se corrige con el uso real, así los
+    excesos se pagan esperando en las corridas siguientes en lugar de con un 429. Ejemplo de uso:
+
+        configurar_limitador(LimitadorTasa(peticiones_por_minuto=500, tokens_por_minuto=200_000))
+
+    Atributes:
+        peticiones_por_minuto (Optional[int]): Límite de peticiones; `None` no las limita.
+        tokens_por_minuto (Optional[int]): Límite de tokens; `None` no los limita.
+    """
+
+    def __init__(
+        self,
+        peticiones_por_minuto: Optional[int] = None,
+        tokens_por_minuto: Optional[int] = None,
+    ) -> None:
+        if peticiones_por_minuto is not None and peticiones_por_minuto < 1:
+            raise ValueError("El límite de peticiones por minuto debe ser al menos 1.")
+        if tokens_por_minuto is not None and tokens_por_minuto < 1:
+            raise ValueError("El límite de tokens por minuto debe ser al menos 1.")
+
+        self.peticiones_por_minuto = peticiones_por_minuto
+        self.tokens_por_minuto = tokens_por_minuto
+
+        self._peticiones = float(peticiones_por_minuto or 0)
+        self._tokens = float(tokens_por_minuto or 0)
+        self._ultimo = monotonic()
+        self._candado = asyncio.Lock()
+
+        self._esperas = 0
+        self._segundos_esperados = 0.0
+
+    def _rellenar(self) -> None:
+        ahora = monotonic()
+        transcurrido = ahora - self._ultimo
+        self._ultimo = ahora
+        if self.peticiones_por_minuto is not None:
+            self._peticiones = min(
+                self.peticiones_por_minuto,
+                self._peticiones + transcurrido * self.peticiones_por_minuto / 60,
+            )
+        if self.tokens_por_minuto is not None:
+            self._tokens = min(
+                self.tokens_por_minuto,
+                self._tokens + transcurrido * self.tokens_por_minuto / 60,
+            )
+
+    def _espera_necesaria(self, tokens: int) -> float:
+        """Segundos que faltan para poder reservar una petición y `tokens` tokens."""
+        espera = 0.0
+        if self.peticiones_por_minuto is not None and self._peticiones < 1:
+            espera = (1 - self._peticiones) * 60 / self.peticiones_por_minuto
+        if self.tokens_por_minuto is not None and self._tokens < tokens:
+            espera = max(espera, (tokens - self._tokens) * 60 / self.tokens_por_minuto)
+        return espera
+
+    async def adquirir(self, tokens: int = 0) -> None:
+        """Espera hasta poder mandar una petición de unos `tokens` tokens y los reserva.
+
+        Las esperas se atienden en orden de llegada. Una petición más grande que el límite por
+        minuto espera a tener la cubeta llena en lugar de bloquearse para siempre.
+
+        Args:
+            tokens (int): Tokens estimados de la petición (entrada más salida).
+        """
+        if self.tokens_por_minuto is not None:
+            tokens = min(tokens, self.tokens_por_minuto)
+
+        async with self._candado:
+            self._rellenar()
+            espera = self._espera_necesaria(tokens)
+            while espera > 0:
+                self._esperas += 1
+                self._segundos_esperados += espera
+                await asyncio.sleep(espera)
+                self._rellenar()
+                espera = self._espera_necesaria(tokens)
+
+            if self.peticiones_por_minuto is not None:
+                self._peticiones -= 1
+            if self.tokens_por_minuto is not None:
+                self._tokens -= tokens
+
+    def ajustar(
+        self, tokens_reservados: int, tokens_reales: int, peticiones_extra: int = 0
+    ) -> None:
+        """Corrige la reserva con lo que la corrida consumió de verdad.
+
+        Args:
+            tokens_reservados (int): Lo que se reservó con `adquirir`.
+            tokens_reales (int): Los tokens de entrada y salida que reportó el proveedor.
+            peticiones_extra (int): Peticiones de más de la corrida (por las herramientas).
+        """
+        self._rellenar()
+        if self.peticiones_por_minuto is not None:
+            self._peticiones -= peticiones_extra
+        if self.tokens_por_minuto is not None:
+            tokens_reservados = min(tokens_reservados, self.tokens_por_minuto)
+            self._tokens -= tokens_reales - tokens_reservados
+
+    def metricas(self) -> MetricasLimitador:
+        """Devuelve los límites, lo que queda disponible y cuánto se ha esperado.
+
+        Returns:
+            MetricasLimitador: Límites, disponibilidad actual y esperas acumuladas.
+        """
+        self._rellenar()
+        return {
+            "peticiones_por_minuto": self.peticiones_por_minuto,
+            "tokens_por_minuto": self.tokens_por_minuto,
+            "peticiones_disponibles": (
+                self._peticiones if self.peticiones_por_minuto is not None else None
+            ),
+            "tokens_disponibles": self._tokens if self.tokens_por_minuto is not None else None,
+            "esperas": self._esperas,
+            "segundos_esperados": self._segundos_esperados,
+        }
+
+
+_limitador: Optional[LimitadorTasa] = None
+
+
+def configurar_limitador(limitador: Optional[LimitadorTasa]) -> None:
+    """Define el limitador que comparten todas las sesiones del proceso.
+
+    Lo usan el cliente, el resumen del historial y el cache de horóscopos, es decir, todo lo
+    que llama al proveedor. Con `None` se deja de limitar.
+
+    Args:
+        limitador (Optional[LimitadorTasa]): El limitador a usar.
+    """
+    global _limitador
+    _limitador = limitador
+
+
+def obtener_limitador() -> Optional[LimitadorTasa]:
+    """Devuelve el limitador configurado, o `None` si no hay."""
+    return _limitador
+
+
+def estimar_tokens_texto(*textos: str) -> int:
+    """Estima los tokens de unos textos con la misma aproximación que el historial."""
+    return sum(len(texto) for texto in textos) // CARACTERES_POR_TOKEN
+
+
+async def reservar(tokens: int) -> int:
+    """Espera su turno en el limitador del proceso, si hay uno.
+
+    Args:
+        tokens (int): Tokens estimados de la corrida (entrada más salida máxima).
+
+    Returns:
+        int: Los tokens reservados, para pasarlos a `liquidar`.
+    """
+    if _limitador is None:
+        return 0
+    await _limitador.adquirir(tokens)
+    return tokens
+
+
+def liquidar(tokens_reservados: int, uso: Optional[RunUsage]) -> None:
+    """Corrige la reserva de una corrida con su uso real.
+
+    Llamarla siempre, también si la corrida falló o se canceló: sin uso se devuelven los tokens
+    reservados (la petición sí queda contada).
+
+    Args:
+        tokens_reservados (int): Lo que devolvió `reservar`.
+        uso (Optional[RunUsage]): El resultado de `resultado.usage()`, o `None` si la corrida no
+            terminó.
+    """
+    if _limitador is None:
+        return
+    if uso is None:
+        _limitador.ajustar(tokens_reservados, 0)
+        return
+    _limitador.ajustar(
+        tokens_reservados,
+        uso.input_tokens + uso.output_tokens,
+        peticiones_extra=max(uso.requests - 1, 0),
+    )
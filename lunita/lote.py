@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Iterable, Optional, TypedDict
+
+from .constantes import AJUSTES_LOTE
+from .sesion import RespuestaSesion, Sesion
+
+logger = logging.getLogger(__name__)
+
+
+class ResultadoLote(TypedDict):
+    indice: int
+    sesion: Sesion
+    mensaje: str
+    respuesta: Optional[RespuestaSesion]
+    error: Optional[Exception]
+
+
+async def predecir_lote(
+    pares: Iterable[tuple[Sesion, str]],
+    concurrencia: int = AJUSTES_LOTE["concurrencia"],
+) -> AsyncIterator[ResultadoLote]:
+    """Corre muchos turnos (sesión, mensaje) a la vez y entrega cada resultado al terminar.
+
+    Pensado para trabajos por lotes (por ejemplo, mensajes de reenganche a muchos usuarios): a lo
+    sumo `concurrencia` turnos están en curso al mismo tiempo, y si hay un limitador configurado
+    (ver `configurar_limitador`) todas las corridas esperan su turno en él. Los mensajes de una
+    misma sesión se corren uno detrás de otro y en orden. Un error en un turno no corta el lote:
+    se entrega en `error` de su resultado. Ejemplo de uso:
+
+        async for resultado in predecir_lote(((sesion, "¡Hola!") for sesion in sesiones)):
+            if resultado["error"] is None:
+                enviar(resultado["sesion"].id_sesion, resultado["respuesta"]["texto"])
+
+    Args:
+        pares (Iterable[tuple[Sesion, str]]): Las sesiones y sus mensajes; se consumen de a poco.
+        concurrencia (int): Máximo de turnos en curso.
+
+    Yields:
+        ResultadoLote: El resultado de cada turno, en el orden en que terminan. `indice` es su
+        posición en `pares`.
+    """
+    if concurrencia < 1:
+        raise ValueError("La concurrencia debe ser al menos 1.")
+
+    pendientes = enumerate(pares)
+    resultados: asyncio.Queue[Optional[ResultadoLote]] = asyncio.Queue()
+    candados: dict[int, asyncio.Lock] = {}
+
+    async def trabajador() -> None:
+        try:
+            for indice, (sesion, mensaje) in pendientes:
+                resultado: ResultadoLote = {
+                    "indice": indice,
+                    "sesion": sesion,
+                    "mensaje": mensaje,
+                    "respuesta": None,
+                    "error": None,
+                }
+                candado = candados.setdefault(id(sesion), asyncio.Lock())
+                async with candado:
+                    try:
+                        resultado["respuesta"] = await sesion.predecir(mensaje)
+                    except Exception as error:
+                        # El error viaja en el resultado; el lote sigue con los demás turnos.
+                        logger.warning("Falló el turno %d del lote.", indice, exc_info=True)
+                        resultado["error"] = error
+                await resultados.put(resultado)
+        finally:
+            await resultados.put(None)
+
+    trabajadores = [asyncio.create_task(trabajador()) for _ in range(concurrencia)]
+    try:
+        activos = len(trabajadores)
+        while activos:
+            resultado = await resultados.get()
+            if resultado is None:
+                activos -= 1
+            else:
+                yield resultado
+
+        # Un error al recorrer `pares` no es de ningún turno: se propaga.
+        for tarea in trabajadores:
+            await tarea
+    finally:
+        for tarea in trabajadores:
+            tarea.cancel()
+        await asyncio.gather(*trabajadores, return_exceptions=True)
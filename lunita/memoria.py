@@ -13,7 +13,11 @@ class MemoriaDia(CargadorDatos):
     def __init__(self, ruta):
         super().__init__(ruta)
         self.recuerdos = self.cargar_datos()
-        self.recuerdo_actual: Recuerdo = random.choice(self.recuerdos)
+        recuerdo = random.choice(self.recuerdos)
+        self.recuerdo_actual: Recuerdo = {
+            "situacion": recuerdo["situacion"],
+            "emociones": list(recuerdo["emociones"]),
+        }
 
     def obtener_recuerdo_completo(self) -> str:
         return f"HOY TE PASO: {self.recuerdo_actual['situacion']}"
@@ -0,0 +1,104 @@
+from collections import deque
+from statistics import quantiles
+from threading import Lock
+from typing import TYPE_CHECKING, Literal, Optional, TypedDict, Union
+
+from pydantic_ai.settings import ModelSettings
+
+if TYPE_CHECKING:
+    from pydantic_ai.models import Model
+
+NivelVerbosidad = Literal["breve", "medio", "largo"]
+
+# Muestras recientes por nivel con las que se calculan los percentiles.
+MUESTRAS_LATENCIA = 512
+
+
+class PoliticaNivel(TypedDict, total=False):
+    modelo: Optional[Union[str, "Model"]]
+    ajustes: ModelSettings
+
+
+class LatenciaNivel(TypedDict):
+    turnos: int
+    promedio_ms: float
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+    tokens_salida_promedio: float
+
+
+class LatenciasNiveles:
+    """Latencia del modelo y tokens de salida por nivel de verbosidad, para ajustar la política.
+
+    Guarda los totales de cada nivel y las últimas `MUESTRAS_LATENCIA` latencias para los
+    percentiles.
+    """
+
+    def __init__(self) -> None:
+        self._candado = Lock()
+        self.reiniciar()
+
+    def registrar(self, nivel: NivelVerbosidad, segundos: float, tokens_salida: int) -> None:
+        """Suma un turno respondido por el modelo.
+
+        Args:
+            nivel (NivelVerbosidad): El nivel del mensaje.
+            segundos (float): Lo que tardó el modelo en responder.
+            tokens_salida (int): Tokens de la respuesta.
+        """
+        with self._candado:
+            self._turnos[nivel] = self._turnos.get(nivel, 0) + 1
+            self._segundos[nivel] = self._segundos.get(nivel, 0.0) + segundos
+            self._tokens[nivel] = self._tokens.get(nivel, 0) + tokens_salida
+            self._muestras.setdefault(nivel, deque(maxlen=MUESTRAS_LATENCIA)).append(
+                segundos * 1000
+            )
+
+    def reiniciar(self) -> None:
+        """Borra todas las mediciones."""
+        with self._candado:
+            self._turnos: dict[str, int] = {}
+            self._segundos: dict[str, float] = {}
+            self._tokens: dict[str, int] = {}
+            self._muestras: dict[str, deque[float]] = {}
+
+    def resumen(self) -> dict[str, LatenciaNivel]:
+        """Devuelve, por nivel, los turnos, la latencia promedio, p50 y p95 y los tokens de
+        salida promedio.
+
+        Returns:
+            dict[str, LatenciaNivel]: Las mediciones de cada nivel con al menos un turno.
+        """
+        with self._candado:
+            resumen: dict[str, LatenciaNivel] = {}
+            for nivel, turnos in self._turnos.items():
+                muestras = list(self._muestras[nivel])
+                cortes = quantiles(muestras, n=20) if len(muestras) > 1 else None
+                resumen[nivel] = {
+                    "turnos": turnos,
+                    "promedio_ms": self._segundos[nivel] * 1000 / turnos,
+                    "p50_ms": cortes[9] if cortes else (muestras[0] if muestras else None),
+                    "p95_ms": cortes[18] if cortes else (muestras[0] if muestras else None),
+                    "tokens_salida_promedio": self._tokens[nivel] / turnos,
+                }
+            return resumen
+
+
+_latencias = LatenciasNiveles()
+
+
+def registrar_latencia_nivel(
+    nivel: NivelVerbosidad, segundos: float, tokens_salida: int
+) -> None:
+    """Suma un turno a las latencias por nivel del proceso."""
+    _latencias.registrar(nivel, segundos, tokens_salida)
+
+
+def obtener_latencias_niveles() -> dict[str, LatenciaNivel]:
+    """Devuelve la latencia y los tokens de salida por nivel de verbosidad de todo el proceso."""
+    return _latencias.resumen()
+
+
+def reiniciar_latencias_niveles() -> None:
+    """Pone en cero las latencias por nivel del proceso."""
+    _latencias.reiniciar()
@@ -0,0 +1,48 @@
+import random
+import sys
+from typing import Literal
+
+import httpx
+from pydantic_ai.exceptions import ModelHTTPError
+
+RutaRespuesta = Literal[
+    "principal",  # el modelo principal, al primer intento
+    "reintento",  # el modelo principal, después de reintentar
+    "respaldo",  # el modelo de respaldo le ganó al principal
+    "horoscopo",  # el cache de horóscopos, sin llamar al modelo
+    "plazo_vencido",  # se acabó el plazo: mensaje de error de la vidente
+    "error",  # fallaron todos los intentos: mensaje de error de la vidente
+]
+
+# Estados HTTP que suelen arreglarse solos: timeout, conflicto, límite de tasa y errores 5xx.
+ESTADOS_TRANSITORIOS = {408, 409, 429}
+
+
+def error_transitorio(error: BaseException) -> bool:
+    """Indica si vale la pena reintentar después de este error.
+
+    Args:
+        error (BaseException): El error de la corrida.
+
+    Returns:
+        bool: True para errores de red y respuestas 408, 409, 429 y 5xx del proveedor.
+    """
+    if isinstance(error, ModelHTTPError):
+        return error.status_code in ESTADOS_TRANSITORIOS or error.status_code >= 500
+    if isinstance(error, httpx.TransportError):
+        return True
+
+    # El modelo de OpenAI no envuelve los errores de red: llegan como `APIConnectionError` (o
+    # su subclase `APITimeoutError`). Si el SDK no está cargado, el error no puede venir de él.
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(error, openai.APIConnectionError)
+
+
+def espera_reintento(intento: int, espera_base: float, espera_maxima: float) -> float:
+    """Segundos a esperar antes del reintento número `intento` + 1.
+
+    Backoff exponencial con jitter completo: un valor al azar entre 0 y
+    `min(espera_maxima, espera_base * 2**intento)`, para que muchas sesiones que fallaron a la
+    vez no reintenten todas juntas.
+    """
+    return random.uniform(0, min(espera_maxima, espera_base * 2**intento))
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+from pydantic_ai.settings import ModelSettings
+
+from .constantes import AJUSTES_RESUMEN, PROMPT_RESUMEN
+from .limitador import estimar_tokens_texto, liquidar, reservar
+from .uso import calcular_uso, registrar_uso_total
+
+if TYPE_CHECKING:
+    from .configuracion import ConfigurarEstrellas
+
+logger = logging.getLogger(__name__)
+
+_AGENTE_RESUMEN: Optional[Agent[None, str]] = None
+_CANDADO_AGENTE = Lock()
+
+
+def _agente_resumen() -> Agent[None, str]:
+    """Devuelve el agente que escribe los resúmenes, compartido por todo el proceso."""
+    global _AGENTE_RESUMEN
+    if _AGENTE_RESUMEN is None:
+        with _CANDADO_AGENTE:
+            if _AGENTE_RESUMEN is None:
+                _AGENTE_RESUMEN = Agent(instructions=PROMPT_RESUMEN)
+    return _AGENTE_RESUMEN
+
+
+def transcribir_turnos(turnos: list[list[ModelMessage]]) -> str:
+    """Convierte turnos en una transcripción de texto plano, sin las herramientas.
+
+    Args:
+        turnos (list[list[ModelMessage]]): Turnos a transcribir.
+
+    Returns:
+        str: Una línea por mensaje del usuario o de la vidente.
+    """
+    lineas = []
+    for turno in turnos:
+        for mensaje in turno:
+            for parte in mensaje.parts:
+                if isinstance(mensaje, ModelRequest) and isinstance(parte, UserPromptPart):
+                    if isinstance(parte.content, str):
+                        lineas.append(f"Usuario: {parte.content}")
+                elif isinstance(mensaje, ModelResponse) and isinstance(parte, TextPart):
+                    lineas.append(f"Vidente: {parte.content}")
+    return "\n".join(lineas)
+
+
+class CompactadorHistorial:
+    """Resume en segundo plano los turnos que se van cayendo del historial.
+
+    Se conecta como `al_descartar` de un `HistorialAcotado`: cada turno descartado queda
+    pendiente y, después de entregar la respuesta del turno actual, `programar()` lanza una
+    tarea que pliega los pendientes en un resumen acumulado. El resumen viaja al inicio del
+    historial como un mensaje de sistema, así el prompt se mantiene de tamaño casi constante
+    sin perder la memoria de largo plazo. Ejemplo de uso:
+
+        compactador = CompactadorHistorial(configuracion)
+        historial = HistorialAcotado(al_descartar=compactador.encolar)
+
+    Atributes:
+        resumen (str): El resumen acumulado de la conversación.
+    """
+
+    def __init__(
+        self,
+        configuracion: "ConfigurarEstrellas",
+        resumen: str = "",
+        max_pendientes: int = AJUSTES_RESUMEN["max_turnos_pendientes"],
+    ) -> None:
+        self.configuracion = configuracion
+        self.resumen = resumen
+        self.max_pendientes = max_pendientes
+
+        self._pendientes: list[list[ModelMessage]] = []
+        self._tarea: Optional[asyncio.Task] = None
+
+    @property
+    def pendientes(self) -> int:
+        """Cantidad de turnos descartados que aún no entran al resumen."""
+        return len(self._pendientes)
+
+    def encolar(self, turno: list[ModelMessage]) -> None:
+        """Guarda un turno descartado para el siguiente resumen.
+
+        Si el resumidor no da abasto (o falla), solo se conservan los `max_pendientes` más
+        recientes.
+        """
+        self._pendientes.append(turno)
+        del self._pendientes[: -self.max_pendientes]
+
+    def mensaje_resumen(self) -> Optional[ModelRequest]:
+        """Devuelve el resumen como mensaje para anteponer al historial, si hay resumen."""
+        if not self.resumen:
+            return None
+        return ModelRequest(
+            parts=[
+                SystemPromptPart(
+                    content=f"RESUMEN DE LA CONVERSACIÓN HASTA AHORA: {self.resumen}"
+                )
+            ]
+        )
+
+    def programar(self) -> Optional[asyncio.Task]:
+        """Lanza la compactación en segundo plano si hay turnos pendientes y no hay otra en curso.
+
+        Returns:
+            Optional[asyncio.Task]: La tarea en curso, si la hay.
+        """
+        if self._pendientes and (self._tarea is None or self._tarea.done()):
+            self._tarea = asyncio.get_running_loop().create_task(self._compactar())
+        return self._tarea
+
+    async def esperar(self) -> None:
+        """Espera a que termine la compactación en curso, si la hay."""
+        if self._tarea is not None:
+            await asyncio.shield(self._tarea)
+
+    async def _compactar(self) -> None:
+        """Pliega los turnos pendientes en el resumen hasta que no quede ninguno."""
+        while self._pendientes:
+            turnos, self._pendientes = self._pendientes, []
+            peticion = (
+                f"RESUMEN ANTERIOR:\n{self.resumen or '(vacío)'}\n\n"
+                f"NUEVOS MENSAJES:\n{transcribir_turnos(turnos)}"
+            )
+            reservados = 0
+            try:
+                reservados = await reservar(
+                    estimar_tokens_texto(PROMPT_RESUMEN, peticion) + AJUSTES_RESUMEN["max_tokens"]
+                )
+                r = await _agente_resumen().run(
+                    peticion,
+                    model=self.configuracion.configuracion_modelo(),
+                    model_settings=ModelSettings(
+                        max_tokens=AJUSTES_RESUMEN["max_tokens"],
+                        temperature=AJUSTES_RESUMEN["temperatura"],
+                    ),
+                )
+            except Exception:
+                liquidar(reservados, None)
+                # Se reintenta en el siguiente turno; mientras, el resumen anterior sigue válido.
+                logger.warning(
+                    "Falló el resumen de %d turnos; se reintentará.", len(turnos), exc_info=True
+                )
+                self._pendientes[:0] = turnos
+                del self._pendientes[: -self.max_pendientes]
+                return
+            self.resumen = r.output.strip()
+            liquidar(reservados, r.usage())
+            registrar_uso_total(calcular_uso(r.usage(), self.configuracion.modelo))
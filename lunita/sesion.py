@@ -1,16 +1,33 @@
+import asyncio
+import logging
 from datetime import datetime
-from typing import Optional, TypedDict
+from typing import AsyncIterator, NotRequired, Optional, TypedDict
 
-from .cliente import Cliente
+from .almacen import AlmacenSesiones, EstadoSesion
+from .cliente import Cliente, fragmento_emocion
 from .configuracion import ConfigurarEstrellas
-from .emocional.motor import MotorEmocional
+from .emocional.motor import MotorEmocional, RespuestaMotorEmocional
+from .horoscopo import CacheHoroscopos, detectar_signo
+from .instrumentacion import etapa, medir_turno
 from .memoria import MemoriaDia
+from .niveles import NivelVerbosidad
+from .resiliencia import RutaRespuesta
+from .uso import UsoAcumulado, UsoTurno
+
+# Tamaño aproximado de una sesión vacía: motor emocional, recuerdo y cliente.
+BYTES_BASE_SESION = 4096
+
+logger = logging.getLogger(__name__)
 
 
 class RespuestaSesion(TypedDict):
     texto: str
     modelo: str
     fecha: datetime
+    uso: Optional[UsoTurno]
+    ruta: Optional[RutaRespuesta]
+    nivel: Optional[NivelVerbosidad]
+    tiempos: NotRequired[dict[str, float]]
 
 
 class ConsultasSesion(TypedDict):
@@ -27,11 +44,36 @@ class Sesion:
 
     Atributes
         configuracion: ConfigurarEstrellas
-            Instancia de configuración para la sesión.
+            Instancia de configuración para la sesión. Si no se pasa ni `configuracion` ni
+            `inquilino`, se usa la configuración global.
+        id_sesion: Optional[str]
+            Identificador con el que se guarda la sesión en `almacen`. Si ya existe ahí, la
+            sesión retoma su historial y su estado emocional en el primer mensaje.
+        horoscopos: Optional[CacheHoroscopos]
+            Horóscopos del día ya generados. Las peticiones simples de horóscopo ("mi horóscopo
+            de Nova") se responden desde ahí sin llamar al modelo.
+        ultimos_tiempos: Optional[dict[str, float]]
+            Desglose de tiempos del último `predecir_stream` (con `configurar_tiempos(True)`);
+            `predecir` lo entrega en `tiempos` de su respuesta.
     """
 
-    def __init__(self):
-        self.configuracion = ConfigurarEstrellas.get_instance()
+    def __init__(
+        self,
+        configuracion: Optional[ConfigurarEstrellas] = None,
+        inquilino: Optional[str] = None,
+        id_sesion: Optional[str] = None,
+        almacen: Optional[AlmacenSesiones] = None,
+        horoscopos: Optional[CacheHoroscopos] = None,
+    ):
+        if almacen is not None and id_sesion is None:
+            raise ValueError("Para usar un almacén la sesión necesita un id_sesion.")
+
+        self.configuracion = ConfigurarEstrellas.resolver(configuracion, inquilino)
+        self.id_sesion = id_sesion
+        self._almacen = almacen
+        self.horoscopos = horoscopos
+        self.ultimos_tiempos: Optional[dict[str, float]] = None
+        self._rehidratada = almacen is None
         self._consultas: list[ConsultasSesion] = []
         # Se ve feo pero es necesario para inicializar la emoción correcta jaja
         if self.configuracion.configuracion_vidente.vidente == "lunita":
@@ -39,10 +81,12 @@ class Sesion:
         elif self.configuracion.configuracion_vidente.vidente == "estrella":
             self._recuerdo = MemoriaDia("data/recuerdos_estrella.json")
 
-        self._emociones = MotorEmocional()
+        self._emociones = MotorEmocional(analizar=self.configuracion.analizar_emociones)
+        self._analisis: Optional[asyncio.Task] = None
 
         self._cliente = Cliente(
             emocion=self._recuerdo.obtener_para_prompt(),
+            configuracion=self.configuracion,
         )
 
     async def predecir(self, pregunta: str) -> RespuestaSesion:
@@ -55,25 +99,222 @@ class Sesion:
             pregunta: La pregunta o mensaje del usuario.
 
         Returns:
-            Un diccionario que contiene la respuesta de la IA, el modelo utilizado y la fecha de la respuesta.
+            Un diccionario que contiene la respuesta de la IA, el modelo utilizado, la fecha de la
+            respuesta, el uso de tokens y peticiones del turno (ver `uso`) y el camino que
+            respondió (`ruta`: modelo principal, reintento, respaldo, horóscopo o error) con su
+            nivel de verbosidad (`nivel`). Con
+            `configurar_tiempos(True)` incluye también `tiempos`, los milisegundos de cada etapa
+            del turno (ver `instrumentacion`).
+        """
+
+        with medir_turno() as tiempos, etapa("turno"):
+            mensaje = await self._preparar_turno(pregunta)
+            texto = self._horoscopo_del_dia(mensaje)
+            if texto is None:
+                texto = await self._cliente.preguntar(mensaje)
+            self._persistir_turno()
+
+        respuesta: RespuestaSesion = {
+            "texto": texto,
+            "modelo": self._cliente.ultimo_modelo or self.configuracion.modelo,
+            "fecha": datetime.now(),
+            "uso": self._cliente.ultimo_uso,
+            "ruta": self._cliente.ultima_ruta,
+            "nivel": self._cliente.ultimo_nivel,
+        }
+        if tiempos is not None:
+            respuesta["tiempos"] = tiempos
+        return respuesta
+
+    async def predecir_stream(self, pregunta: str) -> AsyncIterator[str]:
+        """Realiza una predicción y entrega la respuesta conforme se genera
+
+        Igual que `predecir`, pero devuelve los fragmentos de texto en cuanto llegan del modelo,
+        para mostrar algo al usuario desde el primer token. El historial se guarda al terminar.
+        El turno se mide igual que en `predecir` (etapa "turno"); el desglose de tiempos queda en
+        `ultimos_tiempos`.
+
+        Args:
+            pregunta: La pregunta o mensaje del usuario.
+
+        Yields:
+            Cada nuevo fragmento de la respuesta.
+        """
+        with medir_turno() as tiempos, etapa("turno"):
+            mensaje = await self._preparar_turno(pregunta)
+            texto = self._horoscopo_del_dia(mensaje)
+            if texto is not None:
+                yield texto
+            else:
+                async for fragmento in self._cliente.preguntar_stream(mensaje):
+                    yield fragmento
+            self._persistir_turno()
+        self.ultimos_tiempos = tiempos
+
+    def _horoscopo_del_dia(self, mensaje: str) -> Optional[str]:
+        """Si el mensaje es una petición simple de horóscopo ya generado, lo responde desde el
+        cache y guarda el turno en el historial.
+
+        Args:
+            mensaje: El mensaje del usuario.
+
+        Returns:
+            El horóscopo, o `None` si hay que preguntarle al modelo.
         """
+        if self.horoscopos is None:
+            return None
+
+        signo = detectar_signo(mensaje)
+        if signo is None:
+            return None
 
-        resultado_motor = self._emociones.procesar_mensaje_usuario(pregunta)
-        instrucciones_emocion = "\n".join(resultado_motor["instrucciones_asistente"])
+        texto = self.horoscopos.obtener(self.configuracion.configuracion_vidente.vidente, signo)
+        if texto is None:
+            self.horoscopos.programar()
+            return None
 
-        nueva_instruccion = (
-            f"(Tu estado emocional es: {self._emociones.emocion_actual_asistente})\n"
+        self._cliente.registrar_respuesta_local(mensaje, texto)
+        return texto
+
+    async def _preparar_turno(self, pregunta: str) -> str:
+        """Actualiza el estado emocional con el mensaje del usuario y arma el mensaje a enviar.
+
+        El recuerdo del día y el estado emocional se le pasan al cliente, que los agrega al final
+        del mensaje para no romper el prefijo estable del prompt. Con `emocion_diferida`, el
+        análisis del mensaje corre en segundo plano y, si no termina dentro de la gracia, el
+        turno sale con el estado emocional que dejó el mensaje anterior.
+
+        Args:
+            pregunta: La pregunta o mensaje del usuario.
+
+        Returns:
+            El mensaje del usuario.
+        """
+        self._rehidratar()
+
+        if self.configuracion.emocion_diferida is not None and self._emociones.analizar:
+            self._analisis = asyncio.ensure_future(self._analizar(pregunta, self._analisis))
+            with etapa("espera_emocion"):
+                await asyncio.wait({self._analisis}, timeout=self.configuracion.emocion_diferida)
+            instrucciones = self._emociones.instrucciones_actuales
+        else:
+            with etapa("motor_emocional"):
+                resultado_motor = await self._emociones.procesar_mensaje_usuario_async(pregunta)
+            instrucciones = resultado_motor["instrucciones_asistente"]
+
+        self._cliente.actualizar_emocion(
+            f"{self._recuerdo.obtener_recuerdo_completo()}\n"
+            + fragmento_emocion(self._emociones.emocion_actual_asistente, tuple(instrucciones))
         )
 
-        prompt_emociones = f"{self._recuerdo.obtener_recuerdo_completo()}\nEMOCIONES ACTUALES (Ajusta tus respuestas a esta emociones a tus respuestas): {instrucciones_emocion}"
-        self._cliente.actualizar_emocion(prompt_emociones)
+        return pregunta
+
+    async def _analizar(
+        self, pregunta: str, anterior: Optional[asyncio.Task]
+    ) -> RespuestaMotorEmocional:
+        """Analiza la vibra del mensaje en segundo plano, después del análisis anterior para que
+        el estado emocional avance en el orden de los mensajes."""
+        if anterior is not None:
+            try:
+                await anterior
+            except Exception:
+                # Un análisis fallido solo deja el estado emocional como estaba.
+                logger.warning(
+                    "Falló el análisis emocional de la sesión %s.", self.id_sesion, exc_info=True
+                )
+        with etapa("motor_emocional"):
+            return await self._emociones.procesar_mensaje_usuario_async(pregunta)
+
+    def _rehidratar(self) -> None:
+        """Retoma el historial y el estado emocional guardados, la primera vez que se usa."""
+        if self._rehidratada:
+            return
+        self._rehidratada = True
+
+        with etapa("almacen_carga"):
+            estado = self._almacen.cargar_estado(self.id_sesion)  # type: ignore
+            if estado is None:
+                return
+
+            self._emociones.restaurar_estado(estado["motor"])
+            self._recuerdo.recuerdo_actual = estado["recuerdo"]
+            self._cliente.actualizar_emocion(estado["emocion_prompt"])
+            if self.configuracion.historial:
+                self._cliente.restaurar_historial(
+                    self._almacen.cargar_mensajes(  # type: ignore
+                        self.id_sesion,  # type: ignore
+                        max_turnos=self._cliente.max_turnos_historial,
+                    ),
+                    resumen=estado["resumen"],
+                )
 
+    def exportar_estado(self) -> EstadoSesion:
+        """Devuelve el estado emocional de la sesión, listo para serializar.
+
+        Returns:
+            El estado del motor emocional, el recuerdo del día, la emoción del prompt y el
+            resumen del historial.
+        """
         return {
-            "texto": await self._cliente.preguntar(nueva_instruccion + pregunta),
-            "modelo": self.configuracion.modelo,
-            "fecha": datetime.now(),
+            "motor": self._emociones.exportar_estado(),
+            "recuerdo": self._recuerdo.recuerdo_actual,
+            "emocion_prompt": self._cliente.emocion,
+            "resumen": self._cliente.resumen,
         }
 
+    def _persistir_turno(self) -> None:
+        """Agrega al almacén los mensajes del último turno y el estado emocional actual."""
+        if self._almacen is None:
+            return
+
+        with etapa("almacen_guardado"):
+            if self.configuracion.historial:
+                self._almacen.agregar_mensajes(
+                    self.id_sesion,  # type: ignore
+                    self._cliente.ultimos_mensajes,
+                )
+            self._almacen.guardar_estado(self.id_sesion, self.exportar_estado())  # type: ignore
+
+    def uso(self) -> UsoAcumulado:
+        """Devuelve los tokens, peticiones y costo acumulados de la sesión.
+
+        Returns:
+            UsoAcumulado: Los totales de todos los turnos de la sesión.
+        """
+        return self._cliente.uso.totales()
+
+    def memoria_estimada(self) -> int:
+        """Estima los bytes que ocupa la sesión, dominados por el historial de mensajes.
+
+        Returns:
+            Bytes estimados.
+        """
+        return BYTES_BASE_SESION + self._cliente.memoria_estimada()
+
+    async def aclose(self) -> None:
+        """Termina el trabajo pendiente de la sesión.
+
+        Espera el análisis emocional diferido y el resumen en segundo plano, si los hay, y con
+        almacén guarda el estado final (emoción y resumen). No cierra el pool HTTP: es de la
+        configuración y lo comparten todas sus sesiones, así que lo cierra su dueño con
+        `ConfigurarEstrellas.aclose()`.
+        """
+        if self._analisis is not None:
+            await asyncio.gather(self._analisis, return_exceptions=True)
+            self._analisis = None
+        await self._cliente.aclose()
+
+        # Una sesión que nunca se retomó no tiene nada propio: guardarla pisaría lo guardado.
+        if self._almacen is not None and self._rehidratada:
+            with etapa("almacen_guardado"):
+                self._almacen.guardar_estado(self.id_sesion, self.exportar_estado())  # type: ignore
+
+    async def __aenter__(self) -> "Sesion":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     def cambiar_humor(self) -> str:
         """
         Cambia la emoción actual de la vidente. Todos podemos cambiar de humor incluso Lunita.
@@ -0,0 +1,159 @@
+from threading import Lock
+from typing import Optional, TypedDict
+
+from pydantic_ai.usage import RunUsage
+
+
+class PreciosModelo(TypedDict):
+    entrada: float
+    salida: float
+    cache: float
+
+
+class UsoTurno(TypedDict):
+    peticiones: int
+    llamadas_herramientas: int
+    tokens_entrada: int
+    tokens_salida: int
+    tokens_cache: int
+    proporcion_cache: float
+    costo: Optional[float]
+
+
+class UsoAcumulado(UsoTurno):
+    turnos: int
+
+
+# Precios por millón de tokens, por nombre de modelo (el `modelo` de ConfigurarEstrellas).
+_precios: dict[str, PreciosModelo] = {}
+
+
+def configurar_precios(precios: Optional[dict[str, PreciosModelo]]) -> None:
+    """Define los precios por millón de tokens de cada modelo, para estimar el costo.
+
+    Los tokens leídos del cache del proveedor se cobran con el precio `cache` en lugar del de
+    `entrada`. Con `None` se borran los precios y el costo queda en `None`. Ejemplo de uso:
+
+        configurar_precios({"deepseek-chat": {"entrada": 0.27, "salida": 1.10, "cache": 0.07}})
+
+    Args:
+        precios (Optional[dict[str, PreciosModelo]]): Precios por nombre de modelo.
+    """
+    _precios.clear()
+    if precios:
+        _precios.update(precios)
+
+
+def _proporcion(tokens_cache: int, tokens_entrada: int) -> float:
+    """Fracción de los tokens de entrada que el proveedor leyó de su cache del prefijo."""
+    return tokens_cache / tokens_entrada if tokens_entrada else 0.0
+
+
+def calcular_uso(uso: RunUsage, modelo: str) -> UsoTurno:
+    """Convierte el uso de una corrida de pydantic-ai en un `UsoTurno`.
+
+    Args:
+        uso (RunUsage): El resultado de `resultado.usage()`.
+        modelo (str): Nombre del modelo, para buscar su precio.
+
+    Returns:
+        UsoTurno: Peticiones, llamadas a herramientas, tokens, proporción de tokens de entrada
+        leídos del cache y costo estimado del turno.
+    """
+    costo = None
+    precios = _precios.get(modelo)
+    if precios is not None:
+        sin_cache = uso.input_tokens - uso.cache_read_tokens
+        costo = (
+            sin_cache * precios["entrada"]
+            + uso.cache_read_tokens * precios["cache"]
+            + uso.output_tokens * precios["salida"]
+        ) / 1_000_000
+
+    return {
+        "peticiones": uso.requests,
+        "llamadas_herramientas": uso.tool_calls,
+        "tokens_entrada": uso.input_tokens,
+        "tokens_salida": uso.output_tokens,
+        "tokens_cache": uso.cache_read_tokens,
+        "proporcion_cache": _proporcion(uso.cache_read_tokens, uso.input_tokens),
+        "costo": costo,
+    }
+
+
+class ContadorUso:
+    """Acumula el uso de tokens y peticiones de varios turnos.
+
+    Cada `Cliente` (y por lo tanto cada sesión) tiene el suyo, y todo se suma además al
+    contador del proceso (ver `obtener_uso_total`). Ejemplo de uso:
+
+        print(sesion.uso())         # el acumulado de la sesión
+        print(obtener_uso_total())  # el acumulado del proceso
+    """
+
+    def __init__(self) -> None:
+        self._candado = Lock()
+        self.reiniciar()
+
+    def registrar(self, uso: UsoTurno) -> None:
+        """Suma el uso de un turno.
+
+        Args:
+            uso (UsoTurno): El uso del turno.
+        """
+        with self._candado:
+            self._turnos += 1
+            self._peticiones += uso["peticiones"]
+            self._llamadas_herramientas += uso["llamadas_herramientas"]
+            self._tokens_entrada += uso["tokens_entrada"]
+            self._tokens_salida += uso["tokens_salida"]
+            self._tokens_cache += uso["tokens_cache"]
+            if uso["costo"] is not None:
+                self._costo = (self._costo or 0.0) + uso["costo"]
+
+    def reiniciar(self) -> None:
+        """Pone todos los contadores en cero."""
+        with self._candado:
+            self._turnos = 0
+            self._peticiones = 0
+            self._llamadas_herramientas = 0
+            self._tokens_entrada = 0
+            self._tokens_salida = 0
+            self._tokens_cache = 0
+            self._costo: Optional[float] = None
+
+    def totales(self) -> UsoAcumulado:
+        """Devuelve el acumulado, listo para exportar como JSON o a un sistema de métricas.
+
+        Returns:
+            UsoAcumulado: Turnos, peticiones, llamadas a herramientas, tokens y costo.
+        """
+        with self._candado:
+            return {
+                "turnos": self._turnos,
+                "peticiones": self._peticiones,
+                "llamadas_herramientas": self._llamadas_herramientas,
+                "tokens_entrada": self._tokens_entrada,
+                "tokens_salida": self._tokens_salida,
+                "tokens_cache": self._tokens_cache,
+                "proporcion_cache": _proporcion(self._tokens_cache, self._tokens_entrada),
+                "costo": self._costo,
+            }
+
+
+_total = ContadorUso()
+
+
+def registrar_uso_total(uso: UsoTurno) -> None:
+    """Suma el uso de un turno al contador del proceso."""
+    _total.registrar(uso)
+
+
+def obtener_uso_total() -> UsoAcumulado:
+    """Devuelve el uso acumulado de todas las sesiones (y resúmenes) del proceso."""
+    return _total.totales()
+
+
+def reiniciar_uso_total() -> None:
+    """Pone en cero el contador del proceso (por ejemplo, después de exportarlo)."""
+    _total.reiniciar()
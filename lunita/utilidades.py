@@ -1,7 +1,152 @@
 import json
-from functools import lru_cache
+from bisect import bisect_right
 from importlib.resources import files
-from typing import Any
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, NamedTuple, Optional
+
+ARCHIVOS_DATOS = (
+    "data/cartas.json",
+    "data/signos.json",
+    "data/emociones_lunita.json",
+    "data/emociones_entrada_lunita.json",
+    "data/recuerdos_lunita.json",
+    "data/recuerdos_estrella.json",
+)
+
+# Fecha (mes * 100 + día) en la que empieza cada signo de `data/signos.json`, en orden.
+CORTES_SIGNOS = (120, 219, 321, 420, 521, 621, 723, 823, 923, 1023, 1122, 1222)
+
+
+def congelar(datos: Any) -> Any:
+    """Convierte el resultado de `json.load` en una estructura inmutable.
+
+    Los diccionarios pasan a `MappingProxyType` y las listas a tuplas, recursivamente, así los
+    datos compartidos entre sesiones no se pueden modificar por accidente.
+
+    Args:
+        datos (Any): Datos decodificados de un JSON.
+
+    Returns:
+        Any: Los mismos datos, inmutables.
+    """
+    if isinstance(datos, dict):
+        return MappingProxyType({clave: congelar(valor) for clave, valor in datos.items()})
+    if isinstance(datos, list):
+        return tuple(congelar(valor) for valor in datos)
+    return datos
+
+
+class TablaSignos(NamedTuple):
+    """Signos zodiacales indexados por fecha de inicio y por nombre."""
+
+    cortes: tuple[int, ...]
+    signos: tuple[Mapping[str, str], ...]
+    por_nombre: Mapping[str, Mapping[str, str]]
+
+    def buscar(self, dia: int, mes: int) -> Mapping[str, str]:
+        """Devuelve el signo de una fecha de nacimiento."""
+        indice = bisect_right(self.cortes, dia + mes * 100) - 1
+        return self.signos[indice] if indice >= 0 else self.signos[-1]
+
+
+class TablaEmociones(NamedTuple):
+    """Instrucciones por emoción, con las claves ya listas para elegir al azar."""
+
+    claves: tuple[str, ...]
+    instrucciones: Mapping[str, tuple[str, ...]]
+
+
+class RegistroDatos:
+    """Registro compartido de los archivos de `lunita/data` para todo el proceso.
+
+    Cada archivo se lee y decodifica una sola vez y se guarda inmutable (ver `congelar`), así
+    las herramientas y la creación de sesiones no tocan el disco. Además de los datos crudos
+    guarda tablas ya indexadas para los accesos más frecuentes. Ejemplo de uso:
+
+        RegistroDatos.precargar()
+        signo = RegistroDatos.signos().buscar(dia=14, mes=2)
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe dentro del paquete.
+    """
+
+    _datos: dict[str, Any] = {}
+    _emociones: dict[str, TablaEmociones] = {}
+    _signos: Optional[TablaSignos] = None
+    _candado = Lock()
+
+    @classmethod
+    def obtener(cls, ruta: str) -> Any:
+        """Obtiene el contenido inmutable de un archivo, leyéndolo si aún no se leyó.
+
+        Args:
+            ruta (str): Ruta del archivo relativa al paquete (por ejemplo "data/cartas.json").
+
+        Returns:
+            Any: Los datos del archivo, con tuplas en lugar de listas y mapeos de solo lectura.
+        """
+        datos = cls._datos.get(ruta)
+        if datos is not None:
+            return datos
+
+        with cls._candado:
+            datos = cls._datos.get(ruta)
+            if datos is None:
+                with files("lunita").joinpath(ruta).open("r", encoding="utf-8") as f:
+                    datos = congelar(json.load(f))
+                cls._datos[ruta] = datos
+        return datos
+
+    @classmethod
+    def signos(cls) -> TablaSignos:
+        """Obtiene la tabla de signos zodiacales."""
+        if cls._signos is None:
+            signos = cls.obtener("data/signos.json")
+            cls._signos = TablaSignos(
+                cortes=CORTES_SIGNOS,
+                signos=signos,
+                por_nombre=MappingProxyType({signo["Signo"]: signo for signo in signos}),
+            )
+        return cls._signos
+
+    @classmethod
+    def emociones(cls, ruta: str) -> TablaEmociones:
+        """Obtiene la tabla de instrucciones por emoción de un archivo de emociones.
+
+        Args:
+            ruta (str): Ruta del archivo de emociones relativa al paquete.
+
+        Returns:
+            TablaEmociones: Las claves de emoción y sus instrucciones.
+        """
+        tabla = cls._emociones.get(ruta)
+        if tabla is None:
+            instrucciones = cls.obtener(ruta)
+            tabla = TablaEmociones(claves=tuple(instrucciones), instrucciones=instrucciones)
+            cls._emociones[ruta] = tabla
+        return tabla
+
+    @classmethod
+    def precargar(cls, rutas: Iterable[str] = ARCHIVOS_DATOS) -> None:
+        """Lee de antemano los archivos de datos, para no pagar la lectura en la primera sesión.
+
+        Args:
+            rutas (Iterable[str]): Archivos a leer. Por defecto, todos los del paquete.
+        """
+        for ruta in rutas:
+            cls.obtener(ruta)
+        cls.signos()
+
+    @classmethod
+    def cargados(cls) -> list[str]:
+        """Devuelve las rutas de los archivos ya leídos."""
+        return list(cls._datos)
+
+
+def precargar_datos() -> None:
+    """Lee todos los archivos de datos del paquete una sola vez para todo el proceso."""
+    RegistroDatos.precargar()
 
 
 class CargadorDatos:
@@ -15,7 +160,9 @@ class CargadorDatos:
 
     DESCRIPTION
         Esta clase proporciona una funcionalidad simple para leer un archivo JSON desde
-        una ruta específica y devolver su contenido como un objeto de Python.
+        una ruta específica y devolver su contenido como un objeto de Python. El archivo se lee
+        una sola vez por proceso a través de `RegistroDatos`, sin importar cuántas instancias
+        se creen.
     """
 
     def __init__(self, ruta: str) -> None:
@@ -27,20 +174,15 @@ class CargadorDatos:
         """
         self.ruta = ruta
 
-    @lru_cache(maxsize=None)
     def cargar_datos(self) -> Any:
         """Lee y decodifica el archivo JSON.
 
         RETURN VALUES
-            dict
-                Un diccionario que representa el contenido del archivo JSON.
+            Mapping | tuple
+                El contenido inmutable del archivo JSON, compartido por todo el proceso.
 
         ERRORS
             Puede lanzar `FileNotFoundError` si la ruta no es válida o `json.JSONDecodeError`
             si el archivo no contiene un JSON válido.
         """
-        json_path = files("lunita").joinpath(self.ruta)
-
-        with json_path.open("r", encoding="utf-8") as f:
-            datos = json.load(f)
-        return datos
+        return RegistroDatos.obtener(self.ruta)
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from lunita import ConfigurarEstrellas, ConfigurarVidente
+
+
+@pytest.fixture
+def crear_configuracion():
+    """Fábrica de configuraciones independientes (no la global) con un `FunctionModel`.
+
+    `ConfigurarEstrellas(...)` devuelve siempre la misma instancia, así que cada prueba crea la
+    suya con `ConfigurarEstrellas.crear`. Recibe el modelo o las funciones que lo responden:
+
+        configuracion = crear_configuracion(responder, stream_function=responder_stream)
+        configuracion = crear_configuracion(FunctionModel(...), historial=True)
+    """
+
+    def crear(modelo, stream_function=None, vidente="lunita", **opciones):
+        if not isinstance(modelo, FunctionModel):
+            modelo = FunctionModel(modelo, stream_function=stream_function)
+        opciones.setdefault("analizar_emociones", False)
+        return ConfigurarEstrellas.crear(
+            ConfigurarVidente(vidente),
+            "modelo",
+            "token",
+            modelo_personalizado=modelo,
+            **opciones,
+        )
+
+    return crear
+
+
+@pytest.fixture
+def modelo_con_resumen():
+    """Responde turnos largos (para que el historial se recorte) y, con retraso, los resúmenes
+    ("RESUMEN-1", "RESUMEN-2", ...), así quedan pendientes al cerrar la sesión."""
+    resumenes = []
+
+    async def responder(mensajes, info):
+        peticion = mensajes[-1].parts[-1].content
+        if isinstance(peticion, str) and peticion.startswith("RESUMEN ANTERIOR"):
+            await asyncio.sleep(0.05)
+            resumenes.append(peticion)
+            return ModelResponse(parts=[TextPart(content=f"RESUMEN-{len(resumenes)}")])
+        return ModelResponse(parts=[TextPart(content="Las cartas hablan. " * 300)])
+
+    return FunctionModel(responder)
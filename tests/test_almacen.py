@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+from lunita import Sesion
+from lunita.almacen import AlmacenSQLite
+
+ESTADO = {
+    "motor": {
+        "emocion_asistente": "feliz",
+        "emocion_usuario": "joy",
+        "instrucciones_asistente": ["Sé cálida."],
+    },
+    "recuerdo": {"situacion": "Vi una estrella fugaz.", "emociones": ["feliz"]},
+    "emocion_prompt": "feliz",
+    "resumen": "La usuaria preguntó por el amor.",
+}
+
+
+def turno(texto):
+    return [
+        ModelRequest(parts=[UserPromptPart(content=texto)]),
+        ModelResponse(parts=[TextPart(content=f"Respuesta a {texto}")]),
+    ]
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    almacen = AlmacenSQLite(str(tmp_path / "sesiones.db"))
+    yield almacen
+    almacen.cerrar()
+
+
+def test_mensajes_ida_y_vuelta(almacen):
+    for i in range(3):
+        almacen.agregar_mensajes("s1", turno(f"pregunta {i}"))
+    almacen.agregar_mensajes("s2", turno("otra sesión"))
+
+    mensajes = almacen.cargar_mensajes("s1")
+    assert len(mensajes) == 6
+    assert mensajes[0].parts[0].content == "pregunta 0"
+    assert mensajes[-1].parts[0].content == "Respuesta a pregunta 2"
+
+    ultimos = almacen.cargar_mensajes("s1", max_turnos=1)
+    assert [m.parts[0].content for m in ultimos] == ["pregunta 2", "Respuesta a pregunta 2"]
+
+
+def test_estado_ida_y_vuelta(almacen):
+    assert almacen.cargar_estado("s1") is None
+    almacen.guardar_estado("s1", ESTADO)
+    assert almacen.cargar_estado("s1") == ESTADO
+
+    almacen.guardar_estado("s1", {**ESTADO, "resumen": "Nuevo resumen."})
+    assert almacen.cargar_estado("s1")["resumen"] == "Nuevo resumen."
+
+
+def test_eliminar_borra_mensajes_y_estado(almacen):
+    almacen.agregar_mensajes("s1", turno("hola"))
+    almacen.guardar_estado("s1", ESTADO)
+    almacen.eliminar("s1")
+
+    assert almacen.cargar_mensajes("s1") == []
+    assert almacen.cargar_estado("s1") is None
+    assert almacen.metricas()["guardados"] == 2
+
+
+def test_persiste_entre_conexiones(tmp_path):
+    ruta = str(tmp_path / "sesiones.db")
+    almacen = AlmacenSQLite(ruta)
+    almacen.agregar_mensajes("s1", turno("hola"))
+    almacen.guardar_estado("s1", ESTADO)
+    almacen.cerrar()
+
+    almacen = AlmacenSQLite(ruta)
+    assert len(almacen.cargar_mensajes("s1")) == 2
+    assert almacen.cargar_estado("s1") == ESTADO
+    almacen.cerrar()
+
+
+def test_sesion_retoma_historial_y_estado(almacen, crear_configuracion):
+    vistos = []
+
+    async def responder(mensajes, info):
+        vistos.append(len(mensajes))
+        return ModelResponse(parts=[TextPart(content="Las cartas hablan.")])
+
+    configuracion = crear_configuracion(responder, historial=True)
+
+    async def conversar():
+        primera = Sesion(configuracion=configuracion, id_sesion="s1", almacen=almacen)
+        await primera.predecir("¿Qué me dicen las cartas?")
+        estado = primera.exportar_estado()
+        await primera.aclose()
+
+        segunda = Sesion(configuracion=configuracion, id_sesion="s1", almacen=almacen)
+        await segunda.predecir("¿Y el amor?")
+        return estado, segunda.exportar_estado()
+
+    antes, despues = asyncio.run(conversar())
+
+    assert vistos == [1, 3]  # el segundo turno llega con la petición y respuesta anteriores
+    assert despues["recuerdo"] == antes["recuerdo"]
+    assert len(almacen.cargar_mensajes("s1")) == 4
+
+
+def test_cerrar_guarda_el_resumen_pendiente(almacen, crear_configuracion, modelo_con_resumen):
+    configuracion = crear_configuracion(
+        modelo_con_resumen, historial=True, resumir_historial=True
+    )
+
+    async def conversar():
+        primera = Sesion(configuracion=configuracion, id_sesion="s1", almacen=almacen)
+        for i in range(4):
+            await primera.predecir(f"Pregunta {i}")
+        await primera.aclose()
+
+        segunda = Sesion(configuracion=configuracion, id_sesion="s1", almacen=almacen)
+        segunda._rehidratar()
+        return primera, segunda
+
+    primera, segunda = asyncio.run(conversar())
+    resumen = primera.exportar_estado()["resumen"]
+
+    assert resumen.startswith("RESUMEN-")
+    assert almacen.cargar_estado("s1")["resumen"] == resumen
+    assert segunda.exportar_estado()["resumen"] == resumen
+    assert segunda.memoria_estimada() == primera.memoria_estimada()
+
+
+def test_cerrar_sin_haberla_usado_no_pisa_lo_guardado(
+    almacen, crear_configuracion, modelo_con_resumen
+):
+    almacen.guardar_estado("s1", ESTADO)
+    configuracion = crear_configuracion(modelo_con_resumen)
+    sesion = Sesion(configuracion=configuracion, id_sesion="s1", almacen=almacen)
+
+    asyncio.run(sesion.aclose())
+
+    assert almacen.cargar_estado("s1") == ESTADO
@@ -0,0 +1,41 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PIPELINE = Path(__file__).resolve().parent.parent / "benchmarks" / "pipeline.py"
+
+ETAPAS = {
+    "sesion_construccion",
+    "motor_procesar_mensaje",
+    "cliente_crear_agente",
+    "herramienta_tarot",
+    "herramienta_signo",
+    "predecir_sin_herramientas",
+    "predecir_con_herramientas",
+}
+
+
+def correr_pipeline(*argumentos):
+    subprocess.run(
+        [sys.executable, str(PIPELINE), "--repeticiones", "2", "--muestras-memoria", "1"]
+        + list(argumentos),
+        check=True,
+        capture_output=True,
+        timeout=120,
+    )
+
+
+def test_el_pipeline_corre_sin_red_y_se_compara_con_una_base(tmp_path):
+    base = tmp_path / "base.json"
+    actual = tmp_path / "actual.json"
+
+    correr_pipeline("--salida", str(base))
+    correr_pipeline("--salida", str(actual), "--comparar", str(base))
+
+    reporte = json.loads(actual.read_text(encoding="utf-8"))
+    assert reporte["backend"] == "falso"
+    assert set(reporte["resultados"]) == ETAPAS
+    assert all(r["repeticiones"] == 2 for r in reporte["resultados"].values())
+    assert set(reporte["razon_vs_base"]) <= ETAPAS
+    assert all(razon > 0 for razon in reporte["razon_vs_base"].values())
@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+
+from lunita.emocional import inferencia
+from lunita.emocional.cache import CacheVibras, normalizar_mensaje
+from lunita.emocional.registro import BackendAnalizadores, configurar_backend
+
+
+class BackendContador(BackendAnalizadores):
+    nombre = "contador"
+
+    def __init__(self):
+        self.llamadas = 0
+
+    def crear(self, task, lang):
+        salida = "POS" if task == "sentiment" else "joy"
+
+        def predict(texto):
+            self.llamadas += 1
+            return SimpleNamespace(output=salida, probas={salida: 1.0})
+
+        return SimpleNamespace(predict=predict)
+
+
+@pytest.fixture
+def backend():
+    backend = BackendContador()
+    ruta_rapida = inferencia.obtener_ruta_rapida()
+    cache = inferencia.obtener_cache()
+    configurar_backend(backend)
+    inferencia.configurar_ruta_rapida(None)
+    inferencia.configurar_cache(CacheVibras())
+    yield backend
+    configurar_backend(None)
+    inferencia.configurar_ruta_rapida(ruta_rapida)
+    inferencia.configurar_cache(cache)
+
+
+@pytest.mark.parametrize(
+    "mensaje, esperado",
+    [
+        ("Holaaa   Lunita", "hola lunita"),
+        ("¿Qué dicen las CARTAS?", "¿que dicen las cartas?"),
+        ("  corazón ", "corazon"),
+    ],
+)
+def test_normalizar_mensaje(mensaje, esperado):
+    assert normalizar_mensaje(mensaje) == esperado
+
+
+def test_mensajes_casi_iguales_no_vuelven_a_los_modelos(backend):
+    primero = inferencia.inferir_vibra("Holaaa Lunita, estoy feliz")
+    llamadas = backend.llamadas
+    segundo = inferencia.inferir_vibra("hola lunita,   estoy FELIZ")
+
+    assert primero == segundo == {"sentimiento": "POS", "emocion": "joy"}
+    assert llamadas == 2  # sentimiento y emoción
+    assert backend.llamadas == llamadas
+    metricas = inferencia.obtener_cache().metricas()
+    assert (metricas["aciertos"], metricas["fallos"]) == (1, 1)
+
+
+def test_el_resultado_guardado_no_se_puede_modificar_desde_afuera():
+    cache = CacheVibras()
+    cache.guardar("hola", {"sentimiento": "NEU", "emocion": None})
+    cache.obtener("hola")["sentimiento"] = "NEG"
+    assert cache.obtener("hola") == {"sentimiento": "NEU", "emocion": None}
+
+
+def test_desaloja_el_menos_usado():
+    cache = CacheVibras(capacidad=2)
+    cache.guardar("uno", {"sentimiento": "POS", "emocion": "joy"})
+    cache.guardar("dos", {"sentimiento": "NEG", "emocion": "sadness"})
+    cache.obtener("uno")
+    cache.guardar("tres", {"sentimiento": "NEU", "emocion": None})
+
+    assert cache.obtener("dos") is None
+    assert cache.obtener("uno") is not None
+    assert cache.metricas()["desalojos"] == 1
+
+
+def test_entradas_expiradas_cuentan_como_fallo(monkeypatch):
+    cache = CacheVibras(ttl=10)
+    ahora = [100.0]
+    monkeypatch.setattr("lunita.emocional.cache.monotonic", lambda: ahora[0])
+    cache.guardar("hola", {"sentimiento": "NEU", "emocion": None})
+    ahora[0] += 11
+
+    assert cache.obtener("hola") is None
+    assert cache.metricas()["expirados"] == 1
+
+
+def test_capacidad_invalida():
+    with pytest.raises(ValueError):
+        CacheVibras(capacidad=0)
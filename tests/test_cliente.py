@@ -0,0 +1,50 @@
+import asyncio
+
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from lunita.cliente import Cliente
+
+
+def modelo_que_responde(nombre, vistos):
+    async def responder(mensajes, info):
+        vistos.append((nombre, mensajes[-1].parts[-1].content))
+        return ModelResponse(parts=[TextPart(content=nombre)])
+
+    return FunctionModel(responder, model_name=nombre)
+
+
+def test_un_agente_por_vidente_para_cualquier_modelo(crear_configuracion):
+    vistos = []
+    lunita_a, lunita_b, estrella = (
+        Cliente(
+            emocion="",
+            configuracion=crear_configuracion(modelo_que_responde(nombre, vistos), vidente=vidente),
+        )
+        for nombre, vidente in (("a", "lunita"), ("b", "lunita"), ("c", "estrella"))
+    )
+
+    async def preguntar():
+        return [await cliente.preguntar("hola") for cliente in (lunita_a, lunita_b, estrella)]
+
+    assert asyncio.run(preguntar()) == ["a", "b", "c"]
+    assert lunita_a._agente is lunita_b._agente
+    assert estrella._agente is not lunita_a._agente
+
+
+def test_cambiar_la_emocion_no_recrea_el_agente(crear_configuracion):
+    vistos = []
+    cliente = Cliente(
+        emocion="", configuracion=crear_configuracion(modelo_que_responde("a", vistos))
+    )
+    agente = cliente._agente
+
+    async def conversar():
+        for emocion in ("feliz", "triste"):
+            cliente.actualizar_emocion(f"(Tu estado emocional es: {emocion})")
+            await cliente.preguntar("hola")
+
+    asyncio.run(conversar())
+
+    assert cliente._agente is agente
+    assert "feliz" in vistos[0][1] and "triste" in vistos[1][1]
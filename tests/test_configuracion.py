@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+
+from lunita import ConfigurarEstrellas, ConfigurarVidente, Sesion
+
+
+@pytest.fixture
+def configuracion():
+    configuracion = ConfigurarEstrellas.crear(ConfigurarVidente("lunita"), "deepseek-chat", "token")
+    yield configuracion
+    asyncio.run(configuracion.aclose())
+
+
+def test_el_pool_y_el_modelo_se_reutilizan(configuracion):
+    pool = configuracion.cliente_http()
+    modelo = configuracion.configuracion_modelo()
+
+    assert configuracion.cliente_http() is pool
+    assert configuracion.configuracion_modelo() is modelo
+    assert configuracion.configuracion_modelo("deepseek-reasoner") is not modelo
+
+
+def test_aclose_cierra_el_pool_y_se_recrea_al_volver_a_usarlo(configuracion):
+    pool = configuracion.cliente_http()
+    modelo = configuracion.configuracion_modelo()
+
+    asyncio.run(configuracion.aclose())
+
+    assert pool.is_closed
+    nuevo = configuracion.cliente_http()
+    assert nuevo is not pool and not nuevo.is_closed
+    assert configuracion.configuracion_modelo() is not modelo
+
+
+def test_un_pool_cerrado_por_fuera_tambien_se_recrea(configuracion):
+    pool = configuracion.cliente_http()
+    asyncio.run(pool.aclose())
+
+    assert configuracion.cliente_http() is not pool
+
+
+def test_cada_configuracion_tiene_su_propio_pool(configuracion):
+    otra = ConfigurarEstrellas.crear(ConfigurarVidente("estrella"), "deepseek-chat", "token")
+
+    assert otra.cliente_http() is not configuracion.cliente_http()
+    asyncio.run(otra.aclose())
+
+
+@pytest.fixture
+def inquilinos(crear_configuracion):
+    def responder_como(nombre):
+        async def responder(mensajes, info):
+            return ModelResponse(parts=[TextPart(content=f"Habla {nombre}.")])
+
+        return responder
+
+    creados = {
+        nombre: crear_configuracion(responder_como(nombre), vidente=vidente, inquilino=nombre)
+        for nombre, vidente in (("luna", "lunita"), ("sol", "estrella"))
+    }
+    yield creados
+    for nombre in creados:
+        ConfigurarEstrellas.eliminar_inquilino(nombre)
+
+
+def test_cada_inquilino_responde_con_su_configuracion(inquilinos):
+    async def conversar():
+        luna = Sesion(inquilino="luna")
+        sol = Sesion(inquilino="sol")
+        return await luna.predecir("hola"), await sol.predecir("hola"), luna, sol
+
+    de_luna, de_sol, luna, sol = asyncio.run(conversar())
+
+    assert luna.configuracion is inquilinos["luna"]
+    assert sol.configuracion is inquilinos["sol"]
+    assert de_luna["texto"] == "Habla luna."
+    assert de_sol["texto"] == "Habla sol."
+    assert sol.configuracion.configuracion_vidente is not luna.configuracion.configuracion_vidente
+
+
+def test_resolver_prefiere_la_explicita_y_luego_el_inquilino(inquilinos):
+    assert ConfigurarEstrellas.resolver(inquilinos["sol"], "luna") is inquilinos["sol"]
+    assert ConfigurarEstrellas.resolver(None, "luna") is inquilinos["luna"]
+    assert ConfigurarEstrellas.obtener_inquilino("sol").inquilino == "sol"
+    assert set(ConfigurarEstrellas.inquilinos()) >= {"luna", "sol"}
+
+
+def test_inquilino_desconocido_o_eliminado(inquilinos):
+    with pytest.raises(ValueError):
+        ConfigurarEstrellas.obtener_inquilino("marte")
+
+    assert ConfigurarEstrellas.eliminar_inquilino("sol") is inquilinos["sol"]
+    with pytest.raises(ValueError):
+        Sesion(inquilino="sol")
+
+
+def test_el_modelo_personalizado_no_abre_conexiones(crear_configuracion):
+    async def responder(mensajes, info):
+        return ModelResponse(parts=[TextPart(content="Sin red.")])
+
+    configuracion = crear_configuracion(responder)
+    modelo = configuracion.modelo_personalizado
+
+    respuesta = asyncio.run(Sesion(configuracion=configuracion).predecir("hola"))
+
+    assert configuracion.configuracion_modelo() is modelo
+    assert configuracion.configuracion_modelo("otro") is modelo
+    assert respuesta["texto"] == "Sin red."
+    assert respuesta["modelo"] == "modelo"
+    assert configuracion._cliente_http is None
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+import pytest
+
+from lunita.herramientas import obtener_signo_zodiacal, tarot
+from lunita.utilidades import ARCHIVOS_DATOS, CargadorDatos, RegistroDatos
+
+
+def test_cada_archivo_se_lee_una_sola_vez():
+    datos = RegistroDatos.obtener("data/cartas.json")
+
+    assert CargadorDatos("data/cartas.json").cargar_datos() is datos
+    assert RegistroDatos.obtener("data/cartas.json") is datos
+
+    RegistroDatos.precargar()
+    assert set(ARCHIVOS_DATOS) <= set(RegistroDatos.cargados())
+
+
+def test_los_datos_compartidos_son_inmutables():
+    signos = RegistroDatos.obtener("data/signos.json")
+
+    with pytest.raises(TypeError):
+        signos[0]["Signo"] = "Otro"
+    with pytest.raises(AttributeError):
+        signos.append({})
+
+
+def test_la_tabla_de_signos_coincide_con_el_recorrido_de_cortes():
+    signos = RegistroDatos.obtener("data/signos.json")
+    cortes = [120, 219, 321, 420, 521, 621, 723, 823, 923, 1023, 1122, 1222]
+    dia = date(2024, 1, 1)
+
+    while dia.year == 2024:
+        fecha = dia.month * 100 + dia.day
+        esperado = signos[-1]
+        for corte, signo in zip(cortes, signos):
+            if fecha >= corte:
+                esperado = signo
+        assert RegistroDatos.signos().buscar(dia.day, dia.month) is esperado
+        dia += timedelta(days=1)
+
+    nova = RegistroDatos.signos().por_nombre["Nova"]
+    assert obtener_signo_zodiacal(19, 2) == dict(nova)
+
+
+def test_las_herramientas_devuelven_copias_mutables():
+    signo = obtener_signo_zodiacal(14, 2)
+    signo["Signo"] = "Otro"
+
+    assert RegistroDatos.signos().buscar(14, 2)["Signo"] != "Otro"
+    cartas = tarot()
+    assert len(cartas) == 3 and all(type(carta) is dict for carta in cartas)
+
+
+def test_tabla_de_emociones():
+    tabla = RegistroDatos.emociones("data/emociones_entrada_lunita.json")
+
+    assert tabla.claves == tuple(tabla.instrucciones)
+    assert RegistroDatos.emociones("data/emociones_entrada_lunita.json") is tabla
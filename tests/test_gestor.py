@@ -0,0 +1,98 @@
+import asyncio
+
+from lunita.almacen import AlmacenSQLite
+from lunita.gestor import GestorSesiones
+
+
+class SesionFalsa:
+    def __init__(self, usuario_id):
+        self.usuario_id = usuario_id
+        self.cerrada = False
+
+    def memoria_estimada(self):
+        return 100
+
+    async def aclose(self):
+        self.cerrada = True
+
+
+def test_desalojo_cierra_la_sesion_antes_del_hook():
+    vistas = []
+
+    def al_desalojar(usuario_id, sesion):
+        vistas.append((usuario_id, sesion.cerrada))
+
+    gestor = GestorSesiones(max_sesiones=2, fabrica=SesionFalsa, al_desalojar=al_desalojar)
+
+    async def correr():
+        primera = await gestor.obtener("a")
+        await gestor.obtener("b")
+        await gestor.obtener("c")
+        return primera
+
+    primera = asyncio.run(correr())
+
+    assert primera.cerrada
+    assert vistas == [("a", True)]
+    assert "a" not in gestor
+
+
+def test_purgar_cierra_inactivas_y_excedentes():
+    gestor = GestorSesiones(max_bytes=150, inactividad=None, fabrica=SesionFalsa)
+
+    async def correr():
+        sesiones = [await gestor.obtener(usuario_id) for usuario_id in ("a", "b")]
+        gestor.inactividad = 0
+        await asyncio.sleep(0.01)
+        return sesiones, await gestor.purgar()
+
+    sesiones, desalojadas = asyncio.run(correr())
+
+    assert desalojadas == 1
+    assert all(sesion.cerrada for sesion in sesiones)
+    assert len(gestor) == 0
+
+
+def test_sesion_desalojada_se_retoma_con_su_resumen(
+    tmp_path, crear_configuracion, modelo_con_resumen
+):
+    almacen = AlmacenSQLite(str(tmp_path / "sesiones.db"))
+    configuracion = crear_configuracion(
+        modelo_con_resumen, historial=True, resumir_historial=True
+    )
+    gestor = GestorSesiones(max_sesiones=1, configuracion=configuracion, almacen=almacen)
+
+    async def correr():
+        primera = await gestor.obtener("a")
+        for i in range(4):
+            await primera.predecir(f"Pregunta {i}")
+        await gestor.obtener("b")  # desaloja "a" con su resumen todavía en curso
+        retomada = await gestor.obtener("a")
+        retomada._rehidratar()
+        return primera, retomada
+
+    primera, retomada = asyncio.run(correr())
+    resumen = primera.exportar_estado()["resumen"]
+
+    assert retomada is not primera
+    assert resumen.startswith("RESUMEN-")
+    assert retomada.exportar_estado()["resumen"] == resumen
+    assert retomada.memoria_estimada() == primera.memoria_estimada()
+    almacen.cerrar()
+
+
+def test_aclose_no_cierra_el_pool_de_la_configuracion(crear_configuracion, modelo_con_resumen):
+    configuracion = crear_configuracion(modelo_con_resumen)
+    gestor = GestorSesiones(configuracion=configuracion)
+
+    async def correr():
+        await gestor.obtener("a")
+        pool = configuracion.cliente_http()
+        await gestor.aclose()
+        return pool
+
+    pool = asyncio.run(correr())
+
+    assert len(gestor) == 0
+    assert not pool.is_closed
+    assert configuracion.cliente_http() is pool
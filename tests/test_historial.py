@@ -0,0 +1,109 @@
+import asyncio
+import logging
+
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from lunita.historial import HistorialAcotado, agrupar_turnos, estimar_tokens
+from lunita.resumen import CompactadorHistorial
+
+
+def turno_simple(texto, respuesta="Las estrellas dicen que sí."):
+    return [
+        ModelRequest(parts=[UserPromptPart(content=texto)]),
+        ModelResponse(parts=[TextPart(content=respuesta)]),
+    ]
+
+
+def turno_con_herramienta(texto):
+    return [
+        ModelRequest(parts=[UserPromptPart(content=texto)]),
+        ModelResponse(parts=[ToolCallPart(tool_name="tarot", args={}, tool_call_id="t1")]),
+        ModelRequest(
+            parts=[ToolReturnPart(tool_name="tarot", content="La Luna", tool_call_id="t1")]
+        ),
+        ModelResponse(parts=[TextPart(content="Salió La Luna.")]),
+    ]
+
+
+def test_agrupa_peticion_herramientas_y_respuesta_en_un_turno():
+    mensajes = turno_simple("hola") + turno_con_herramienta("tira una carta")
+    turnos = agrupar_turnos(mensajes)
+
+    assert [len(turno) for turno in turnos] == [2, 4]
+
+
+def test_recorta_turnos_completos_por_cantidad():
+    historial = HistorialAcotado(max_turnos=2)
+    for i in range(5):
+        historial.agregar(turno_simple(f"pregunta {i}"))
+
+    mensajes = historial.mensajes()
+    assert historial.turnos == 2
+    assert len(mensajes) == len(historial) == 4
+    assert isinstance(mensajes[0], ModelRequest) and isinstance(mensajes[-1], ModelResponse)
+    assert mensajes[0].parts[0].content == "pregunta 3"
+
+
+def test_recorte_por_tokens_no_separa_la_herramienta_de_su_retorno():
+    descartados = []
+    historial = HistorialAcotado(max_tokens=60, al_descartar=descartados.append)
+    historial.agregar(turno_con_herramienta("tira una carta " * 10))
+    historial.agregar(turno_simple("¿y el amor?"))
+
+    assert [len(turno) for turno in descartados] == [4]
+    assert len(historial) == 2
+    assert historial.tokens == sum(estimar_tokens(m) for m in historial)
+
+
+def test_conserva_el_turno_mas_reciente_aunque_exceda_el_presupuesto():
+    historial = HistorialAcotado(max_tokens=1)
+    historial.agregar(turno_simple("hola " * 100))
+
+    assert historial.turnos == 1
+    assert len(historial) == 2
+
+
+def test_mensajes_sin_peticion_se_unen_al_turno_anterior():
+    historial = HistorialAcotado()
+    inicio = turno_con_herramienta("tira una carta")
+    historial.agregar(inicio[:2])
+    historial.agregar(inicio[2:])
+
+    assert historial.turnos == 1
+    assert historial.mensajes() == inicio
+
+
+def test_resumen_fallido_conserva_los_turnos_para_el_siguiente(crear_configuracion, caplog):
+    llamadas = []
+
+    async def resumir(mensajes, info):
+        llamadas.append(mensajes[-1].parts[-1].content)
+        if len(llamadas) == 1:
+            raise RuntimeError("sin estrellas")
+        return ModelResponse(parts=[TextPart(content="Preguntó por el amor y el trabajo.")])
+
+    compactador = CompactadorHistorial(crear_configuracion(resumir))
+    compactador.encolar(turno_simple("¿Y el amor?"))
+
+    async def compactar():
+        await compactador.programar()
+        pendientes = compactador.pendientes
+        compactador.encolar(turno_simple("¿Y el trabajo?"))
+        await compactador.programar()
+        return pendientes
+
+    with caplog.at_level(logging.WARNING, logger="lunita.resumen"):
+        pendientes = asyncio.run(compactar())
+
+    assert pendientes == 1
+    assert compactador.pendientes == 0
+    assert compactador.resumen == "Preguntó por el amor y el trabajo."
+    assert "¿Y el amor?" in llamadas[1] and "¿Y el trabajo?" in llamadas[1]
+    assert [r.exc_info[0] for r in caplog.records] == [RuntimeError]
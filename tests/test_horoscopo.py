@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from datetime import date
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+
+from lunita.horoscopo import CacheHoroscopos, detectar_signo
+
+HOY = [date(2026, 3, 1)]
+
+
+class FechaFalsa(date):
+    @classmethod
+    def today(cls):
+        return HOY[0]
+
+
+@pytest.fixture(autouse=True)
+def fecha(monkeypatch):
+    HOY[0] = date(2026, 3, 1)
+    monkeypatch.setattr("lunita.horoscopo.date", FechaFalsa)
+
+
+@pytest.fixture
+def crear_cache(crear_configuracion):
+    def crear(responder):
+        return CacheHoroscopos(configuracion=crear_configuracion(responder), videntes=("lunita",))
+
+    return crear
+
+
+async def responder_con_fecha(mensajes, info):
+    return ModelResponse(parts=[TextPart(content=f"Horóscopo del {HOY[0].isoformat()}")])
+
+
+@pytest.mark.parametrize(
+    "mensaje, signo",
+    [
+        ("¿me dices mi horóscopo de Nova?", "Nova"),
+        ("horoscopo pulsarin", "Pulsarín"),
+        ("mi horóscopo", None),
+        ("horóscopo de Nova y Umbra", None),
+        ("¿qué signo es compatible con Nova?", None),
+    ],
+)
+def test_detectar_signo(mensaje, signo):
+    assert detectar_signo(mensaje) == signo
+
+
+def test_cambio_de_dia_descarta_los_horoscopos(crear_cache):
+    cache = crear_cache(responder_con_fecha)
+
+    generados = asyncio.run(cache.precalcular())
+    assert generados == 12
+    assert cache.completo
+    assert cache.obtener("lunita", "Nova") == "Horóscopo del 2026-03-01"
+
+    HOY[0] = date(2026, 3, 2)
+    assert cache.obtener("lunita", "Nova") is None
+    assert not cache.completo
+    assert cache.metricas()["fecha"] == "2026-03-02"
+
+    asyncio.run(cache.precalcular())
+    assert cache.obtener("lunita", "Nova") == "Horóscopo del 2026-03-02"
+
+
+def test_generacion_que_cruza_la_medianoche_no_se_guarda(crear_cache):
+    async def responder_y_cambiar_de_dia(mensajes, info):
+        HOY[0] = date(2026, 3, 2)
+        return ModelResponse(parts=[TextPart(content="Horóscopo de ayer")])
+
+    cache = crear_cache(responder_y_cambiar_de_dia)
+
+    async def generar():
+        cache._expirar()
+        generados = await cache.precalcular()
+        return generados, cache.obtener("lunita", "Nova")
+
+    assert asyncio.run(generar()) == (0, None)
+
+
+def test_errores_de_generacion_se_cuentan_y_no_se_guardan(crear_cache, caplog):
+    async def fallar(mensajes, info):
+        raise RuntimeError("sin estrellas")
+
+    cache = crear_cache(fallar)
+
+    with caplog.at_level(logging.WARNING, logger="lunita.horoscopo"):
+        assert asyncio.run(cache.precalcular()) == 0
+    assert len(caplog.records) == 12
+    assert cache.metricas()["errores"] == 12
+    assert cache.obtener("lunita", "Nova") is None
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from lunita.emocional.analizador import AnalizardorEmocional
+from lunita.emocional.inferencia import (
+    configurar_cache,
+    configurar_ejecutor,
+    configurar_ruta_rapida,
+    inferir_vibra_async,
+    obtener_cache,
+    obtener_ejecutor,
+    obtener_ruta_rapida,
+)
+from lunita.emocional.registro import BackendAnalizadores, configurar_backend
+
+ETIQUETAS = {"sentiment": "POS", "emotion": "joy"}
+
+
+class BackendLento(BackendAnalizadores):
+    """Analizadores que tardan y anotan en qué hilo corrieron."""
+
+    nombre = "lento"
+
+    def __init__(self):
+        self.hilos = []
+
+    def crear(self, task, lang):
+        def predict(texto):
+            self.hilos.append(threading.current_thread())
+            time.sleep(0.1)
+            return SimpleNamespace(output=ETIQUETAS[task], probas={})
+
+        return SimpleNamespace(predict=predict)
+
+
+@pytest.fixture
+def backend():
+    anteriores = obtener_ejecutor(), obtener_ruta_rapida(), obtener_cache()
+    backend = BackendLento()
+    configurar_backend(backend)
+    configurar_ruta_rapida(None)
+    configurar_cache(None)
+    with ThreadPoolExecutor(max_workers=1) as ejecutor:
+        configurar_ejecutor(ejecutor)
+        yield backend
+    ejecutor_anterior, ruta_rapida, cache = anteriores
+    configurar_ejecutor(ejecutor_anterior)
+    configurar_ruta_rapida(ruta_rapida)
+    configurar_cache(cache)
+    configurar_backend(None)
+
+
+def test_la_inferencia_no_bloquea_el_event_loop(backend):
+    async def correr():
+        latidos = 0
+
+        async def latir():
+            nonlocal latidos
+            while True:
+                await asyncio.sleep(0.01)
+                latidos += 1
+
+        latido = asyncio.create_task(latir())
+        resultado = await inferir_vibra_async("¡Hoy me fue increíble!")
+        latido.cancel()
+        return resultado, latidos
+
+    resultado, latidos = asyncio.run(correr())
+
+    assert resultado == {"sentimiento": "POS", "emocion": "joy"}
+    assert latidos >= 10  # el loop siguió atendiendo mientras corrían los dos modelos
+    assert backend.hilos and threading.main_thread() not in backend.hilos
+
+
+def test_el_analizador_aplica_el_resultado_en_el_loop(backend):
+    analizador = AnalizardorEmocional(ruta="data/emociones_entrada_lunita.json")
+
+    cambio = asyncio.run(analizador.analizar_vibra_usuario_async("¡Hoy me fue increíble!"))
+
+    assert cambio
+    assert analizador.emocion_actual_usuario == "joy"
+    assert not asyncio.run(analizador.analizar_vibra_usuario_async("   "))
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+
+from lunita import Sesion
+from lunita.instrumentacion import (
+    agregar_observador,
+    configurar_tiempos,
+    quitar_observador,
+)
+
+
+async def responder(mensajes, info):
+    return ModelResponse(parts=[TextPart("Las estrellas sonríen.")])
+
+
+async def responder_stream(mensajes, info):
+    yield "Las estrellas "
+    yield "sonríen."
+
+
+@pytest.fixture
+def etapas():
+    vistas = []
+
+    def observador(nombre, segundos):
+        vistas.append(nombre)
+
+    agregar_observador(observador)
+    configurar_tiempos(True)
+    yield vistas
+    configurar_tiempos(False)
+    quitar_observador(observador)
+
+
+@pytest.fixture
+def sesion(crear_configuracion):
+    return Sesion(configuracion=crear_configuracion(responder, stream_function=responder_stream))
+
+
+def test_predecir_mide_el_turno(sesion, etapas):
+    respuesta = asyncio.run(sesion.predecir("hola"))
+
+    assert "turno" in etapas and "llm" in etapas
+    assert {"turno", "llm"} <= respuesta["tiempos"].keys()
+
+
+def test_predecir_stream_mide_el_turno(sesion, etapas):
+    async def correr():
+        return [fragmento async for fragmento in sesion.predecir_stream("hola")]
+
+    assert "".join(asyncio.run(correr())) == "Las estrellas sonríen."
+    assert "turno" in etapas and "llm" in etapas
+    assert {"turno", "llm"} <= sesion.ultimos_tiempos.keys()
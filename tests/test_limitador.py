@@ -0,0 +1,161 @@
+import asyncio
+import logging
+
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+from pydantic_ai.usage import RunUsage
+
+from lunita import Sesion, predecir_lote
+from lunita.cliente import Cliente
+from lunita.limitador import LimitadorTasa, configurar_limitador, liquidar, reservar
+
+
+@pytest.fixture
+def limitador():
+    limitador = LimitadorTasa(peticiones_por_minuto=600, tokens_por_minuto=6000)
+    configurar_limitador(limitador)
+    yield limitador
+    configurar_limitador(None)
+
+
+@pytest.mark.parametrize("limites", [{"peticiones_por_minuto": 0}, {"tokens_por_minuto": -5}])
+def test_limites_invalidos(limites):
+    with pytest.raises(ValueError):
+        LimitadorTasa(**limites)
+
+
+def test_reserva_descuenta_de_las_cubetas(limitador):
+    asyncio.run(limitador.adquirir(1000))
+    metricas = limitador.metricas()
+    assert metricas["peticiones_disponibles"] == pytest.approx(599, abs=0.5)
+    assert metricas["tokens_disponibles"] == pytest.approx(5000, abs=5)
+    assert metricas["esperas"] == 0
+
+
+def test_espera_cuando_se_acaban_las_peticiones():
+    limitador = LimitadorTasa(peticiones_por_minuto=600)  # una petición cada 0,1 s
+
+    async def pedir():
+        for _ in range(602):
+            await limitador.adquirir()
+
+    asyncio.run(pedir())
+    metricas = limitador.metricas()
+    assert metricas["esperas"] >= 1
+    assert metricas["segundos_esperados"] > 0
+
+
+def test_ajustar_cobra_el_exceso_y_devuelve_lo_sobrante(limitador):
+    asyncio.run(limitador.adquirir(1000))
+    limitador.ajustar(1000, 1500)
+    assert limitador.metricas()["tokens_disponibles"] == pytest.approx(4500, abs=5)
+    limitador.ajustar(1000, 0)
+    assert limitador.metricas()["tokens_disponibles"] == pytest.approx(5500, abs=5)
+
+
+def test_peticion_mas_grande_que_el_limite_no_se_bloquea(limitador):
+    asyncio.run(limitador.adquirir(10_000))
+    assert limitador.metricas()["tokens_disponibles"] == pytest.approx(0, abs=5)
+
+
+def test_liquidar_sin_uso_devuelve_la_reserva(limitador):
+    reservados = asyncio.run(reservar(2000))
+    liquidar(reservados, None)
+    assert limitador.metricas()["tokens_disponibles"] == pytest.approx(6000, abs=5)
+
+    reservados = asyncio.run(reservar(2000))
+    liquidar(reservados, RunUsage(requests=2, input_tokens=300, output_tokens=200))
+    metricas = limitador.metricas()
+    assert metricas["tokens_disponibles"] == pytest.approx(5500, abs=5)
+    assert metricas["peticiones_disponibles"] == pytest.approx(597, abs=0.5)
+
+
+def test_sin_limitador_no_se_reserva():
+    configurar_limitador(None)
+    assert asyncio.run(reservar(2000)) == 0
+    liquidar(0, None)
+
+
+def test_plazo_vencido_devuelve_la_reserva(limitador, crear_configuracion):
+    async def lento(mensajes, info):
+        await asyncio.sleep(1)
+        return ModelResponse(parts=[TextPart("tarde")])
+
+    configuracion = crear_configuracion(lento, resiliencia={"plazo": 0.1})
+    cliente = Cliente(emocion="", configuracion=configuracion)
+
+    asyncio.run(cliente.preguntar("hola"))
+
+    assert cliente.ultima_ruta == "plazo_vencido"
+    assert limitador.metricas()["tokens_disponibles"] == pytest.approx(6000, abs=5)
+
+
+def test_cada_reintento_pasa_por_el_limitador(limitador, crear_configuracion):
+    llamadas = []
+
+    async def falla_dos_veces(mensajes, info):
+        llamadas.append(1)
+        if len(llamadas) <= 2:
+            raise ModelHTTPError(429, "modelo")
+        return ModelResponse(parts=[TextPart("al fin")])
+
+    configuracion = crear_configuracion(
+        falla_dos_veces, resiliencia={"espera_base": 0.001, "espera_maxima": 0.002}
+    )
+    cliente = Cliente(emocion="", configuracion=configuracion)
+
+    assert asyncio.run(cliente.preguntar("hola")) == "al fin"
+    metricas = limitador.metricas()
+    assert metricas["peticiones_disponibles"] == pytest.approx(597, abs=0.5)
+    # Los intentos fallidos devuelven sus tokens; solo queda cobrado el uso real.
+    assert metricas["tokens_disponibles"] == pytest.approx(
+        6000 - cliente.ultimo_uso["tokens_entrada"] - cliente.ultimo_uso["tokens_salida"], abs=5
+    )
+
+
+def test_el_respaldo_tambien_pasa_por_el_limitador(crear_configuracion):
+    limitador = LimitadorTasa(peticiones_por_minuto=60)  # casi no se rellena durante la prueba
+    configurar_limitador(limitador)
+
+    async def lento(mensajes, info):
+        await asyncio.sleep(1)
+        return ModelResponse(parts=[TextPart("principal")])
+
+    async def rapido(mensajes, info):
+        return ModelResponse(parts=[TextPart("respaldo")])
+
+    configuracion = crear_configuracion(
+        lento,
+        modelo_respaldo=FunctionModel(rapido),
+        resiliencia={"retraso_respaldo": 0.05},
+    )
+    cliente = Cliente(emocion="", configuracion=configuracion)
+
+    try:
+        assert asyncio.run(cliente.preguntar("hola")) == "respaldo"
+        assert limitador.metricas()["peticiones_disponibles"] == pytest.approx(58, abs=0.5)
+    finally:
+        configurar_limitador(None)
+
+
+def test_un_turno_fallido_no_corta_el_lote(crear_configuracion, caplog):
+    async def responder(mensajes, info):
+        if mensajes[-1].parts[-1].content.startswith("falla"):
+            raise KeyError("bug")
+        return ModelResponse(parts=[TextPart(content="Las cartas hablan.")])
+
+    configuracion = crear_configuracion(responder)
+    sesiones = [Sesion(configuracion=configuracion) for _ in range(3)]
+
+    async def correr():
+        pares = zip(sesiones, ("hola", "falla", "hola"))
+        return [resultado async for resultado in predecir_lote(pares, concurrencia=2)]
+
+    with caplog.at_level(logging.WARNING, logger="lunita.lote"):
+        resultados = sorted(asyncio.run(correr()), key=lambda resultado: resultado["indice"])
+
+    assert [resultado["respuesta"] is None for resultado in resultados] == [False, True, False]
+    assert isinstance(resultados[1]["error"], KeyError)
+    assert [r.exc_info[0] for r in caplog.records] == [KeyError]
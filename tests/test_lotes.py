@@ -0,0 +1,39 @@
+import asyncio
+import logging
+
+import pytest
+
+from lunita.emocional.lotes import PlanificadorLotes
+
+
+def test_un_lote_fallido_no_detiene_al_trabajador(monkeypatch, caplog):
+    lotes = []
+
+    def inferir(mensajes, lang):
+        lotes.append(list(mensajes))
+        if len(lotes) == 1:
+            raise RuntimeError("sin modelos")
+        return [{"sentimiento": "POS", "emocion": "joy"} for _ in mensajes]
+
+    monkeypatch.setattr("lunita.emocional.lotes.inferir_vibra_lote", inferir)
+    planificador = PlanificadorLotes(tamano_lote=4, espera_maxima=0.01)
+
+    async def correr():
+        fallidos = await asyncio.gather(
+            planificador.inferir("hola"), planificador.inferir("adiós"), return_exceptions=True
+        )
+        return fallidos, await planificador.inferir("otra vez")
+
+    with caplog.at_level(logging.WARNING, logger="lunita.emocional.lotes"):
+        fallidos, resultado = asyncio.run(correr())
+
+    assert lotes == [["hola", "adiós"], ["otra vez"]]
+    assert all(isinstance(error, RuntimeError) for error in fallidos)
+    assert resultado == {"sentimiento": "POS", "emocion": "joy"}
+    assert planificador.metricas()["lotes"] == 1
+    assert [r.exc_info[0] for r in caplog.records] == [RuntimeError]
+
+
+def test_tamano_de_lote_invalido():
+    with pytest.raises(ValueError):
+        PlanificadorLotes(tamano_lote=0)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+from pydantic_ai.settings import ModelSettings
+
+from lunita import ConfigurarEstrellas, ConfigurarVidente
+from lunita.cliente import Cliente
+from lunita.niveles import obtener_latencias_niveles, reiniciar_latencias_niveles
+
+MENSAJES = {
+    "breve": "hola",
+    "medio": "¿cómo me irá esta semana en el trabajo nuevo?",
+    "largo": "explícame en detalle mi carta astral",
+}
+
+
+def modelo_que_anota(nombre, vistos):
+    async def responder(mensajes, info):
+        vistos.append((nombre, info.model_settings))
+        return ModelResponse(parts=[TextPart(content=nombre)])
+
+    return FunctionModel(responder, model_name=nombre)
+
+
+@pytest.fixture(autouse=True)
+def latencias():
+    reiniciar_latencias_niveles()
+    yield
+    reiniciar_latencias_niveles()
+
+
+def test_cada_nivel_responde_con_su_modelo_y_sus_ajustes(crear_configuracion):
+    vistos = []
+    configuracion = crear_configuracion(
+        modelo_que_anota("principal", vistos),
+        niveles={
+            "breve": {
+                "modelo": modelo_que_anota("rapido", vistos),
+                "ajustes": ModelSettings(max_tokens=120),
+            },
+            "largo": {
+                "modelo": modelo_que_anota("grande", vistos),
+                "ajustes": ModelSettings(max_tokens=1500, temperature=0.3),
+            },
+        },
+    )
+    cliente = Cliente(emocion="", configuracion=configuracion)
+
+    async def conversar():
+        textos = {}
+        for nivel, mensaje in MENSAJES.items():
+            textos[nivel] = await cliente.preguntar(mensaje)
+            assert cliente.ultimo_nivel == nivel
+        return textos
+
+    textos = asyncio.run(conversar())
+
+    assert textos == {"breve": "rapido", "medio": "principal", "largo": "grande"}
+    assert [nombre for nombre, _ in vistos] == ["rapido", "principal", "grande"]
+    assert vistos[0][1]["max_tokens"] == 120
+    assert vistos[1][1]["max_tokens"] == 800
+    assert vistos[2][1]["max_tokens"] == 1500
+    assert vistos[2][1]["temperature"] == 0.3
+    assert cliente.ultimo_modelo == "grande"
+    assert {nivel: r["turnos"] for nivel, r in obtener_latencias_niveles().items()} == {
+        "breve": 1,
+        "medio": 1,
+        "largo": 1,
+    }
+
+
+def test_nivel_por_nombre_usa_un_modelo_del_proveedor():
+    configuracion = ConfigurarEstrellas.crear(
+        ConfigurarVidente("lunita"),
+        "deepseek-chat",
+        "token",
+        niveles={"largo": {"modelo": "deepseek-reasoner"}},
+    )
+
+    modelo_largo, ajustes = configuracion.politica_nivel("largo")
+    modelo_breve, _ = configuracion.politica_nivel("breve")
+
+    assert modelo_largo.model_name == "deepseek-reasoner"
+    assert modelo_breve.model_name == "deepseek-chat"
+    assert ajustes["max_tokens"] == 800
+    assert configuracion.politica_nivel("largo")[0] is modelo_largo
+    asyncio.run(configuracion.aclose())
+
+
+def test_niveles_desconocidos(crear_configuracion):
+    with pytest.raises(ValueError):
+        crear_configuracion(modelo_que_anota("principal", []), niveles={"enorme": {}})
@@ -0,0 +1,69 @@
+import asyncio
+
+from pydantic_ai.messages import (
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    UserPromptPart,
+)
+
+from lunita.cliente import Cliente, fragmento_emocion
+
+
+def contenidos(mensajes):
+    return [
+        parte.content
+        for m in mensajes
+        if isinstance(m, ModelRequest)
+        for parte in m.parts
+        if isinstance(parte, UserPromptPart)
+    ]
+
+
+def test_el_prefijo_del_prompt_no_cambia_entre_turnos(crear_configuracion):
+    vistos = []
+
+    async def responder(mensajes, info):
+        vistos.append(mensajes)
+        return ModelResponse(parts=[TextPart(content=f"Respuesta {len(vistos)}")])
+
+    cliente = Cliente(emocion="", configuracion=crear_configuracion(responder, historial=True))
+    preguntas = ["hola", "explícame mi futuro en detalle", "¿y el amor?"]
+
+    async def conversar():
+        for emocion, pregunta in zip(("feliz", "triste", "curiosa"), preguntas):
+            cliente.actualizar_emocion(fragmento_emocion(emocion, (f"Estás {emocion}.",)))
+            await cliente.preguntar(pregunta)
+
+    asyncio.run(conversar())
+
+    # Las instrucciones (prompt de la vidente) son las mismas en todos los turnos.
+    assert len({m[-1].instructions for m in vistos}) == 1
+    # Lo anterior de cada turno llega idéntico, byte a byte, en los siguientes.
+    for anterior, siguiente in zip(vistos[1:], vistos[2:]):
+        prefijo = len(anterior) - 1
+        assert ModelMessagesTypeAdapter.dump_json(
+            siguiente[:prefijo]
+        ) == ModelMessagesTypeAdapter.dump_json(anterior[:prefijo])
+    # La emoción y la longitud solo viajan en la cola del mensaje actual.
+    assert "curiosa" in contenidos(vistos[2])[-1]
+    assert contenidos(vistos[2])[:-1] == preguntas[:2]
+
+
+def test_sin_cola_deja_solo_lo_que_escribio_el_usuario(crear_configuracion):
+    configuracion = crear_configuracion(lambda mensajes, info: None)
+    cliente = Cliente(emocion="(Tu estado emocional es: feliz)", configuracion=configuracion)
+    preparado = cliente._preparar_mensaje("¿y el amor?", "breve")
+    mensajes = [
+        ModelRequest(parts=[UserPromptPart(content=preparado)], instructions="prompt"),
+        ModelResponse(parts=[TextPart(content="Las cartas hablan.")]),
+    ]
+
+    limpios = Cliente._sin_cola(mensajes, "¿y el amor?")
+
+    assert preparado.startswith("¿y el amor?") and preparado != "¿y el amor?"
+    assert contenidos(limpios) == ["¿y el amor?"]
+    assert limpios[0].instructions == "prompt"
+    assert limpios[1] is mensajes[1]
+    assert contenidos(mensajes) == [preparado]  # no modifica los mensajes originales
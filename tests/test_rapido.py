@@ -0,0 +1,42 @@
+import pytest
+
+from lunita.emocional.rapido import ClasificadorRapido
+
+
+@pytest.fixture
+def clasificador():
+    return ClasificadorRapido()
+
+
+@pytest.mark.parametrize(
+    "mensaje", ["no quiero", "no gracias", "no bien", "nunca bien", "ni gracias", "no"]
+)
+def test_negaciones_van_al_modelo(clasificador, mensaje):
+    assert clasificador.evaluar(mensaje) == (None, 0.0)
+    assert clasificador.clasificar(mensaje) is None
+
+
+@pytest.mark.parametrize("mensaje", ["jaja", "jejeje", "jajaj", "haha", "hola jiji"])
+def test_risas_son_alegria(clasificador, mensaje):
+    resultado, confianza = clasificador.evaluar(mensaje)
+    assert resultado == {"sentimiento": "POS", "emocion": "joy"}
+    assert confianza >= clasificador.umbral
+
+
+@pytest.mark.parametrize("mensaje", ["hija", "hoja", "ja", "jaho"])
+def test_palabras_parecidas_a_risa_no_disparan(clasificador, mensaje):
+    assert clasificador.evaluar(mensaje) == (None, 0.0)
+
+
+def test_saludo_neutral(clasificador):
+    assert clasificador.clasificar("Hola Lunita!!") == {"sentimiento": "NEU", "emocion": None}
+
+
+def test_senales_contradictorias_van_al_modelo(clasificador):
+    assert clasificador.evaluar("jaja 😭") == (None, 0.0)
+
+
+def test_muestreo_por_defecto_alimenta_el_reporte():
+    clasificador = ClasificadorRapido()
+    assert clasificador.muestreo > 0
+    assert not ClasificadorRapido(muestreo=0.0).debe_verificar()
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from lunita.emocional.registro import (
+    BackendAnalizadores,
+    RegistroAnalizadores,
+    configurar_backend,
+)
+
+
+class BackendLento(BackendAnalizadores):
+    nombre = "lento"
+
+    def __init__(self, etiqueta):
+        self.etiqueta = etiqueta
+        self.cargando = threading.Event()
+        self.seguir = threading.Event()
+        self.seguir.set()
+
+    def crear(self, task, lang):
+        self.cargando.set()
+        self.seguir.wait(5)
+        return (self.etiqueta, task, lang)
+
+
+@pytest.fixture(autouse=True)
+def restaurar_backend():
+    yield
+    configurar_backend(None)
+
+
+def _obtener_en_hilo(resultados):
+    hilo = threading.Thread(
+        target=lambda: resultados.append(RegistroAnalizadores.obtener("sentiment", "es"))
+    )
+    hilo.start()
+    return hilo
+
+
+def test_carga_una_sola_vez():
+    configurar_backend(BackendLento("a"))
+    primero = RegistroAnalizadores.obtener("sentiment", "es")
+    assert RegistroAnalizadores.obtener("sentiment", "es") is primero
+    assert RegistroAnalizadores.cargados() == [("sentiment", "es")]
+
+
+def test_cambio_de_backend_durante_la_carga_no_deja_el_analizador_viejo():
+    viejo = BackendLento("viejo")
+    viejo.seguir.clear()
+    configurar_backend(viejo)
+
+    resultados = []
+    hilo = _obtener_en_hilo(resultados)
+    assert viejo.cargando.wait(5)
+    configurar_backend(BackendLento("nuevo"))
+    viejo.seguir.set()
+    hilo.join(5)
+
+    assert resultados == [("nuevo", "sentiment", "es")]
+    assert RegistroAnalizadores.obtener("sentiment", "es")[0] == "nuevo"
+
+
+def test_liberar_durante_la_carga_no_guarda_el_analizador():
+    backend = BackendLento("a")
+    backend.seguir.clear()
+    configurar_backend(backend)
+
+    resultados = []
+    hilo = _obtener_en_hilo(resultados)
+    assert backend.cargando.wait(5)
+    RegistroAnalizadores.liberar()
+    backend.seguir.set()
+    hilo.join(5)
+
+    assert resultados == [("a", "sentiment", "es")]
+    assert RegistroAnalizadores.cargados() == []
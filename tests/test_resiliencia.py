@@ -0,0 +1,150 @@
+import asyncio
+
+import httpx
+import pytest
+from openai import APIConnectionError, APITimeoutError
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from lunita.cliente import Cliente
+from lunita.resiliencia import error_transitorio, espera_reintento
+
+PETICION = httpx.Request("POST", "https://api.deepseek.com/chat/completions")
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ModelHTTPError(429, "modelo"),
+        ModelHTTPError(408, "modelo"),
+        ModelHTTPError(503, "modelo"),
+        httpx.ConnectError("sin red"),
+        httpx.ReadTimeout("lento"),
+        APIConnectionError(request=PETICION),
+        APITimeoutError(request=PETICION),
+    ],
+)
+def test_errores_transitorios(error):
+    assert error_transitorio(error)
+
+
+@pytest.mark.parametrize(
+    "error", [ModelHTTPError(400, "modelo"), ModelHTTPError(401, "modelo"), KeyError("bug")]
+)
+def test_errores_que_no_se_reintentan(error):
+    assert not error_transitorio(error)
+
+
+def test_espera_con_jitter_acotada():
+    for intento in range(8):
+        assert 0 <= espera_reintento(intento, 0.5, 4.0) <= min(4.0, 0.5 * 2**intento)
+
+
+@pytest.fixture
+def crear_cliente(crear_configuracion):
+    def crear(principal, respaldo=None, **resiliencia):
+        configuracion = crear_configuracion(
+            principal,
+            modelo_respaldo=respaldo,
+            resiliencia={"espera_base": 0.001, "espera_maxima": 0.002, **resiliencia},
+        )
+        return Cliente(emocion="", configuracion=configuracion)
+
+    return crear
+
+
+def error_api(cliente):
+    return cliente.configuracion.configuracion_vidente.obtener_mensajes_error()["error_api"]
+
+
+def modelo_que_falla(veces, error, texto="principal", espera=0.0):
+    llamadas = []
+
+    async def responder(mensajes, info):
+        llamadas.append(1)
+        if len(llamadas) <= veces:
+            raise error
+        await asyncio.sleep(espera)
+        return ModelResponse(parts=[TextPart(content=texto)])
+
+    async def responder_stream(mensajes, info):
+        llamadas.append(1)
+        if len(llamadas) <= veces:
+            raise error
+        yield texto
+
+    modelo = FunctionModel(responder, stream_function=responder_stream, model_name=texto)
+    return modelo, llamadas
+
+
+def test_reintenta_errores_transitorios(crear_cliente):
+    modelo, llamadas = modelo_que_falla(2, ModelHTTPError(429, "modelo"))
+    cliente = crear_cliente(modelo, reintentos=2)
+
+    assert asyncio.run(cliente.preguntar("hola")) == "principal"
+    assert cliente.ultima_ruta == "reintento"
+    assert len(llamadas) == 3
+
+
+def test_sin_reintentos_disponibles_responde_el_error_de_la_vidente(crear_cliente):
+    modelo, llamadas = modelo_que_falla(5, ModelHTTPError(503, "modelo"))
+    cliente = crear_cliente(modelo, reintentos=1)
+
+    texto = asyncio.run(cliente.preguntar("hola"))
+
+    assert texto == error_api(cliente)
+    assert cliente.ultima_ruta == "error"
+    assert cliente.ultimo_uso is None
+    assert len(llamadas) == 2
+
+
+def test_errores_no_transitorios_se_propagan(crear_cliente):
+    modelo, llamadas = modelo_que_falla(1, KeyError("bug"))
+    cliente = crear_cliente(modelo)
+
+    with pytest.raises(KeyError):
+        asyncio.run(cliente.preguntar("hola"))
+    assert len(llamadas) == 1
+
+
+def test_el_respaldo_responde_si_el_principal_tarda(crear_cliente):
+    lento, _ = modelo_que_falla(0, None, texto="principal", espera=1.0)
+    respaldo, _ = modelo_que_falla(0, None, texto="respaldo")
+    cliente = crear_cliente(lento, respaldo, retraso_respaldo=0.05, plazo=2.0)
+
+    assert asyncio.run(cliente.preguntar("hola")) == "respaldo"
+    assert cliente.ultima_ruta == "respaldo"
+    assert cliente.ultimo_modelo == "respaldo"
+
+
+def test_el_principal_gana_si_responde_antes_del_respaldo(crear_cliente):
+    principal, _ = modelo_que_falla(0, None, texto="principal")
+    respaldo, llamadas_respaldo = modelo_que_falla(0, None, texto="respaldo")
+    cliente = crear_cliente(principal, respaldo, retraso_respaldo=0.5)
+
+    assert asyncio.run(cliente.preguntar("hola")) == "principal"
+    assert cliente.ultima_ruta == "principal"
+    assert llamadas_respaldo == []
+
+
+def test_plazo_vencido(crear_cliente):
+    lento, _ = modelo_que_falla(0, None, espera=1.0)
+    cliente = crear_cliente(lento, plazo=0.05)
+
+    texto = asyncio.run(cliente.preguntar("hola"))
+
+    assert texto == error_api(cliente)
+    assert cliente.ultima_ruta == "plazo_vencido"
+
+
+def test_stream_reintenta_antes_del_primer_fragmento(crear_cliente):
+    modelo, llamadas = modelo_que_falla(1, httpx.ConnectError("sin red"))
+    cliente = crear_cliente(modelo)
+
+    async def correr():
+        return [fragmento async for fragmento in cliente.preguntar_stream("hola")]
+
+    assert asyncio.run(correr()) == ["principal"]
+    assert cliente.ultima_ruta == "reintento"
+    assert len(llamadas) == 2
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+
+from lunita import Sesion
+
+
+@pytest.fixture
+def crear_sesion(crear_configuracion):
+    """Sesión con `emocion_diferida` cuyo análisis tarda `duracion` y deja la emoción `E<n>`.
+
+    Devuelve la sesión y la lista de mensajes que recibió el modelo."""
+
+    def crear(duracion, gracia=0.05, fallar=()):
+        vistos = []
+
+        async def responder(mensajes, info):
+            vistos.append(mensajes[-1].parts[-1].content)
+            return ModelResponse(parts=[TextPart(content="Las cartas hablan.")])
+
+        configuracion = crear_configuracion(
+            responder, analizar_emociones=True, emocion_diferida=gracia
+        )
+        sesion = Sesion(configuracion=configuracion)
+        motor = sesion._emociones
+        analizados = []
+
+        async def analizar(mensaje):
+            analizados.append(mensaje)
+            await asyncio.sleep(duracion)
+            if len(analizados) in fallar:
+                raise RuntimeError("sin modelo de emociones")
+            motor.emocion_actual_asistente = f"E{len(analizados)}"
+            motor.instrucciones_actuales = [f"Instrucción {len(analizados)}"]
+
+        motor.procesar_mensaje_usuario_async = analizar
+        return sesion, vistos
+
+    return crear
+
+
+def test_analisis_rapido_se_aplica_en_el_mismo_turno(crear_sesion):
+    sesion, vistos = crear_sesion(duracion=0.0)
+
+    asyncio.run(sesion.predecir("hola"))
+
+    assert "(Tu estado emocional es: E1)" in vistos[0]
+
+
+def test_analisis_lento_no_frena_el_turno_y_se_aplica_en_el_siguiente(crear_sesion):
+    sesion, vistos = crear_sesion(duracion=0.3)
+    emocion_inicial = sesion._emociones.emocion_actual_asistente
+
+    async def conversar():
+        inicio = asyncio.get_running_loop().time()
+        await sesion.predecir("hola")
+        primer_turno = asyncio.get_running_loop().time() - inicio
+        await asyncio.sleep(0.4)
+        await sesion.predecir("¿y mañana?")
+        await sesion.aclose()  # espera el análisis del segundo mensaje
+        return primer_turno
+
+    primer_turno = asyncio.run(conversar())
+
+    assert primer_turno < 0.3
+    assert f"(Tu estado emocional es: {emocion_inicial})" in vistos[0]
+    assert "(Tu estado emocional es: E1)" in vistos[1]
+    assert sesion._emociones.emocion_actual_asistente == "E2"
+
+
+def test_analisis_fallido_se_registra_y_no_frena_el_siguiente(crear_sesion, caplog):
+    sesion, vistos = crear_sesion(duracion=0.0, fallar=(1,))
+    emocion_inicial = sesion._emociones.emocion_actual_asistente
+
+    async def conversar():
+        await sesion.predecir("hola")
+        await sesion.predecir("¿y mañana?")
+
+    with caplog.at_level(logging.WARNING, logger="lunita.sesion"):
+        asyncio.run(conversar())
+
+    assert f"(Tu estado emocional es: {emocion_inicial})" in vistos[0]
+    assert "(Tu estado emocional es: E2)" in vistos[1]
+    assert [r.exc_info[0] for r in caplog.records] == [RuntimeError]
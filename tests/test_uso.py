@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.usage import RequestUsage
+
+from lunita import Sesion
+from lunita.uso import configurar_precios, obtener_uso_total, reiniciar_uso_total
+
+COSTO_TURNO = (600 * 1.0 + 400 * 0.1 + 100 * 2.0) / 1_000_000
+
+
+async def responder(mensajes, info):
+    return ModelResponse(
+        parts=[TextPart(content="Las cartas hablan.")],
+        usage=RequestUsage(input_tokens=1000, output_tokens=100, cache_read_tokens=400),
+    )
+
+
+@pytest.fixture(autouse=True)
+def contadores():
+    reiniciar_uso_total()
+    configurar_precios({"modelo": {"entrada": 1.0, "salida": 2.0, "cache": 0.1}})
+    yield
+    configurar_precios(None)
+    reiniciar_uso_total()
+
+
+def test_uso_por_turno_sesion_y_proceso(crear_configuracion):
+    configuracion = crear_configuracion(responder)
+
+    async def conversar():
+        sesiones = [Sesion(configuracion=configuracion) for _ in range(2)]
+        respuestas = [await sesion.predecir(f"hola {i}") for sesion in sesiones for i in range(2)]
+        return sesiones, respuestas
+
+    sesiones, respuestas = asyncio.run(conversar())
+
+    uso = respuestas[0]["uso"]
+    assert uso["peticiones"] == 1
+    assert (uso["tokens_entrada"], uso["tokens_salida"], uso["tokens_cache"]) == (1000, 100, 400)
+    assert uso["proporcion_cache"] == pytest.approx(0.4)
+    assert uso["costo"] == pytest.approx(COSTO_TURNO)
+
+    por_sesion = sesiones[0].uso()
+    assert por_sesion["turnos"] == 2
+    assert por_sesion["tokens_entrada"] == 2000
+    assert por_sesion["proporcion_cache"] == pytest.approx(0.4)
+    assert por_sesion["costo"] == pytest.approx(2 * COSTO_TURNO)
+
+    total = obtener_uso_total()
+    assert total["turnos"] == 4
+    assert total["tokens_salida"] == 400
+    assert total["costo"] == pytest.approx(4 * COSTO_TURNO)
+
+
+def test_sin_precio_el_costo_queda_en_none(crear_configuracion):
+    configurar_precios(None)
+    sesion = Sesion(configuracion=crear_configuracion(responder))
+
+    respuesta = asyncio.run(sesion.predecir("hola"))
+
+    assert respuesta["uso"]["costo"] is None
+    assert sesion.uso()["costo"] is None
+    assert sesion.uso()["tokens_entrada"] == 1000